@@ -5,6 +5,11 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+ASGI altında okuma ağırlıklı sayfalar asenkron view'larla sunulur
+(PANEL_ASYNC_VIEWS, bkz. panel/views/async_views.py):
+
+    uvicorn dent_admin_panel.asgi:application --workers 4
 """
 
 import os
@@ -12,5 +17,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dent_admin_panel.settings')
+os.environ.setdefault('PANEL_ASYNC_VIEWS', 'True')
 
 application = get_asgi_application()
@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -53,6 +55,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'panel.middleware.DeadlineMiddleware',
 ]
 
 ROOT_URLCONF = 'dent_admin_panel.urls'
@@ -82,10 +85,71 @@ WSGI_APPLICATION = 'dent_admin_panel.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.getenv('DJANGO_SQLITE_PATH', str(BASE_DIR / 'db.sqlite3')),
     }
 }
 
+# Oturum depolama. Panel session'da yalnızca birkaç id ve hastane özeti
+# tutar; birden çok worker ile SQLite yazma kilidine takılmamak için
+# veritabanı gerektirmeyen seçenekler kullanılabilir:
+# - db: Django varsayılanı (SQLite django_session tablosu)
+# - signed_cookies: veri imzalı çerezde tutulur; sunucuda depolama yoktur,
+#   çıkışta çerez silinir ancak kopyalanmış çerez süresi dolana kadar geçerlidir
+# - cache: worker'lar arası paylaşılan SQLite (WAL) önbelleği (panel.cache_backend)
+PANEL_SESSION_BACKEND = os.getenv('PANEL_SESSION_BACKEND', 'db')
+_SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'cache': 'django.contrib.sessions.backends.cache',
+}
+if PANEL_SESSION_BACKEND not in _SESSION_ENGINES:
+    raise ImproperlyConfigured(
+        f"PANEL_SESSION_BACKEND geçersiz: {PANEL_SESSION_BACKEND!r} "
+        f"(seçenekler: {', '.join(_SESSION_ENGINES)})"
+    )
+SESSION_ENGINE = _SESSION_ENGINES[PANEL_SESSION_BACKEND]
+SESSION_CACHE_ALIAS = 'sessions'
+
+# Worker'lar arası paylaşılan SQLite önbelleği (konum indeksi, hizmet listesi,
+# oturum ve şablon parçası önbellekleri). Varsayılan olarak kapalıdır ve her
+# worker kendi süreç içi verisini kullanır; gunicorn.conf.py bunu açar.
+PANEL_SHARED_CACHE_DIR = os.getenv('PANEL_SHARED_CACHE_DIR', '')
+
+
+def _shared_cache_path(env_name: str, filename: str) -> str:
+    """Önbellek dosyası: açık ayar, yoksa paylaşılan önbellek dizini (kapalıysa boş)."""
+    if os.getenv(env_name):
+        return os.getenv(env_name)
+    return str(Path(PANEL_SHARED_CACHE_DIR) / filename) if PANEL_SHARED_CACHE_DIR else ''
+
+
+_SESSION_CACHE_PATH = _shared_cache_path('PANEL_SESSION_CACHE_PATH', 'sessions.sqlite3')
+_FRAGMENT_CACHE_PATH = _shared_cache_path('PANEL_FRAGMENT_CACHE_PATH', 'fragments.sqlite3')
+if PANEL_SESSION_BACKEND == 'cache' and not _SESSION_CACHE_PATH:
+    raise ImproperlyConfigured(
+        "PANEL_SESSION_BACKEND=cache için PANEL_SESSION_CACHE_PATH veya PANEL_SHARED_CACHE_DIR gerekli"
+    )
+_LOCAL_CACHE = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Oturumlarda boyut tahliyesi kapalıdır (tahliye edilen oturum çıkış demektir);
+    # süresi dolan oturumlar yine silinir. Sınır gerekiyorsa env ile verilir.
+    'sessions': {
+        'BACKEND': 'panel.cache_backend.SharedSQLiteCache',
+        'LOCATION': _SESSION_CACHE_PATH,
+        'OPTIONS': {'MAX_BYTES': int(os.getenv('PANEL_SESSION_CACHE_MAX_BYTES') or 0) or None},
+    } if _SESSION_CACHE_PATH else {**_LOCAL_CACHE, 'LOCATION': 'panel-sessions'},
+    # Şablon parçaları ({% cache ... using="fragments" %}); anahtarlar veri sürümünü içerir
+    'fragments': {
+        'BACKEND': 'panel.cache_backend.SharedSQLiteCache',
+        'LOCATION': _FRAGMENT_CACHE_PATH,
+        'OPTIONS': {'MAX_BYTES': int(os.getenv('PANEL_FRAGMENT_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))},
+    } if _FRAGMENT_CACHE_PATH else {**_LOCAL_CACHE, 'LOCATION': 'panel-fragments'},
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -132,10 +196,72 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # JSON veri klasörünü merkezi olarak tanımlıyoruz
 PANEL_DATA_DIR = BASE_DIR / 'panel' / 'data'
 
+# Dashboard/takvim önbelleği (saniye): soft TTL sonrası eski veri sunulup arka
+# planda yenilenir, hard TTL sonrası istek taze veriyi bekler
+PANEL_CACHE_SOFT_TTL = float(os.getenv('PANEL_CACHE_SOFT_TTL', '15'))
+PANEL_CACHE_HARD_TTL = float(os.getenv('PANEL_CACHE_HARD_TTL', '300'))
+# Değişiklik bildirimiyle önbellek geçersiz kılma: off | realtime | polling | local
+PANEL_CACHE_INVALIDATION = os.getenv('PANEL_CACHE_INVALIDATION', 'off')
+PANEL_CACHE_POLL_INTERVAL = float(os.getenv('PANEL_CACHE_POLL_INTERVAL', '5'))
+# Dinleyici uygulama yüklenirken başlatılsın mı; gunicorn.conf.py preload
+# master'ında kapatır ve dinleyiciyi her worker'da post_fork ile başlatır
+PANEL_LISTENER_ON_READY = os.getenv('PANEL_LISTENER_ON_READY', 'True').lower() == 'true'
+
+PANEL_SHARED_CACHE_MAX_BYTES = int(os.getenv('PANEL_SHARED_CACHE_MAX_BYTES', str(128 * 1024 * 1024)))
+PANEL_REFERENCE_CACHE_TTL = float(os.getenv('PANEL_REFERENCE_CACHE_TTL', '300'))
+# Paylaşılan önbellek kapalıyken session'daki hastane özetinin üst süresi (saniye)
+PANEL_TENANT_SNAPSHOT_MAX_AGE = float(os.getenv('PANEL_TENANT_SNAPSHOT_MAX_AGE', '30'))
+# Sürüm anahtarlı şablon parçalarının üst süresi (realtime kapalıyken dış yazmalar için sınır)
+PANEL_FRAGMENT_CACHE_TTL = int(os.getenv('PANEL_FRAGMENT_CACHE_TTL', '600'))
+# Panel dışından yazılan tablolara (randevular, puanlar) bağlı parçaların süresi;
+# değişiklik bildirimi bu tabloları izliyorsa PANEL_FRAGMENT_CACHE_TTL kullanılır.
+# Paylaşılan önbellek kapalıyken (sürümler süreç içi) tüm parçalar için üst sınırdır
+PANEL_FRAGMENT_EXTERNAL_TTL = int(os.getenv('PANEL_FRAGMENT_EXTERNAL_TTL', '30'))
+# Okuma ağırlıklı sayfalarda asenkron view'lar (ASGI); asgi.py bunu varsayılan olarak açar
+PANEL_ASYNC_VIEWS = os.getenv('PANEL_ASYNC_VIEWS', 'False').lower() == 'true'
+# Asenkron view'larda event loop başına Supabase'e açık bağlantı sayısı
+PANEL_ASYNC_MAX_CONNECTIONS = int(os.getenv('PANEL_ASYNC_MAX_CONNECTIONS', '16'))
+# Uygulama yüklenirken view'ları, şablonları, konum indeksini ve Supabase
+# client'ını hazırla (gunicorn.conf.py --preload ile bunu master'da açar)
+PANEL_WARMUP_ON_READY = os.getenv('PANEL_WARMUP_ON_READY', 'False').lower() == 'true'
+
 # Supabase Configuration
 SUPABASE_URL = os.getenv('SUPABASE_URL', '')
 SUPABASE_SERVICE_ROLE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY', '')
 SUPABASE_ANON_KEY = os.getenv('SUPABASE_ANON_KEY', '')
+# Supabase çağrılarının bağlantı ve okuma zaman aşımları (saniye)
+PANEL_SUPABASE_CONNECT_TIMEOUT = float(os.getenv('PANEL_SUPABASE_CONNECT_TIMEOUT', '2'))
+PANEL_SUPABASE_READ_TIMEOUT = float(os.getenv('PANEL_SUPABASE_READ_TIMEOUT', '8'))
+# İstek başına zaman bütçesi; tüm Supabase çağrıları kalan süreyle sınırlanır
+PANEL_REQUEST_DEADLINE = float(os.getenv('PANEL_REQUEST_DEADLINE', '10'))
+# URL adına göre view bütçeleri, ör. "dashboard_widget=2,appointment_management=6"
+PANEL_VIEW_DEADLINES = {
+    name.strip(): float(seconds)
+    for name, _, seconds in (
+        item.partition('=') for item in os.getenv('PANEL_VIEW_DEADLINES', '').split(',') if item.strip()
+    )
+}
+# Giriş/kayıt için yeniden kullanılan Supabase Auth client sayısı (worker başına)
+PANEL_AUTH_CLIENT_POOL_SIZE = int(os.getenv('PANEL_AUTH_CLIENT_POOL_SIZE', '4'))
+# Girişte Auth çağrısını hastane sorgusuyla paralel çalıştıran thread sayısı (worker başına)
+PANEL_LOGIN_AUTH_THREADS = int(os.getenv('PANEL_LOGIN_AUTH_THREADS', '16'))
+# Süreç içinde eşzamanlı aynı okuma sorgularını tek çağrıda birleştir
+PANEL_COALESCE_READS = os.getenv('PANEL_COALESCE_READS', 'True').lower() == 'true'
+# Tablo bazlı devre kesici: son PANEL_BREAKER_WINDOW saniyede hatalı/yavaş çağrı
+# oranı eşiği aşınca tablo PANEL_BREAKER_OPEN_SECONDS boyunca çağrılmaz
+PANEL_CIRCUIT_BREAKER = os.getenv('PANEL_CIRCUIT_BREAKER', 'True').lower() == 'true'
+PANEL_BREAKER_WINDOW = float(os.getenv('PANEL_BREAKER_WINDOW', '30'))
+PANEL_BREAKER_MIN_CALLS = int(os.getenv('PANEL_BREAKER_MIN_CALLS', '10'))
+PANEL_BREAKER_ERROR_RATE = float(os.getenv('PANEL_BREAKER_ERROR_RATE', '0.5'))
+PANEL_BREAKER_SLOW_CALL = float(os.getenv('PANEL_BREAKER_SLOW_CALL', '2'))
+PANEL_BREAKER_OPEN_SECONDS = float(os.getenv('PANEL_BREAKER_OPEN_SECONDS', '15'))
+# Devre açıkken son başarılı yanıtla okunan tablolar ve saklanan sorgu sayısı
+PANEL_BREAKER_FALLBACK_TABLES = [
+    table.strip()
+    for table in os.getenv('PANEL_BREAKER_FALLBACK_TABLES', 'hospitals,services,doctors').split(',')
+    if table.strip()
+]
+PANEL_BREAKER_FALLBACK_ENTRIES = int(os.getenv('PANEL_BREAKER_FALLBACK_ENTRIES', '512'))
 
 # Email Configuration (SMTP)
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
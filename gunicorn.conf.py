@@ -0,0 +1,36 @@
+"""Gunicorn ayarları.
+
+    gunicorn -c gunicorn.conf.py dent_admin_panel.wsgi
+
+Uygulama master süreçte önceden yüklenir (`preload_app`) ve `ready()`
+içinde ısıtılır (bkz. `panel/warmup.py`); worker'lar hazır belleği fork ile
+devralır.
+"""
+
+import gc
+import multiprocessing
+import os
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dent_admin_panel.settings")
+os.environ.setdefault("PANEL_WARMUP_ON_READY", "True")
+# Master'da dinleyici thread'i/bağlantısı açılmasın; worker'lar post_fork'ta başlatır
+os.environ["PANEL_LISTENER_ON_READY"] = "False"
+# Worker'lar konum indeksini, oturumları ve şablon parçalarını paylaşsın
+os.environ.setdefault("PANEL_SHARED_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".panel_cache"))
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", str(multiprocessing.cpu_count() * 2 + 1)))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+preload_app = True
+
+
+def when_ready(server):
+    # Master'da yüklenen nesneler GC taramasında dokunulup kopyalanmasın
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Dinleyici thread'leri fork sonrası worker'a geçmez
+    from panel.services import cache_invalidation
+
+    cache_invalidation.start_from_settings()
@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class PanelConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'panel'
+
+    def ready(self):
+        from .services import cache_invalidation
+
+        # gunicorn --preload ile master süreçte bir kez çalışır (gunicorn.conf.py)
+        if getattr(settings, 'PANEL_WARMUP_ON_READY', False):
+            from .warmup import warm_up
+
+            warm_up()
+
+        # gunicorn --preload'da master istek almaz; dinleyici yalnızca
+        # worker'larda post_fork kancasından başlatılır (gunicorn.conf.py)
+        if getattr(settings, 'PANEL_LISTENER_ON_READY', True):
+            # PANEL_CACHE_INVALIDATION=off (varsayılan) ise hiçbir şey başlatılmaz
+            cache_invalidation.start_from_settings()
@@ -0,0 +1,66 @@
+"""Paylaşılan SQLite önbelleği için Django cache backend'i.
+
+`panel.services.shared_cache.SharedCache` dosyasını Django'nun cache API'si
+ile kullanır; böylece cache tabanlı oturumlar (SESSION_ENGINE=cache) aynı
+makinedeki tüm gunicorn worker'larınca paylaşılır.
+
+    CACHES = {
+        "sessions": {
+            "BACKEND": "panel.cache_backend.SharedSQLiteCache",
+            "LOCATION": "/var/cache/panel/sessions.sqlite3",
+            "OPTIONS": {"MAX_BYTES": None},
+        },
+    }
+
+`MAX_BYTES` toplam boyut sınırıdır; aşılınca en uzun süredir erişilmeyen
+kayıtlar silinir. Oturumlar için bu kullanıcıların çıkış yapması demektir;
+None yalnızca süresi dolan kayıtları siler.
+"""
+
+from __future__ import annotations
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+from .services.shared_cache import SharedCache
+
+_MISSING = object()
+
+
+class SharedSQLiteCache(BaseCache):
+    def __init__(self, location: str, params: dict):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._cache = SharedCache(location, max_bytes=options.get("MAX_BYTES", 64 * 1024 * 1024))
+
+    def _ttl(self, timeout) -> float | None:
+        timeout = self.get_backend_timeout(timeout)
+        if timeout is None:
+            return None
+        return max(timeout - self._cache._clock(), 0.0)
+
+    def get(self, key, default=None, version=None):
+        return self._cache.get(self.make_and_validate_key(key, version), default)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._cache.set(self.make_and_validate_key(key, version), value, self._ttl(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version)
+        return self._cache.add(key, value, self._ttl(timeout))
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version)
+        value = self._cache.get(key, _MISSING)
+        if value is _MISSING:
+            return False
+        self._cache.set(key, value, self._ttl(timeout))
+        return True
+
+    def delete(self, key, version=None):
+        return self._cache.delete(self.make_and_validate_key(key, version))
+
+    def has_key(self, key, version=None):
+        return self._cache.get(self.make_and_validate_key(key, version), _MISSING) is not _MISSING
+
+    def clear(self):
+        self._cache.clear()
@@ -3,23 +3,36 @@ Context processors for panel app.
 Hospital bilgisi tüm template'lere otomatik olarak eklenir.
 """
 
-from .services import hospital_service
+from django.utils.functional import SimpleLazyObject
+
+from .services import tenant_service
+from .services.circuit_breaker import BACKEND_UNAVAILABLE
+
+
+def _load_hospital(request):
+    # View aynı istekte hastanenin tamamını getirdiyse o kullanılır
+    hospital = getattr(request, "_panel_hospital", None)
+    if hospital is not None:
+        return hospital
+    try:
+        return tenant_service.get_snapshot(request)
+    except (ValueError, AttributeError, KeyError, IndexError, *BACKEND_UNAVAILABLE):
+        # Hastane bulunamazsa (veya backend yanıt vermezse) şablon boş değerle render edilir
+        return None
 
 
 def hospital_context(request):
     """
     Hospital bilgisini tüm template'lere ekler.
-    Bu sayede her view'de tekrar tekrar hospital_service.get_hospital() çağırmaya gerek kalmaz.
-    """
-    try:
-        # Session'dan hospital_id al
-        hospital = hospital_service.get_hospital(request)
-        return {
-            "hospital": hospital,
-        }
-    except (ValueError, AttributeError, KeyError, IndexError):
-        # Login olmamışsa veya hastane bulunamazsa boş dict döndür
-        return {
-            "hospital": None,
-        }
 
+    Değer tembel yüklenir ve yalnızca şablon `hospital`'a eriştiğinde
+    hesaplanır. Aynı istekte view hastaneyi getirdiyse
+    (`hospital_service.get_request_hospital`) o nesne, aksi halde session'daki
+    hastane özeti (`tenant_service.get_snapshot`) kullanılır; özet güncelse
+    backend'e gidilmez. Oturumda hastane yoksa (giriş, kayıt ve hata
+    sayfaları) hiçbir şey yüklenmez.
+    """
+    session = getattr(request, "session", None)
+    if session is None or not session.get("hospital_id"):
+        return {"hospital": None}
+    return {"hospital": SimpleLazyObject(lambda: _load_hospital(request))}
@@ -0,0 +1,70 @@
+"""
+Hızlı ISO tarih/saat ayrıştırma yardımcıları.
+
+Supabase tarihleri "YYYY-MM-DD", saatleri "HH:MM" (veya "HH:MM:SS") olarak
+döndürür. `datetime.strptime` her çağrıda format string'ini yorumladığı için
+yavaştır; burada C ile yazılmış `fromisoformat` kullanılır ve aynı değerler
+(randevu listelerinde çok tekrar eden gün/saat string'leri) önbellekten döner.
+
+Tüm fonksiyonlar geçersiz veya boş değerde None döndürür. `fromisoformat`
+"20240603", "0930" veya "09" gibi biçimleri de kabul ettiğinden değerin
+şekli önce açıkça kontrol edilir; eski `strptime` biçimlerinin reddettiği
+girdiler reddedilmeye devam eder.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time
+from functools import lru_cache
+
+# Farklı gün/saat sayısı pratikte küçüktür; önbellek sınırı bellek güvenliği içindir
+_CACHE_SIZE = 4096
+
+
+def _is_iso_date(value) -> bool:
+    return isinstance(value, str) and len(value) == 10 and value[4] == "-" and value[7] == "-"
+
+
+def _is_iso_time(value) -> bool:
+    if not isinstance(value, str) or len(value) not in (5, 8) or value[2] != ":":
+        return False
+    return len(value) == 5 or value[5] == ":"
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def parse_date(value: str | None) -> date | None:
+    """"YYYY-MM-DD" string'ini date'e çevirir."""
+    if not value or not _is_iso_date(value):
+        return None
+    try:
+        return date.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def parse_time(value: str | None) -> time | None:
+    """"HH:MM" veya "HH:MM:SS" string'ini time'a çevirir."""
+    if not value or not _is_iso_time(value):
+        return None
+    try:
+        return time.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_minutes(value: str | None) -> int | None:
+    """Saati gece yarısından itibaren dakikaya çevirir."""
+    parsed = parse_time(value)
+    if parsed is None:
+        return None
+    return parsed.hour * 60 + parsed.minute
+
+
+def parse_datetime(date_str: str | None, time_str: str | None) -> datetime | None:
+    """Ayrı tarih ve saat string'lerini tek datetime'a birleştirir."""
+    parsed_date = parse_date(date_str)
+    parsed_time = parse_time(time_str)
+    if parsed_date is None or parsed_time is None:
+        return None
+    return datetime.combine(parsed_date, parsed_time)
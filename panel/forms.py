@@ -241,6 +241,7 @@ class HolidayAddForm(forms.Form):
 
 class DoctorForm(forms.Form):
     doctor_id = forms.CharField(widget=forms.HiddenInput, required=False)
+    version = forms.CharField(widget=forms.HiddenInput, required=False)
     name = forms.CharField(label="Ad", max_length=80)
     surname = forms.CharField(label="Soyad", max_length=80)
     bio = forms.CharField(label="Biyografi", widget=forms.Textarea, required=False)
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from panel.benchmarks import SCENARIOS
+
+
+class Command(BaseCommand):
+    help = "Panel performans senaryolarını sentetik veri üzerinde çalıştırır."
+
+    def add_arguments(self, parser):
+        parser.add_argument("scenarios", nargs="*", help=f"Senaryolar: {', '.join(SCENARIOS)} (boşsa tümü)")
+        parser.add_argument("--repeat", type=int, default=3, help="Her ölçüm için tekrar sayısı")
+
+    def handle(self, *args, **options):
+        names = options["scenarios"] or list(SCENARIOS)
+        unknown = [name for name in names if name not in SCENARIOS]
+        if unknown:
+            raise CommandError(f"Bilinmeyen senaryo: {', '.join(unknown)}")
+
+        for name in names:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"[{name}]"))
+            results = SCENARIOS[name](repeat=options["repeat"])
+            for key, value in results.items():
+                self.stdout.write(f"  {key}: {value}")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from panel.warmup import WARMUP_STEPS, warm_up
+
+
+class Command(BaseCommand):
+    help = "Konum indeksini, şablonları ve Supabase client'ını önceden hazırlar."
+
+    def add_arguments(self, parser):
+        parser.add_argument("steps", nargs="*", help=f"Adımlar: {', '.join(WARMUP_STEPS)} (boşsa tümü)")
+
+    def handle(self, *args, **options):
+        steps = tuple(options["steps"]) or None
+        unknown = [name for name in steps or () if name not in WARMUP_STEPS]
+        if unknown:
+            raise CommandError(f"Bilinmeyen adım: {', '.join(unknown)}")
+
+        for name, result in warm_up(steps).items():
+            suffix = " ms" if isinstance(result, float) else ""
+            self.stdout.write(f"  {name}: {result}{suffix}")
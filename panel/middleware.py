@@ -0,0 +1,62 @@
+"""Panel middleware'leri."""
+
+from __future__ import annotations
+
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.shortcuts import render
+
+from .services import deadline
+from .services.circuit_breaker import is_backend_failure
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineMiddleware:
+    """Her isteğe bir zaman bütçesi (deadline) atar.
+
+    Bütçe istek başında `PANEL_REQUEST_DEADLINE` ile başlar; view çözüldüğünde
+    view'ın kendi değeriyle (bkz. `deadline.view_budget`) değiştirilir. View
+    `DeadlineExceeded`, `CircuitOpen` ya da devre kesicinin arıza saydığı
+    başka bir hatayla (bağlantı hataları, 5xx yanıtlar) biterse worker
+    beklemeden 503 sayfası döner.
+    Listenin sonunda durur; oturum ve mesajlar hata sayfasında kullanılabilir.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with deadline.budget(settings.PANEL_REQUEST_DEADLINE):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with deadline.budget(settings.PANEL_REQUEST_DEADLINE):
+            return await self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        current = deadline.current()
+        if current is not None:
+            url_name = request.resolver_match.url_name if request.resolver_match else None
+            current.set_budget(deadline.view_budget(view_func, url_name))
+        return None
+
+    def process_exception(self, request, exception):
+        if not is_backend_failure(exception):
+            return None
+        logger.warning("Backend yanıt vermedi (%s): %s", request.path, exception)
+        response = render(
+            request, "panel/unavailable.html", {"page_title": "Geçici olarak yanıt verilemiyor"}, status=503
+        )
+        response["Retry-After"] = "5"
+        return response
@@ -22,7 +22,7 @@ class HospitalContextMixin:
             from .services import hospital_service
             request = getattr(self, 'request', None)
             try:
-                context['hospital'] = hospital_service.get_hospital(request)
+                context['hospital'] = hospital_service.get_request_hospital(request)
             except ValueError:
                 context['hospital'] = None
         return context
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right, insort
 from datetime import datetime, date, time
-from typing import List
+from itertools import accumulate
+from typing import Iterable, List
 
+from ..dateparse import parse_date, parse_minutes
+from . import data_version
+from .async_client import arows, get_async_client
+from .records import AppointmentRecord
 from .supabase_client import get_supabase_client
 from .hospital_service import _get_active_hospital_id
 
@@ -22,17 +28,19 @@ def get_appointments(request=None) -> List[dict]:
     return [_format_appointment_from_db(a) for a in result.data]
 
 
-def filter_appointments(status=None, doctor_id=None, service_id=None, start_date=None, end_date=None, request=None):
-    """Randevuları filtreler."""
-    supabase = get_supabase_client()
-    query = supabase.table("appointments").select("*")
-
+def _hospital_query(client, columns: str, request=None):
+    query = client.table("appointments").select(columns)
     try:
         hospital_id = _get_active_hospital_id(request)
         query = query.eq("hospital_id", hospital_id)
     except ValueError:
         pass
-    
+    return query
+
+
+def _filter_query(client, status=None, doctor_id=None, service_id=None, start_date=None, end_date=None, request=None):
+    """Filtre sorgusunu verilen (senkron veya asenkron) client ile kurar."""
+    query = _hospital_query(client, "*", request)
     if status:
         query = query.eq("status", status)
     if doctor_id:
@@ -43,7 +51,12 @@ def filter_appointments(status=None, doctor_id=None, service_id=None, start_date
         query = query.gte("date", start_date.isoformat())
     if end_date:
         query = query.lte("date", end_date.isoformat())
-    
+    return query
+
+
+def filter_appointments(status=None, doctor_id=None, service_id=None, start_date=None, end_date=None, request=None):
+    """Randevuları filtreler."""
+    query = _filter_query(get_supabase_client(), status, doctor_id, service_id, start_date, end_date, request)
     result = query.execute()
     
     if not result.data:
@@ -52,8 +65,25 @@ def filter_appointments(status=None, doctor_id=None, service_id=None, start_date
     return [_format_appointment_from_db(a) for a in result.data]
 
 
-def update_appointment(appointment_id: str, **changes):
-    """Randevu bilgilerini günceller."""
+async def afilter_appointments(status=None, doctor_id=None, service_id=None, start_date=None, end_date=None, request=None):
+    """`filter_appointments`'ın asenkron karşılığı."""
+    query = _filter_query(get_async_client(), status, doctor_id, service_id, start_date, end_date, request)
+    return [_format_appointment_from_db(a) for a in await arows(query)]
+
+
+def update_appointment(appointment_id: str, booking_index: BookingIndex | None = None, request=None, **changes):
+    """Randevu bilgilerini günceller.
+
+    Tarih veya saat değişiyorsa yeni slot önce hastane tatillerine ve doktorun
+    diğer randevularına karşı kontrol edilir (iptal edilen randevular hariç).
+    booking_index verilirse kontrol onunla yapılır ve yazmadan sonra güncellenir.
+
+    Raises:
+        AppointmentConflictError: Yeni slot tatilse ya da doktorun başka bir randevusuyla çakışıyorsa
+    """
+    if ("date" in changes or "time" in changes) and changes.get("status") != "cancelled":
+        _check_slot(appointment_id, changes, booking_index, request)
+
     supabase = get_supabase_client()
     
     # Supabase formatına çevir
@@ -71,8 +101,12 @@ def update_appointment(appointment_id: str, **changes):
     
     if not result.data:
         raise ValueError("Randevu bulunamadı veya güncellenemedi")
+    data_version.bump_rows(result.data, "appointments")
     
-    return _format_appointment_from_db(result.data[0])
+    updated = _format_appointment_from_db(result.data[0])
+    if booking_index is not None:
+        booking_index.add(updated)
+    return updated
 
 
 def delete_appointment(appointment_id: str):
@@ -82,113 +116,326 @@ def delete_appointment(appointment_id: str):
     
     if not result.data:
         raise ValueError("Randevu bulunamadı veya silinemedi")
+    data_version.bump_rows(result.data, "appointments")
 
 
 def get_summary(request=None):
     """Randevu özet istatistiklerini getirir."""
-    supabase = get_supabase_client()
     today = datetime.now().date()
     
     # Tüm randevuları al
-    query = supabase.table("appointments").select("status,date")
-    try:
-        hospital_id = _get_active_hospital_id(request)
-        query = query.eq("hospital_id", hospital_id)
-    except ValueError:
-        pass
-    all_appointments = query.execute()
+    all_appointments = _hospital_query(get_supabase_client(), "status,date", request).execute()
     
+    return summarize_appointments(all_appointments.data or [], today)
+
+
+async def aget_summary(request=None):
+    """`get_summary`'nin asenkron karşılığı."""
+    rows = await arows(_hospital_query(get_async_client(), "status,date", request))
+    return summarize_appointments(rows, datetime.now().date())
+
+
+def summarize_appointments(rows: Iterable[dict], today: date) -> dict[str, int]:
+    """Ham randevu satırlarından (status, date) özet sayıları hesaplar."""
     stats = {
         "upcoming": 0,
         "completed": 0,
         "cancelled": 0,
         "today": 0,
     }
-    
-    if all_appointments.data:
-        for apt in all_appointments.data:
-            status = apt.get("status") or "completed"
-            apt_date_str = apt.get("date", "")
-            apt_date_obj = None
-            if apt_date_str:
-                try:
-                    apt_date_obj = datetime.strptime(apt_date_str, "%Y-%m-%d").date()
-                except ValueError:
-                    apt_date_obj = None
-
-            if status == "cancelled":
-                stats["cancelled"] += 1
+
+    for apt in rows:
+        status = apt.get("status") or "completed"
+        apt_date_obj = parse_date(apt.get("date"))
+
+        if status == "cancelled":
+            stats["cancelled"] += 1
+        else:
+            if apt_date_obj and apt_date_obj < today:
+                stats["completed"] += 1
             else:
-                if apt_date_obj and apt_date_obj < today:
-                    stats["completed"] += 1
-                else:
-                    stats["upcoming"] += 1
+                stats["upcoming"] += 1
+
+        if apt_date_obj == today:
+            stats["today"] += 1
 
-            if apt_date_obj == today:
-                stats["today"] += 1
-    
     return stats
 
 
+class HolidayIndex:
+    """Hastane tatilleri için bellek içi aralık indeksi.
+
+    Her gün için tüm gün tatil bilgisi ve saatli tatillerin başlangıca göre
+    sıralı listesi tutulur; bir saatin engelli olup olmadığı bisect ile
+    O(log k) sürede yanıtlanır (k: o günkü saatli tatil sayısı).
+    """
+
+    def __init__(self, holidays: Iterable[dict], day_key: str | None = None):
+        """day_key verilirse tüm satırlar o güne ait kabul edilir (tek gün sorguları)."""
+        self._full_days: set[str] = set()
+        ranges: dict[str, list[tuple[int, int]]] = {}
+        for holiday in holidays:
+            holiday_day = day_key or str(holiday.get("date", ""))
+            # Tüm gün tatil
+            if holiday.get("is_full_day", True):
+                self._full_days.add(holiday_day)
+                continue
+            start = parse_minutes(holiday.get("start_time"))
+            end = parse_minutes(holiday.get("end_time"))
+            if start is not None and end is not None:
+                ranges.setdefault(holiday_day, []).append((start, end))
+
+        # gün -> (sıralı başlangıçlar, bitişlerin önek maksimumu)
+        self._ranges: dict[str, tuple[list[int], list[int]]] = {}
+        for day_key, day_ranges in ranges.items():
+            day_ranges.sort()
+            starts = [start for start, _ in day_ranges]
+            max_ends = list(accumulate((end for _, end in day_ranges), max))
+            self._ranges[day_key] = (starts, max_ends)
+
+    def is_blocked(self, day_key: str, minute: int) -> bool:
+        if day_key in self._full_days:
+            return True
+        day_ranges = self._ranges.get(day_key)
+        if not day_ranges:
+            return False
+        starts, max_ends = day_ranges
+        position = bisect_right(starts, minute)
+        # Randevu saati tatil saatleri arasındaysa (uçlar dahil) engelle
+        return position > 0 and max_ends[position - 1] >= minute
+
+
+def _holidays_query(request=None):
+    supabase = get_supabase_client()
+    query = supabase.table("holidays").select("date,is_full_day,start_time,end_time").is_("doctor_id", "null")
+    try:
+        hospital_id = _get_active_hospital_id(request)
+        query = query.eq("hospital_id", hospital_id)
+    except ValueError:
+        pass
+    return query
+
+
 def is_appointment_time_blocked(appointment_date: date, appointment_time: str, request=None) -> bool:
     """
     Belirli bir tarih ve saatte randevu alınıp alınamayacağını kontrol eder.
     Tüm gün tatillerde True döner (randevu alınamaz).
     Saatli tatillerde sadece tatil saatleri içinde True döner.
     """
-    supabase = get_supabase_client()
     appointment_date_str = appointment_date.isoformat()
     
-    # Randevu saatini time objesine çevir
-    try:
-        apt_time = datetime.strptime(appointment_time, "%H:%M").time()
-    except (ValueError, TypeError):
+    # Randevu saatini dakikaya çevir
+    apt_minute = parse_minutes(appointment_time)
+    if apt_minute is None:
         return False
     
     # O tarihteki hastane tatillerini getir
-    query = supabase.table("holidays").select("*").eq("date", appointment_date_str).is_("doctor_id", "null")
-    try:
-        hospital_id = _get_active_hospital_id(request)
-        query = query.eq("hospital_id", hospital_id)
-    except ValueError:
-        pass
-    result = query.execute()
+    result = _holidays_query(request).eq("date", appointment_date_str).execute()
     
     if not result.data:
         return False
     
-    for holiday in result.data:
-        # Tüm gün tatil
-        if holiday.get("is_full_day", True):
-            return True
-        
-        # Saatli tatil kontrolü
-        start_time_str = holiday.get("start_time")
-        end_time_str = holiday.get("end_time")
-        if start_time_str and end_time_str:
-            try:
-                start_time = datetime.strptime(start_time_str, "%H:%M").time()
-                end_time = datetime.strptime(end_time_str, "%H:%M").time()
-                # Randevu saati tatil saatleri arasındaysa engelle
-                if start_time <= apt_time <= end_time:
-                    return True
-            except (ValueError, TypeError):
-                continue
+    index = HolidayIndex(result.data, day_key=appointment_date_str)
+    return index.is_blocked(appointment_date_str, apt_minute)
+
+
+def are_appointment_times_blocked(slots: Iterable[tuple[date, str]], request=None) -> list[bool]:
+    """
+    Birden çok (tarih, saat) çifti için is_appointment_time_blocked sonucunu döndürür.
+    Kapsanan tarih aralığındaki tatiller tek sorguyla alınır ve tüm kontroller
+    bellek içi HolidayIndex üzerinden yapılır. Sonuçlar girdi sırasındadır.
+    """
+    slots = list(slots)
+    if not slots:
+        return []
     
-    return False
+    days = [slot_date.isoformat() for slot_date, _ in slots]
+    result = _holidays_query(request).gte("date", min(days)).lte("date", max(days)).execute()
+    index = HolidayIndex(result.data or [])
+    
+    blocked = []
+    for day_key, (_, slot_time) in zip(days, slots):
+        minute = parse_minutes(slot_time)
+        blocked.append(minute is not None and index.is_blocked(day_key, minute))
+    return blocked
 
 
-def _format_appointment_from_db(db_appointment: dict) -> dict:
-    """Supabase'den gelen randevu verisini mevcut formata çevirir."""
+DEFAULT_APPOINTMENT_MINUTES = 30
+
+
+class AppointmentConflictError(ValueError):
+    """Randevu, hastane tatiline ya da aynı doktorun dolu bir slotuna taşınmak istendi."""
+
+
+class BookingIndex:
+    """Doktor ve gün bazında dolu randevu slotlarının sıralı indeksi.
+
+    Her (doktor, gün) için (dakika, randevu_id) çiftleri sıralı tutulur;
+    çakışma kontrolü bisect ile O(log n + c) sürer (c: çakışan randevu sayısı).
+    İptal edilen randevular indekse alınmaz.
+    """
+
+    def __init__(self, appointments: Iterable[dict] = (), duration_minutes: int = DEFAULT_APPOINTMENT_MINUTES):
+        self.duration_minutes = duration_minutes
+        self._slots: dict[tuple[str, str], list[tuple[int, str]]] = {}
+        self._positions: dict[str, tuple[str, str, int]] = {}
+        for appointment in appointments:
+            self.add(appointment)
+
+    def add(self, appointment: dict) -> None:
+        """Formatlanmış randevuyu (_format_appointment_from_db) indekse ekler."""
+        appointment_id = str(appointment["id"])
+        self.remove(appointment_id)
+        if appointment.get("status") == "cancelled":
+            return
+        minute = parse_minutes(appointment.get("time"))
+        if minute is None:
+            return
+        key = (str(appointment.get("doctorId", "")), str(appointment.get("date", "")))
+        insort(self._slots.setdefault(key, []), (minute, appointment_id))
+        self._positions[appointment_id] = (key[0], key[1], minute)
+
+    def remove(self, appointment_id: str) -> None:
+        position = self._positions.pop(str(appointment_id), None)
+        if position is None:
+            return
+        doctor_id, day_key, minute = position
+        entries = self._slots.get((doctor_id, day_key), [])
+        index = bisect_left(entries, (minute, str(appointment_id)))
+        if index < len(entries) and entries[index] == (minute, str(appointment_id)):
+            entries.pop(index)
+
+    def doctor_of(self, appointment_id: str) -> str | None:
+        position = self._positions.get(str(appointment_id))
+        return position[0] if position else None
+
+    def conflicts(self, doctor_id: str, day_key: str, time_str: str, exclude_id: str | None = None) -> list[str]:
+        """Verilen saatte başlayacak randevuyla çakışan randevu ID'lerini döndürür."""
+        minute = parse_minutes(time_str)
+        entries = self._slots.get((str(doctor_id), day_key))
+        if minute is None or not entries:
+            return []
+        # [minute, minute + süre) ile kesişen randevular: başlangıcı (minute - süre, minute + süre) aralığında
+        low = bisect_left(entries, (minute - self.duration_minutes + 1,))
+        high = bisect_left(entries, (minute + self.duration_minutes,))
+        return [
+            appointment_id
+            for _, appointment_id in entries[low:high]
+            if appointment_id != exclude_id
+        ]
+
+    def find_all_conflicts(self) -> list[dict]:
+        """Birbiriyle çakışan randevu gruplarını raporlar."""
+        report = []
+        for (doctor_id, day_key), entries in sorted(self._slots.items()):
+            group: list[tuple[int, str]] = []
+            group_end = -1
+            for minute, appointment_id in entries:
+                if group and minute < group_end:
+                    group.append((minute, appointment_id))
+                    group_end = max(group_end, minute + self.duration_minutes)
+                    continue
+                if len(group) > 1:
+                    report.append(_conflict_entry(doctor_id, day_key, group))
+                group = [(minute, appointment_id)]
+                group_end = minute + self.duration_minutes
+            if len(group) > 1:
+                report.append(_conflict_entry(doctor_id, day_key, group))
+        return report
+
+
+def _conflict_entry(doctor_id: str, day_key: str, group: list[tuple[int, str]]) -> dict:
+    first_minute = group[0][0]
     return {
-        "id": str(db_appointment.get("id", "")),
-        "userId": str(db_appointment.get("user_id", "")),
-        "hospitalId": str(db_appointment.get("hospital_id", "")),
-        "doctorId": str(db_appointment.get("doctor_id", "")),
-        "date": db_appointment.get("date", ""),
-        "time": db_appointment.get("time", ""),
-        "status": db_appointment.get("status") or "completed",
-        "service": str(db_appointment.get("service_id", "")),
-        "notes": db_appointment.get("notes", ""),
-        "createdAt": db_appointment.get("created_at", ""),
+        "doctorId": doctor_id,
+        "date": day_key,
+        "time": f"{first_minute // 60:02d}:{first_minute % 60:02d}",
+        "appointmentIds": [appointment_id for _, appointment_id in group],
     }
+
+
+def build_booking_index(
+    start_date: date,
+    end_date: date,
+    doctor_id: str | None = None,
+    request=None,
+    duration_minutes: int = DEFAULT_APPOINTMENT_MINUTES,
+) -> BookingIndex:
+    """Tarih aralığındaki randevuları tek sorguyla okuyup BookingIndex oluşturur."""
+    supabase = get_supabase_client()
+    query = (
+        supabase.table("appointments")
+        .select("id,doctor_id,date,time,status")
+        .gte("date", start_date.isoformat())
+        .lte("date", end_date.isoformat())
+    )
+    try:
+        hospital_id = _get_active_hospital_id(request)
+        query = query.eq("hospital_id", hospital_id)
+    except ValueError:
+        pass
+    if doctor_id:
+        query = query.eq("doctor_id", doctor_id)
+    result = query.execute()
+
+    return BookingIndex(
+        (_format_appointment_from_db(a) for a in result.data or []),
+        duration_minutes=duration_minutes,
+    )
+
+
+def find_conflicts(start_date: date, end_date: date, request=None) -> list[dict]:
+    """Tarih aralığındaki tüm çift rezervasyonları raporlar."""
+    return build_booking_index(start_date, end_date, request=request).find_all_conflicts()
+
+
+def _check_slot(appointment_id: str, changes: dict, booking_index: BookingIndex | None, request=None) -> None:
+    """Randevunun taşınacağı (tarih, saat) slotu boş değilse AppointmentConflictError fırlatır."""
+    new_date = changes.get("date")
+    new_time = changes.get("time")
+    doctor_id = booking_index.doctor_of(appointment_id) if booking_index else None
+    if doctor_id is None or new_date is None or new_time is None:
+        # Doktor ya da değişmeyen tarih/saat mevcut kayıttan alınır
+        supabase = get_supabase_client()
+        row = supabase.table("appointments").select("id,doctor_id,date,time").eq("id", appointment_id).execute()
+        if not row.data:
+            raise ValueError("Randevu bulunamadı")
+        current = row.data[0]
+        doctor_id = str(current.get("doctor_id", ""))
+        new_date = current.get("date") if new_date is None else new_date
+        new_time = current.get("time") if new_time is None else new_time
+
+    day = parse_date(new_date) if isinstance(new_date, str) else new_date
+    time_str = new_time if isinstance(new_time, str) else new_time.strftime("%H:%M")
+    if day is None:
+        raise ValueError("Geçersiz randevu tarihi")
+
+    if is_appointment_time_blocked(day, time_str, request=request):
+        raise AppointmentConflictError("Bu tarih ve saatte hastane tatilde.")
+    if booking_index is None:
+        booking_index = build_booking_index(day, day, doctor_id=doctor_id, request=request)
+    if booking_index.conflicts(doctor_id, day.isoformat(), time_str, exclude_id=str(appointment_id)):
+        raise AppointmentConflictError("Doktorun bu saatte başka bir randevusu var.")
+
+
+def reschedule_appointment(
+    appointment_id: str,
+    new_date: date,
+    new_time: str,
+    booking_index: BookingIndex | None = None,
+    request=None,
+) -> dict:
+    """Randevuyu yeni tarih/saate taşır; slot tatilse ya da doktor doluysa hata fırlatır.
+
+    Toplu taşımalarda aynı booking_index verilerek her kontrol O(log n) yapılır;
+    indeks başarılı her yazmadan sonra güncellenir.
+
+    Raises:
+        AppointmentConflictError: Yeni slot tatilse ya da doktorun başka bir randevusuyla çakışıyorsa
+    """
+    return update_appointment(appointment_id, booking_index=booking_index, request=request, date=new_date, time=new_time)
+
+
+def _format_appointment_from_db(db_appointment: dict) -> AppointmentRecord:
+    """Supabase'den gelen randevu verisini mevcut formata çevirir."""
+    return AppointmentRecord(db_appointment)
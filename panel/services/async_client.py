@@ -0,0 +1,77 @@
+"""Asenkron PostgREST client'ı (ASGI view'ları için).
+
+Senkron `get_supabase_client()` ile aynı tabloları, aynı sorgu API'siyle
+(`table().select().eq()...`) okur; fark, `execute()`'un await edilmesidir.
+Böylece bir view'daki bağımsız sorgular `asyncio.gather` ile aynı anda
+çalışır ve yavaş bir Supabase yanıtı worker'ı bloklamaz.
+
+httpx bağlantı havuzu event loop'a bağlı olduğundan her event loop için ayrı
+bir client tutulur (ASGI sunucusunda worker başına tek loop vardır). Client'ın
+Supabase'e açık bağlantı sayısı `PANEL_ASYNC_MAX_CONNECTIONS` ile sınırlıdır.
+Client, senkron client ile aynı devre kesiciyi (`circuit_breaker`) paylaşır.
+
+Asenkron servis fonksiyonları `a` önekiyle senkron karşılıklarının yanında
+durur (ör. `doctor_service.aget_doctors`). Aktif hastane session'dan okunur;
+asenkron view'lar session'ı `login_required` içinde `aget` ile yüklediği için
+`_get_active_hospital_id` bu yolda veritabanına gitmez.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+
+from .circuit_breaker import CircuitBreakerClient
+
+if TYPE_CHECKING:
+    from postgrest import AsyncPostgrestClient
+
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncPostgrestClient] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _create_client() -> AsyncPostgrestClient:
+    supabase_url = getattr(settings, "SUPABASE_URL", None)
+    supabase_key = getattr(settings, "SUPABASE_SERVICE_ROLE_KEY", None)
+    if not supabase_url or not supabase_key:
+        raise ValueError("SUPABASE_URL ve SUPABASE_SERVICE_ROLE_KEY ayarları gerekli")
+
+    from postgrest import AsyncPostgrestClient
+
+    from .http_transport import create_async_http_client
+
+    client = AsyncPostgrestClient(
+        f"{supabase_url.rstrip('/')}/rest/v1",
+        headers={"apikey": supabase_key, "Authorization": f"Bearer {supabase_key}"},
+        # Zaman aşımları isteğin deadline'ıyla sınırlanır (bkz. http_transport)
+        http_client=create_async_http_client(settings.PANEL_ASYNC_MAX_CONNECTIONS),
+    )
+    if settings.PANEL_CIRCUIT_BREAKER:
+        client = CircuitBreakerClient(client)
+    return client
+
+
+def get_async_client() -> AsyncPostgrestClient:
+    """Çalışan event loop'un asenkron PostgREST client'ını döndürür."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = _create_client()
+    return client
+
+
+async def aclose_client() -> None:
+    """Çalışan event loop'un client'ını kapatır (ör. benchmark sonunda)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def arows(query) -> list:
+    """Asenkron sorguyu çalıştırır ve satırları döndürür."""
+    result = await query.execute()
+    return result.data or []
@@ -2,13 +2,95 @@
 
 from __future__ import annotations
 
+import contextvars
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterator
+
 from django.conf import settings
-from supabase import create_client, Client
+
+from .supabase_client import get_supabase_client
+from .tenant_service import SNAPSHOT_COLUMNS
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+logger = logging.getLogger(__name__)
+
+# Girişte hastane satırından okunan kolonlar: özet + sahiplik kontrolü
+LOGIN_HOSPITAL_COLUMNS = f"{SNAPSHOT_COLUMNS}, created_by_user_id"
 
 
 def get_auth_client() -> Client:
     """Supabase Auth client'ı döndürür (anon key ile)."""
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
+    from supabase import ClientOptions, create_client
+
+    from .http_transport import create_http_client
+
+    # Sunucu tarafında oturum saklanmaz ve token yenileme zamanlayıcısı kurulmaz
+    options = ClientOptions(auto_refresh_token=False, persist_session=False, httpx_client=create_http_client())
+    return create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY, options=options)
+
+
+def clear_session(client: Client) -> None:
+    """Client'taki kullanıcı oturumunu yalnızca bellekten siler.
+
+    `sign_out` Auth sunucusunda oturumu iptal eden bir ağ çağrısı yapar;
+    burada yalnızca bir sonraki kullanıcının önceki oturumu (ve onun
+    Authorization başlığını) devralmaması gerekir. supabase-auth'un iç
+    metotlarını kullanır; sürüm üst sınırı requirements.txt'tedir ve
+    testler bu metotların varlığını doğrular.
+    """
+    client.auth._remove_session()
+    # Client, Authorization başlığını anon key'e geri alır
+    client.auth._notify_all_subscribers("SIGNED_OUT", None)
+
+
+class AuthClientPool:
+    """Auth client'larını yeniden kullanan havuz.
+
+    Client oluşturmak (~25 ms) ve her girişte yeni TLS bağlantısı kurmak
+    yerine boşta bekleyen client'lar kullanılır. Bir client aynı anda tek
+    bir istek tarafından kullanılır; havuz doluysa fazla client bırakılır.
+    Havuza dönen client'ın oturumu `reset` ile temizlenir; temizlenemeyen
+    client havuza geri konmaz.
+    """
+
+    def __init__(self, factory: Callable[[], Client], size: int,
+                 reset: Callable[[Client], None] = clear_session):
+        self._factory = factory
+        self._size = size
+        self._reset = reset
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+
+    @contextmanager
+    def client(self) -> Iterator[Client]:
+        try:
+            client = self._idle.get_nowait()
+        except queue.Empty:
+            client = self._factory()
+        try:
+            yield client
+        finally:
+            if self._idle.qsize() < self._size:
+                try:
+                    self._reset(client)
+                except Exception:
+                    # Her girişte yeni client oluşturulur; havuz fiilen devre dışıdır
+                    logger.exception("Auth client oturumu temizlenemedi; client havuza geri konmadı")
+                else:
+                    self._idle.put(client)
+
+
+auth_clients = AuthClientPool(get_auth_client, size=settings.PANEL_AUTH_CLIENT_POOL_SIZE)
+# Giriş sırasında Auth çağrısı hastane sorgusuyla paralel çalışır. Havuzdan
+# bağımsız boyutlanır: havuz yalnızca boşta tutulan client sayısını sınırlar,
+# eşzamanlı girişler bu sınırda sıraya girmemelidir.
+_login_executor = ThreadPoolExecutor(
+    max_workers=settings.PANEL_LOGIN_AUTH_THREADS, thread_name_prefix="panel-login"
+)
 
 
 def sign_up(email: str, password: str) -> dict:
@@ -24,16 +106,15 @@ def sign_up(email: str, password: str) -> dict:
     Raises:
         Exception: Kayıt başarısız olursa
     """
-    supabase = get_auth_client()
-    
-    # Email doğrulama kapalı olacak (sadece admin onayı)
-    response = supabase.auth.sign_up({
-        "email": email,
-        "password": password,
-        "options": {
-            "email_redirect_to": None  # Email doğrulama kapalı
-        }
-    })
+    with auth_clients.client() as supabase:
+        # Email doğrulama kapalı olacak (sadece admin onayı)
+        response = supabase.auth.sign_up({
+            "email": email,
+            "password": password,
+            "options": {
+                "email_redirect_to": None  # Email doğrulama kapalı
+            }
+        })
     
     if response.user is None:
         raise ValueError("Kullanıcı kaydı oluşturulamadı")
@@ -58,12 +139,11 @@ def sign_in(email: str, password: str) -> dict:
     Raises:
         Exception: Giriş başarısız olursa
     """
-    supabase = get_auth_client()
-    
-    response = supabase.auth.sign_in_with_password({
-        "email": email,
-        "password": password,
-    })
+    with auth_clients.client() as supabase:
+        response = supabase.auth.sign_in_with_password({
+            "email": email,
+            "password": password,
+        })
     
     if response.user is None:
         raise ValueError("Email veya şifre hatalı")
@@ -75,6 +155,50 @@ def sign_in(email: str, password: str) -> dict:
     }
 
 
+def login(hospital_code: str, email: str, password: str) -> tuple[dict, dict]:
+    """Hastane kodu, email ve şifre ile giriş yapar.
+
+    Hastane satırı (durum ve sahip dahil) istek thread'inde tek sorguyla
+    okunur; Auth girişi bu sorguyla aynı anda ayrı bir thread'de çalışır,
+    böylece giriş süresi iki ardışık çağrı yerine ikisinden uzun olanı kadardır.
+    Bunun bedeli: Auth girişi hastane kodu ve onay kontrolünden önce başlar;
+    kod geçersiz olsa da başlamış bir Auth çağrısı iptal edilemez (yalnızca
+    henüz başlamamışsa gönderilmez) ve sonucu kullanılmaz.
+
+    Returns:
+        tuple: (hastane satırı, sign_in sonucu)
+
+    Raises:
+        ValueError: Hastane kodu geçersizse, hastane onaylı değilse veya
+            kullanıcı hastanenin sahibi değilse (mesaj kullanıcıya gösterilir)
+    """
+    # Auth çağrısı isteğin deadline'ını taşısın diye context kopyalanır
+    auth_future = _login_executor.submit(contextvars.copy_context().run, sign_in, email, password)
+    try:
+        result = (
+            get_supabase_client()
+            .table("hospitals")
+            .select(LOGIN_HOSPITAL_COLUMNS)
+            .eq("hospital_code", hospital_code)
+            .limit(1)
+            .execute()
+        )
+        if not result.data:
+            raise ValueError("Geçersiz hastane kodu.")
+        hospital = result.data[0]
+        if hospital.get("status") != "approved":
+            raise ValueError("Hastaneniz henüz onaylanmamış. Lütfen onay bekleyin.")
+    except BaseException:
+        # Henüz başlamadıysa gereksiz Auth çağrısı yapılmaz
+        auth_future.cancel()
+        raise
+
+    auth_response = auth_future.result()
+    if str(hospital.get("created_by_user_id")) != auth_response["user_id"]:
+        raise ValueError("Bu email adresi bu hastaneye ait değil.")
+    return hospital, auth_response
+
+
 def get_user_by_email(email: str) -> dict | None:
     """Email'e göre kullanıcı bilgilerini getirir.
     
@@ -85,10 +209,8 @@ def get_user_by_email(email: str) -> dict | None:
         dict: Kullanıcı bilgileri veya None
     """
     try:
-        supabase = get_auth_client()
         # Supabase Admin API kullanarak kullanıcıyı bul
         # Not: Bu service_role key gerektirir
-        from .supabase_client import get_supabase_client
         admin_client = get_supabase_client()
         
         # auth.users tablosuna direkt erişim yok, bu yüzden user_profiles üzerinden kontrol edelim
@@ -0,0 +1,284 @@
+"""Doktor müsaitlik (boş randevu slotu) motoru.
+
+Çalışma saatleri, tatiller ve dolu randevular bir tarih aralığı için tek
+seferde yüklenir. Her gün, dakika cinsinden sıralı ve ayrık yarı açık aralık
+listesi [(başlangıç, bitiş), ...] olarak temsil edilir; boş slotlar bu
+aralıklardan üretilir.
+
+Karmaşıklık: D doktor, N gün, H tatil ve A randevu için yükleme sabit sayıda
+sorgu (hastane, doktorlar, tatiller, randevular) ve O(H + A) gruplamadır.
+Hesaplama O(D·N + Σ k·log k + S) sürer; k bir doktorun bir gündeki engel
+(tatil + randevu) sayısı, S üretilen slot sayısıdır.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from ..dateparse import parse_minutes
+from .supabase_client import get_supabase_client
+from .hospital_service import _get_active_hospital_id, get_request_hospital
+from .doctor_service import get_doctors
+
+DEFAULT_SLOT_MINUTES = 30
+DAY_MINUTES = 24 * 60
+
+_WEEKDAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+_FULL_DAY = [(0, DAY_MINUTES)]
+_MINUTE_LABELS = [f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(DAY_MINUTES)]
+
+
+@dataclass
+class AvailabilityData:
+    """Bir tarih aralığı için müsaitlik hesabında kullanılan ham veriler."""
+
+    hospital_hours: dict
+    is_open_24_hours: bool
+    doctors: list[dict]
+    # "YYYY-MM-DD" -> hastane geneli tatil satırları
+    hospital_holidays: dict[str, list[dict]] = field(default_factory=dict)
+    # (doctor_id, "YYYY-MM-DD") -> doktor tatil satırları
+    doctor_holidays: dict[tuple[str, str], list[dict]] = field(default_factory=dict)
+    # (doctor_id, "YYYY-MM-DD") -> dolu randevu saatleri ("HH:MM")
+    bookings: dict[tuple[str, str], list[str]] = field(default_factory=dict)
+
+
+def load_availability_data(start_date: date, end_date: date, request=None) -> AvailabilityData:
+    """Aralık için hastane, doktor, tatil ve randevu verilerini tek seferde yükler."""
+    supabase = get_supabase_client()
+    hospital_id = _get_active_hospital_id(request)
+    hospital = get_request_hospital(request)
+    doctors = get_doctors(request)
+
+    holidays_result = (
+        supabase.table("holidays")
+        .select("doctor_id,date,is_full_day,start_time,end_time")
+        .eq("hospital_id", hospital_id)
+        .gte("date", start_date.isoformat())
+        .lte("date", end_date.isoformat())
+        .execute()
+    )
+    appointments_result = (
+        supabase.table("appointments")
+        .select("doctor_id,date,time,status")
+        .eq("hospital_id", hospital_id)
+        .gte("date", start_date.isoformat())
+        .lte("date", end_date.isoformat())
+        .execute()
+    )
+
+    return build_availability_data(
+        hospital,
+        doctors,
+        holidays_result.data or [],
+        appointments_result.data or [],
+    )
+
+
+def build_availability_data(
+    hospital: dict,
+    doctors: list[dict],
+    holiday_rows: list[dict],
+    appointment_rows: list[dict],
+) -> AvailabilityData:
+    """Supabase satırlarını gün/doktor bazında gruplar."""
+    data = AvailabilityData(
+        hospital_hours=hospital.get("workingHours", {}) or {},
+        is_open_24_hours=bool(hospital.get("is_open_24_hours")),
+        doctors=doctors,
+    )
+
+    for holiday in holiday_rows:
+        day_key = holiday.get("date")
+        if not day_key:
+            continue
+        doctor_id = holiday.get("doctor_id")
+        if doctor_id:
+            data.doctor_holidays.setdefault((str(doctor_id), day_key), []).append(holiday)
+        else:
+            data.hospital_holidays.setdefault(day_key, []).append(holiday)
+
+    for appointment in appointment_rows:
+        # Durumu boş olan randevular "completed" kabul edilir (appointment_service ile aynı)
+        if (appointment.get("status") or "completed") == "cancelled":
+            continue
+        day_key = appointment.get("date")
+        time_str = appointment.get("time")
+        if day_key and time_str:
+            key = (str(appointment.get("doctor_id", "")), day_key)
+            data.bookings.setdefault(key, []).append(time_str)
+
+    return data
+
+
+def compute_free_slots(
+    data: AvailabilityData,
+    start_date: date,
+    end_date: date,
+    doctor_ids: list[str] | None = None,
+    slot_minutes: int = DEFAULT_SLOT_MINUTES,
+    not_before: datetime | None = None,
+) -> dict[str, dict[str, list[str]]]:
+    """Doktor ve gün bazında boş slotları hesaplar.
+
+    Args:
+        data: load_availability_data ile yüklenen veriler
+        start_date: Başlangıç günü (dahil)
+        end_date: Bitiş günü (dahil)
+        doctor_ids: Sadece bu doktorlar (None ise tüm aktif doktorlar)
+        slot_minutes: Slot uzunluğu; slotlar gece yarısından itibaren bu ızgaraya hizalanır
+        not_before: Bu andan önce başlayan slotlar döndürülmez
+
+    Returns:
+        {doctor_id: {"YYYY-MM-DD": ["09:00", "09:30", ...]}}
+    """
+    wanted = set(doctor_ids) if doctor_ids is not None else None
+    doctors = [
+        doctor for doctor in data.doctors
+        if doctor.get("isActive", True) and (wanted is None or doctor["id"] in wanted)
+    ]
+
+    # Hastane açık aralıkları gün başına bir kez hesaplanır ve tüm doktorlarca paylaşılır
+    days: list[tuple[str, str, list[tuple[int, int]], int]] = []
+    current = start_date
+    while current <= end_date:
+        day_key = current.isoformat()
+        weekday_name = _WEEKDAY_NAMES[current.weekday()]
+        hospital_open = _hospital_open_intervals(data, weekday_name)
+        hospital_open = _subtract(hospital_open, _holiday_blocks(data.hospital_holidays.get(day_key, ())))
+        earliest = 0
+        if not_before is not None:
+            if current < not_before.date():
+                earliest = DAY_MINUTES
+            elif current == not_before.date():
+                earliest = not_before.hour * 60 + not_before.minute
+        days.append((day_key, weekday_name, hospital_open, earliest))
+        current += timedelta(days=1)
+
+    result: dict[str, dict[str, list[str]]] = {}
+    for doctor in doctors:
+        doctor_id = doctor["id"]
+        doctor_hours = doctor.get("workingHours", {}) or {}
+        doctor_days: dict[str, list[str]] = {}
+        for day_key, weekday_name, hospital_open, earliest in days:
+            if not hospital_open or earliest >= DAY_MINUTES:
+                doctor_days[day_key] = []
+                continue
+            free = _intersect(hospital_open, _day_intervals(doctor_hours.get(weekday_name)))
+            if free:
+                blocks = _holiday_blocks(data.doctor_holidays.get((doctor_id, day_key), ()))
+                for time_str in data.bookings.get((doctor_id, day_key), ()):
+                    minute = parse_minutes(time_str)
+                    if minute is not None:
+                        blocks.append((minute, minute + slot_minutes))
+                free = _subtract(free, blocks)
+            doctor_days[day_key] = _slots(free, slot_minutes, earliest)
+        result[doctor_id] = doctor_days
+    return result
+
+
+def get_free_slots(
+    start_date: date,
+    end_date: date,
+    doctor_ids: list[str] | None = None,
+    slot_minutes: int = DEFAULT_SLOT_MINUTES,
+    request=None,
+) -> dict[str, dict[str, list[str]]]:
+    """Aktif hastane için boş slotları getirir (geçmiş saatler hariç)."""
+    data = load_availability_data(start_date, end_date, request)
+    return compute_free_slots(
+        data,
+        start_date,
+        end_date,
+        doctor_ids=doctor_ids,
+        slot_minutes=slot_minutes,
+        not_before=datetime.now(),
+    )
+
+
+def _day_intervals(day_info: dict | None) -> list[tuple[int, int]]:
+    """Bir günün çalışma saatini aralık listesine çevirir."""
+    if not day_info or not day_info.get("isAvailable"):
+        return []
+    start = parse_minutes(day_info.get("start"))
+    end = parse_minutes(day_info.get("end"))
+    # Saat bilgisi olmayan açık gün (7/24) tüm gün kabul edilir
+    if start is None and end is None:
+        return list(_FULL_DAY)
+    start = start or 0
+    end = end if end is not None else DAY_MINUTES
+    return [(start, end)] if start < end else []
+
+
+def _hospital_open_intervals(data: AvailabilityData, weekday_name: str) -> list[tuple[int, int]]:
+    if data.is_open_24_hours:
+        return list(_FULL_DAY)
+    return _day_intervals(data.hospital_hours.get(weekday_name))
+
+
+def _holiday_blocks(holidays) -> list[tuple[int, int]]:
+    """Tatil satırlarını engel aralıklarına çevirir.
+
+    is_appointment_time_blocked bitiş saatini de kapsadığı için (start <= t <= end)
+    saatli tatil bitişine bir dakika eklenir.
+    """
+    blocks: list[tuple[int, int]] = []
+    for holiday in holidays:
+        if holiday.get("is_full_day", True):
+            return list(_FULL_DAY)
+        start = parse_minutes(holiday.get("start_time"))
+        end = parse_minutes(holiday.get("end_time"))
+        if start is not None and end is not None:
+            blocks.append((start, end + 1))
+    return blocks
+
+
+def _intersect(first: list[tuple[int, int]], second: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """İki sıralı ve ayrık aralık listesinin kesişimini döndürür."""
+    result = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            result.append((start, end))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def _subtract(intervals: list[tuple[int, int]], blocks: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Sıralı ve ayrık aralıklardan (sırasız olabilen) engelleri çıkarır."""
+    if not blocks or not intervals:
+        return intervals
+    blocks = sorted(blocks)
+    result = []
+    index = 0
+    for start, end in intervals:
+        # Bu aralıktan önce biten engelleri atla
+        while index < len(blocks) and blocks[index][1] <= start:
+            index += 1
+        cursor = start
+        scan = index
+        while scan < len(blocks) and blocks[scan][0] < end:
+            block_start, block_end = blocks[scan]
+            if block_start > cursor:
+                result.append((cursor, block_start))
+            cursor = max(cursor, block_end)
+            scan += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+
+def _slots(intervals: list[tuple[int, int]], slot_minutes: int, earliest: int = 0) -> list[str]:
+    """Aralıklara tamamen sığan, ızgaraya hizalı slot başlangıçlarını döndürür."""
+    slots = []
+    for start, end in intervals:
+        start = max(start, earliest)
+        first = -(-start // slot_minutes) * slot_minutes
+        slots.extend(_MINUTE_LABELS[minute] for minute in range(first, end - slot_minutes + 1, slot_minutes))
+    return slots
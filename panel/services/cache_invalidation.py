@@ -0,0 +1,280 @@
+"""Değişiklik bildirimleriyle önbellek geçersiz kılma.
+
+TTL tabanlı önbellek eski veri ile yük arasında bir denge gerektirir. Bu modül
+`hospitals`, `doctors`, `services`, `holidays` ve `appointments` tablolarındaki
+değişiklikleri dinler ve ilgili hastanenin önbellek kayıtlarını hemen siler.
+
+Kaynaklar:
+- RealtimeChangeSource: Supabase Realtime (postgres_changes) aboneliği
+- PollingChangeSource: `updated_at` kolonunu periyodik sorgulayan yedek yol
+- LocalChangeSource: Realtime ile aynı biçimde olay üreten, ağ gerektirmeyen
+  yerel kaynak (testler ve geliştirme için)
+
+Ayar: PANEL_CACHE_INVALIDATION = "off" | "realtime" | "polling" | "local"
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from django.conf import settings
+
+from . import data_version
+from .service_service import invalidate_services_cache
+from .swr_cache import invalidate_hospital, panel_cache
+
+logger = logging.getLogger(__name__)
+
+WATCHED_TABLES = ("hospitals", "doctors", "services", "holidays", "appointments")
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    table: str
+    # None: hastane bilinmiyor veya tablo hastaneye bağlı değil (services) -> tümü silinir
+    hospital_id: str | None
+
+
+def change_from_payload(payload: dict) -> ChangeEvent:
+    """Realtime postgres_changes payload'ını ChangeEvent'e çevirir.
+
+    DELETE olaylarında `old_record` yalnızca birincil anahtarı içerebilir
+    (replica identity default); bu durumda hastane bilinmez.
+    """
+    data = payload.get("data", payload)
+    table = data.get("table", "")
+    record = data.get("record") or data.get("old_record") or {}
+    hospital_id = record.get("id") if table == "hospitals" else record.get("hospital_id")
+    return ChangeEvent(table=table, hospital_id=str(hospital_id) if hospital_id else None)
+
+
+def apply_change(event: ChangeEvent) -> None:
+    """Değişikliğin etkilediği önbellek kayıtlarını siler ve veri sürümünü yeniler."""
+    data_version.bump(event.hospital_id, event.table)
+    if event.table == "services":
+        invalidate_services_cache()
+    if event.hospital_id:
+        invalidate_hospital(event.hospital_id)
+    else:
+        panel_cache.invalidate()
+
+
+class LocalChangeSource:
+    """Realtime biçiminde olayları senkron olarak ileten yerel kaynak."""
+
+    def __init__(self):
+        self._callback: Callable[[dict], None] | None = None
+
+    def start(self, callback: Callable[[dict], None]) -> None:
+        self._callback = callback
+
+    def stop(self) -> None:
+        self._callback = None
+
+    def emit(self, table: str, record: dict, event_type: str = "UPDATE") -> None:
+        """Bir tablo değişikliğini abonelere iletir (abone yoksa yok sayılır)."""
+        if self._callback is None:
+            return
+        key = "old_record" if event_type == "DELETE" else "record"
+        self._callback({
+            "data": {
+                "schema": "public",
+                "table": table,
+                "type": event_type,
+                "commit_timestamp": datetime.now(timezone.utc).isoformat(),
+                key: record,
+            },
+            "ids": [],
+        })
+
+
+class PollingChangeSource:
+    """`updated_at` kolonu üzerinden değişiklikleri periyodik olarak sorgular.
+
+    Başlangıç noktası uygulama saatinden değil, her tablonun veritabanındaki
+    en büyük `updated_at` değerinden alınır; sunucu ile uygulama saati
+    arasındaki fark olay kaybettirmez. Her sorgu son görülen zamandan
+    `overlap` saniye geriden başlar (geç commit edilen satırlar için);
+    pencerede tekrar görülen satırlar (id, updated_at) ile elenir.
+
+    Silinen satırlar görülemez; silmeler için Realtime tercih edilmelidir.
+    """
+
+    def __init__(self, client_factory: Callable[[], Any], interval: float = 5.0,
+                 tables: tuple[str, ...] = WATCHED_TABLES, overlap: float = 30.0):
+        self._client_factory = client_factory
+        self._interval = interval
+        self._tables = tables
+        self._overlap = timedelta(seconds=overlap)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Tablo yoksa henüz tohumlanmadı; None ise tablo boştu
+        self._since: dict[str, datetime | None] = {}
+        self._seen: dict[str, dict[tuple, datetime]] = {table: {} for table in tables}
+
+    def start(self, callback: Callable[[dict], None]) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(callback,), daemon=True, name="panel-cache-polling"
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def seed(self) -> None:
+        """Henüz tohumlanmamış tabloların başlangıcını veritabanındaki son `updated_at`'e ayarlar."""
+        client = self._client_factory()
+        for table in self._tables:
+            if table in self._since:
+                continue
+            rows = (
+                client.table(table)
+                .select("id,updated_at")
+                .order("updated_at", desc=True)
+                .limit(1)
+                .execute()
+            ).data or []
+            if rows:
+                updated_at = _parse_timestamp(rows[0]["updated_at"])
+                self._seen[table][(rows[0]["id"], rows[0]["updated_at"])] = updated_at
+                self._since[table] = updated_at
+            else:
+                self._since[table] = None
+
+    def poll_once(self, callback: Callable[[dict], None]) -> None:
+        self.seed()
+        client = self._client_factory()
+        for table in self._tables:
+            columns = "id,updated_at" if table == "hospitals" else "id,hospital_id,updated_at"
+            query = client.table(table).select(columns)
+            since = self._since[table]
+            if since is not None:
+                query = query.gte("updated_at", (since - self._overlap).isoformat())
+            result = query.order("updated_at").execute()
+            seen = self._seen[table]
+            for row in result.data or []:
+                key = (row["id"], row["updated_at"])
+                if key in seen:
+                    continue
+                updated_at = seen[key] = _parse_timestamp(row["updated_at"])
+                since = updated_at if since is None else max(since, updated_at)
+                callback({"data": {"schema": "public", "table": table, "type": "UPDATE", "record": row}})
+            self._since[table] = since
+            if since is not None:
+                for key in [key for key, updated_at in seen.items() if updated_at < since - self._overlap]:
+                    del seen[key]
+
+    def _run(self, callback: Callable[[dict], None]) -> None:
+        try:
+            self.seed()
+        except Exception as exc:
+            logger.warning("Önbellek değişiklik sorgusu başlatılamadı: %s", exc)
+        while not self._stop.wait(self._interval):
+            try:
+                self.poll_once(callback)
+            except Exception as exc:
+                logger.warning("Önbellek değişiklik sorgusu başarısız: %s", exc)
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """PostgREST timestamptz değerini karşılaştırılabilir datetime'a çevirir."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class RealtimeChangeSource:
+    """Supabase Realtime postgres_changes aboneliği (ayrı thread'de asyncio)."""
+
+    def __init__(self, url: str, key: str, tables: tuple[str, ...] = WATCHED_TABLES):
+        self._url = url
+        self._key = key
+        self._tables = tables
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopped: asyncio.Event | None = None
+
+    def start(self, callback: Callable[[dict], None]) -> None:
+        threading.Thread(
+            target=lambda: asyncio.run(self._run(callback)), daemon=True, name="panel-cache-realtime"
+        ).start()
+
+    def stop(self) -> None:
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    async def _run(self, callback: Callable[[dict], None]) -> None:
+        from realtime import AsyncRealtimeClient
+
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        client = AsyncRealtimeClient(f"{self._url.rstrip('/')}/realtime/v1", token=self._key)
+        try:
+            await client.connect()
+            channel = client.channel("panel-cache-invalidation")
+            for table in self._tables:
+                channel.on_postgres_changes("*", schema="public", table=table, callback=callback)
+            await channel.subscribe()
+            await self._stopped.wait()
+        except Exception as exc:
+            logger.warning("Realtime önbellek aboneliği kurulamadı: %s", exc)
+        finally:
+            await client.close()
+
+
+class InvalidationListener:
+    """Bir değişiklik kaynağını dinler ve önbelleği geçersiz kılar."""
+
+    def __init__(self, source, apply: Callable[[ChangeEvent], None] = apply_change):
+        self.source = source
+        self._apply = apply
+        self.events_seen = 0
+
+    def start(self) -> None:
+        self.source.start(self.handle_payload)
+
+    def stop(self) -> None:
+        self.source.stop()
+
+    def handle_payload(self, payload: dict) -> None:
+        event = change_from_payload(payload)
+        if event.table not in WATCHED_TABLES:
+            return
+        self.events_seen += 1
+        self._apply(event)
+
+
+_listener: InvalidationListener | None = None
+_listener_pid: int | None = None
+
+
+def start_from_settings() -> InvalidationListener | None:
+    """PANEL_CACHE_INVALIDATION ayarına göre dinleyiciyi süreç başına bir kez başlatır.
+
+    Fork edilen worker'da ebeveynin dinleyici thread'i yoktur; bu yüzden
+    gunicorn `post_fork` kancasından tekrar çağrıldığında yeni bir dinleyici kurulur.
+    """
+    global _listener, _listener_pid
+    if _listener is not None and _listener_pid == os.getpid():
+        return _listener
+
+    mode = getattr(settings, "PANEL_CACHE_INVALIDATION", "off")
+    if mode == "realtime":
+        source = RealtimeChangeSource(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
+    elif mode == "polling":
+        from .supabase_client import get_supabase_client
+
+        source = PollingChangeSource(get_supabase_client, interval=settings.PANEL_CACHE_POLL_INTERVAL)
+    elif mode == "local":
+        source = LocalChangeSource()
+    else:
+        return None
+
+    _listener = InvalidationListener(source)
+    _listener_pid = os.getpid()
+    _listener.start()
+    return _listener
@@ -0,0 +1,390 @@
+"""Supabase çağrıları için tablo bazlı devre kesici (circuit breaker).
+
+Supabase yavaşladığında ya da hata verdiğinde her sayfa aynı tablolara
+yeniden gider ve thread'ler zaman aşımlarını bekleyerek birikir.
+CircuitBreakerClient, Supabase client'ının önüne geçer ve her tablonun son
+`PANEL_BREAKER_WINDOW` saniyedeki çağrılarını izler:
+
+- closed: çağrılar iletilir. Pencerede en az `PANEL_BREAKER_MIN_CALLS` çağrı
+  varken hatalı ve yavaş (`PANEL_BREAKER_SLOW_CALL` saniyeden uzun) çağrıların
+  oranı `PANEL_BREAKER_ERROR_RATE`'e ulaşırsa devre açılır.
+- open: `PANEL_BREAKER_OPEN_SECONDS` boyunca tabloya çağrı gönderilmez.
+  `PANEL_BREAKER_FALLBACK_TABLES` okumaları aynı sorgunun son başarılı
+  yanıtıyla karşılanır; diğer çağrılar (yazmalar dahil) hemen `CircuitOpen`
+  ile biter.
+- half_open: süre dolunca tek bir deneme çağrısı iletilir; başarılıysa devre
+  kapanır, hatalıysa yeniden açılır. Deneme sürerken diğer çağrılar open
+  durumundaki gibi karşılanır.
+
+Hata sayılanlar: zaman aşımları (`DeadlineExceeded`), bağlantı hataları ve
+5xx / PostgREST bağlantı hataları. 4xx yanıtları (geçersiz sorgu, kısıt
+ihlali) backend'in yanıt verdiğini gösterir ve başarılı sayılır. Süresi
+zaten dolmuş bir isteğin çağrısı gönderilmediği için devreye yazılmaz; yalnızca
+gönderilen çağrıların zaman aşımları sayılır. Devre kapalıyken hata veren bir
+yedekli okuma da son başarılı yanıta düşer. Yedek yanıtlar kopyalanarak
+saklanır ve döndürülür; çağıranlar birbirinin verisini değiştiremez.
+
+View'lar `BACKEND_UNAVAILABLE` ile deadline ve devre hatalarını birlikte
+yakalar. Sayaçlar: `supabase_client.get_circuit_breaker_metrics()`.
+"""
+
+from __future__ import annotations
+
+import copy
+import inspect
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from typing import Any, Callable, Hashable
+
+from django.conf import settings
+
+from . import deadline
+from .coalescing import is_read_query
+from .deadline import DeadlineExceeded
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(ConnectionError):
+    """Tablonun devresi açık; çağrı Supabase'e gönderilmedi."""
+
+    def __init__(self, table: str):
+        super().__init__(f"Veritabanı geçici olarak yanıt vermiyor ({table}); lütfen biraz sonra tekrar deneyin.")
+        self.table = table
+
+
+# Backend'e ulaşılamadığında view'ların yakaladığı hatalar
+BACKEND_UNAVAILABLE = (DeadlineExceeded, CircuitOpen)
+
+
+def is_backend_failure(exc: BaseException) -> bool:
+    """Hatanın Supabase'in sağlıksız olduğunu gösterip göstermediği."""
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    import httpx
+    from postgrest.exceptions import APIError
+
+    if isinstance(exc, httpx.TransportError):
+        return True
+    if isinstance(exc, APIError):
+        # JSON olmayan hata gövdelerinde code HTTP durum kodudur; PGRST0xx bağlantı hatalarıdır
+        code = str(exc.code or "")
+        return code.startswith("5") or code.startswith("PGRST0")
+    return False
+
+
+def _not_sent(exc: BaseException) -> bool:
+    """Süre, çağrı transport'a ulaşmadan dolduysa (httpx kaynağı olmayan DeadlineExceeded)."""
+    return isinstance(exc, DeadlineExceeded) and exc.__cause__ is None
+
+
+class _Circuit:
+    __slots__ = ("state", "opened_at", "probing", "outcomes")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+        # (zaman, hatalı_mı, yavaş_mı)
+        self.outcomes: deque[tuple[float, bool, bool]] = deque()
+
+
+class CircuitBreaker:
+    """Tablo başına devre durumu ve sayaçları (thread-safe)."""
+
+    def __init__(
+        self,
+        *,
+        window: float,
+        min_calls: int,
+        error_rate: float,
+        slow_call: float,
+        open_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call = slow_call
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._circuits: dict[str, _Circuit] = {}
+        self._counters: dict[str, Counter[str]] = {}
+
+    @classmethod
+    def from_settings(cls) -> CircuitBreaker:
+        return cls(
+            window=settings.PANEL_BREAKER_WINDOW,
+            min_calls=settings.PANEL_BREAKER_MIN_CALLS,
+            error_rate=settings.PANEL_BREAKER_ERROR_RATE,
+            slow_call=settings.PANEL_BREAKER_SLOW_CALL,
+            open_seconds=settings.PANEL_BREAKER_OPEN_SECONDS,
+        )
+
+    def _circuit(self, table: str) -> _Circuit:
+        circuit = self._circuits.get(table)
+        if circuit is None:
+            circuit = self._circuits[table] = _Circuit()
+            self._counters[table] = Counter()
+        return circuit
+
+    def _open(self, table: str, circuit: _Circuit, now: float) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = now
+        circuit.probing = False
+        circuit.outcomes.clear()
+        self._counters[table]["opened"] += 1
+
+    def allow(self, table: str) -> bool:
+        """Çağrı gönderilebilir mi; half_open'da yalnızca ilk çağıran deneme hakkı alır."""
+        with self._lock:
+            circuit = self._circuit(table)
+            if circuit.state == OPEN and self._clock() - circuit.opened_at >= self.open_seconds:
+                circuit.state = HALF_OPEN
+            if circuit.state == CLOSED or (circuit.state == HALF_OPEN and not circuit.probing):
+                circuit.probing = circuit.state == HALF_OPEN
+                self._counters[table]["calls"] += 1
+                return True
+            self._counters[table]["rejected"] += 1
+            return False
+
+    def record(self, table: str, elapsed: float, failed: bool) -> None:
+        """İzin verilen bir çağrının sonucunu kaydeder."""
+        slow = elapsed >= self.slow_call
+        with self._lock:
+            circuit = self._circuit(table)
+            counters = self._counters[table]
+            counters["failures"] += failed
+            counters["slow"] += slow
+            now = self._clock()
+            if circuit.state == HALF_OPEN:
+                if failed or slow:
+                    self._open(table, circuit, now)
+                else:
+                    circuit.state = CLOSED
+                    circuit.probing = False
+                return
+            if circuit.state != CLOSED:
+                return
+            outcomes = circuit.outcomes
+            outcomes.append((now, failed, slow))
+            while outcomes and now - outcomes[0][0] > self.window:
+                outcomes.popleft()
+            if len(outcomes) >= self.min_calls:
+                bad = sum(1 for _, failed_, slow_ in outcomes if failed_ or slow_)
+                if bad / len(outcomes) >= self.error_rate:
+                    self._open(table, circuit, now)
+
+    def release(self, table: str) -> None:
+        """Sonucu bilinmeyen (iptal edilen) ya da hiç gönderilmeyen çağrının deneme hakkını bırakır."""
+        with self._lock:
+            self._circuit(table).probing = False
+
+    def record_fallback(self, table: str) -> None:
+        with self._lock:
+            self._circuit(table)
+            self._counters[table]["fallbacks"] += 1
+
+    def state(self, table: str) -> str:
+        with self._lock:
+            circuit = self._circuits.get(table)
+            return circuit.state if circuit is not None else CLOSED
+
+    def metrics(self) -> dict:
+        """Tablo başına durum ve sayaçlar; `open` açık (veya deneme bekleyen) tablolar."""
+        with self._lock:
+            by_table = {
+                table: {
+                    "state": circuit.state,
+                    **{
+                        name: self._counters[table][name]
+                        for name in ("calls", "failures", "slow", "rejected", "opened", "fallbacks")
+                    },
+                }
+                for table, circuit in sorted(self._circuits.items())
+            }
+        return {
+            "open": [table for table, values in by_table.items() if values["state"] != CLOSED],
+            "by_table": by_table,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._circuits.clear()
+            self._counters.clear()
+
+
+class LastKnownGood:
+    """Sorgu anahtarı -> son başarılı yanıtın kopyası (en fazla `max_entries`, LRU)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_breaker: CircuitBreaker | None = None
+_last_good: LastKnownGood | None = None
+
+
+def get_breaker() -> CircuitBreaker:
+    """Süreç genelindeki devre kesici (senkron ve asenkron client ortak kullanır)."""
+    global _breaker
+    if _breaker is None:
+        _breaker = CircuitBreaker.from_settings()
+    return _breaker
+
+
+def _get_last_good() -> LastKnownGood:
+    global _last_good
+    if _last_good is None:
+        _last_good = LastKnownGood(settings.PANEL_BREAKER_FALLBACK_ENTRIES)
+    return _last_good
+
+
+class _BreakerQuery:
+    """Postgrest sorgu zincirini kaydeden ve execute() çağrısını devreden geçiren sarmalayıcı."""
+
+    __slots__ = ("_client", "_table", "_builder", "_calls")
+
+    def __init__(self, client: CircuitBreakerClient, table: str, builder: Any, calls: tuple = ()):
+        self._client = client
+        self._table = table
+        self._builder = builder
+        self._calls = calls
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._builder, name)
+        if not callable(attribute):
+            return _BreakerQuery(self._client, self._table, attribute, self._calls + ((name,),))
+
+        def call(*args, **kwargs):
+            step = (name, repr(args), repr(sorted(kwargs.items())))
+            return _BreakerQuery(self._client, self._table, attribute(*args, **kwargs), self._calls + (step,))
+
+        return call
+
+    def execute(self) -> Any:
+        # Asenkron PostgREST builder'larında execute() await edilir
+        if inspect.iscoroutinefunction(self._builder.execute):
+            return self._client._aexecute(self._table, self._calls, self._builder)
+        return self._client._execute(self._table, self._calls, self._builder)
+
+
+class CircuitBreakerClient:
+    """Supabase (veya asenkron PostgREST) client'ını saran, `table()` ve `rpc()` çağrılarını devreden geçiren vekil."""
+
+    def __init__(
+        self,
+        client: Any,
+        breaker: CircuitBreaker | None = None,
+        last_good: LastKnownGood | None = None,
+        fallback_tables: frozenset[str] | None = None,
+    ):
+        self._client = client
+        self.breaker = breaker or get_breaker()
+        self.last_good = last_good or _get_last_good()
+        self.fallback_tables = (
+            frozenset(settings.PANEL_BREAKER_FALLBACK_TABLES) if fallback_tables is None else fallback_tables
+        )
+
+    def table(self, name: str) -> _BreakerQuery:
+        return _BreakerQuery(self, name, self._client.table(name))
+
+    from_ = table
+
+    def rpc(self, fn: str, *args, **kwargs) -> _BreakerQuery:
+        return _BreakerQuery(self, f"rpc:{fn}", self._client.rpc(fn, *args, **kwargs))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def _fallback_key(self, table: str, calls: tuple) -> tuple | None:
+        if table in self.fallback_tables and is_read_query(calls):
+            return (table, calls)
+        return None
+
+    def _reject(self, table: str, key: tuple | None) -> Any:
+        cached = self.last_good.get(key) if key is not None else None
+        if cached is None:
+            raise CircuitOpen(table)
+        self.breaker.record_fallback(table)
+        return cached
+
+    def _failed(self, table: str, key: tuple | None, exc: Exception, elapsed: float) -> Any:
+        failed = is_backend_failure(exc)
+        self.breaker.record(table, elapsed, failed=failed)
+        cached = self.last_good.get(key) if failed and key is not None else None
+        if cached is None:
+            raise exc
+        self.breaker.record_fallback(table)
+        return cached
+
+    def _succeeded(self, table: str, key: tuple | None, result: Any, elapsed: float) -> Any:
+        self.breaker.record(table, elapsed, failed=False)
+        if key is not None:
+            self.last_good.put(key, result)
+        return result
+
+    def _execute(self, table: str, calls: tuple, builder: Any) -> Any:
+        key = self._fallback_key(table, calls)
+        # Süresi dolmuş istek backend'e gitmez; devreye yazılmaz, deneme hakkı alınmaz
+        deadline.check()
+        if not self.breaker.allow(table):
+            return self._reject(table, key)
+        started = time.monotonic()
+        try:
+            result = builder.execute()
+        except Exception as exc:
+            if _not_sent(exc):
+                self.breaker.release(table)
+                raise
+            return self._failed(table, key, exc, time.monotonic() - started)
+        except BaseException:
+            self.breaker.release(table)
+            raise
+        return self._succeeded(table, key, result, time.monotonic() - started)
+
+    async def _aexecute(self, table: str, calls: tuple, builder: Any) -> Any:
+        key = self._fallback_key(table, calls)
+        # Süresi dolmuş istek backend'e gitmez; devreye yazılmaz, deneme hakkı alınmaz
+        deadline.check()
+        if not self.breaker.allow(table):
+            return self._reject(table, key)
+        started = time.monotonic()
+        try:
+            result = await builder.execute()
+        except Exception as exc:
+            if _not_sent(exc):
+                self.breaker.release(table)
+                raise
+            return self._failed(table, key, exc, time.monotonic() - started)
+        except BaseException:
+            # asyncio.CancelledError: sonuç bilinmiyor, devre değişmez
+            self.breaker.release(table)
+            raise
+        return self._succeeded(table, key, result, time.monotonic() - started)
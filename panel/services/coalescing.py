@@ -0,0 +1,137 @@
+"""Eşzamanlı aynı Supabase okumalarını birleştiren (single-flight) katman.
+
+Sabah birden fazla personel dashboard'u aynı anda açtığında her worker thread
+aynı hastane için aynı `appointments`, `doctors` ve `user_profiles`
+sorgularını gönderir. CoalescingClient, Supabase client'ının önüne geçer ve
+süreç içinde aynı anda çalışan birebir aynı okuma sorgularını tek bir HTTP
+çağrısında birleştirir; lider yanıtı kendisi alır, bekleyen çağrılar ise
+yanıtın derin kopyasını alır.
+
+Sadece `select` ile başlayan sorgular birleştirilir; insert/update/upsert/
+delete, rpc, auth ve storage çağrıları olduğu gibi iletilir. Kopyalama,
+bir isteğin satırları yerinde değiştirmesinin diğer isteklere sızmasını
+önler.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Hashable
+
+from . import deadline
+from .deadline import DeadlineExceeded
+
+_WRITE_METHODS = frozenset({"insert", "update", "upsert", "delete"})
+
+
+def is_read_query(calls: tuple) -> bool:
+    """Kaydedilen sorgu zinciri `select` ile başlayan bir okuma mı."""
+    return bool(calls) and calls[0][0] == "select" and not any(step[0] in _WRITE_METHODS for step in calls)
+
+
+class SingleFlight:
+    """Aynı anahtar için aynı anda tek bir çağrı çalıştırır ve sayaç tutar."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: dict[Hashable, Future] = {}
+        self._executed: Counter[str] = Counter()
+        self._coalesced: Counter[str] = Counter()
+
+    def do(self, key: Hashable, fn: Callable[[], Any], label: str = "") -> Any:
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self._executed[label] += 1
+            else:
+                self._coalesced[label] += 1
+
+        if leader:
+            try:
+                future.set_result(fn())
+            except BaseException as exc:
+                future.set_exception(exc)
+            finally:
+                with self._lock:
+                    del self._inflight[key]
+            return future.result()
+        # Lider başka bir isteğe (veya deadline'sız bir arka plan işine) ait olabilir
+        try:
+            # Satırlar yerinde değiştirilebilir; her bekleyen kendi kopyasını alır
+            return copy.deepcopy(future.result(timeout=deadline.check()))
+        except DeadlineExceeded:
+            raise
+        except FutureTimeoutError:
+            raise DeadlineExceeded("Birleştirilen okuma isteğin süresi içinde tamamlanmadı") from None
+
+    def metrics(self) -> dict:
+        """Çalıştırılan ve birleştirilerek tasarruf edilen çağrı sayıları."""
+        with self._lock:
+            executed = sum(self._executed.values())
+            coalesced = sum(self._coalesced.values())
+            labels = sorted(set(self._executed) | set(self._coalesced))
+            return {
+                "executed": executed,
+                "coalesced": coalesced,
+                "saved_ratio": round(coalesced / (executed + coalesced), 3) if executed + coalesced else 0.0,
+                "by_table": {
+                    label: {"executed": self._executed[label], "coalesced": self._coalesced[label]}
+                    for label in labels
+                },
+            }
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self._executed.clear()
+            self._coalesced.clear()
+
+
+class _CoalescingQuery:
+    """Postgrest sorgu zincirini kaydeden ve execute() çağrısını birleştiren sarmalayıcı."""
+
+    __slots__ = ("_flight", "_table", "_builder", "_calls")
+
+    def __init__(self, flight: SingleFlight, table: str, builder: Any, calls: tuple = ()):
+        self._flight = flight
+        self._table = table
+        self._builder = builder
+        self._calls = calls
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._builder, name)
+        if not callable(attribute):
+            # `not_` gibi property'ler de zincirin parçasıdır
+            return _CoalescingQuery(self._flight, self._table, attribute, self._calls + ((name,),))
+
+        def call(*args, **kwargs):
+            step = (name, repr(args), repr(sorted(kwargs.items())))
+            return _CoalescingQuery(self._flight, self._table, attribute(*args, **kwargs), self._calls + (step,))
+
+        return call
+
+    def execute(self) -> Any:
+        if not is_read_query(self._calls):
+            return self._builder.execute()
+        return self._flight.do((self._table, self._calls), self._builder.execute, label=self._table)
+
+
+class CoalescingClient:
+    """Supabase Client'ı saran ve `table()` okumalarını birleştiren vekil."""
+
+    def __init__(self, client: Any, flight: SingleFlight | None = None):
+        self._client = client
+        self.flight = flight or SingleFlight()
+
+    def table(self, name: str) -> _CoalescingQuery:
+        return _CoalescingQuery(self.flight, name, self._client.table(name))
+
+    from_ = table
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
@@ -0,0 +1,67 @@
+"""İyimser eşzamanlılık (optimistic concurrency) yardımcıları.
+
+Güncellemeler `updated_at` kolonu ön koşuluyla yapılır; kayıt okunduktan sonra
+başka bir kullanıcı tarafından değiştirildiyse yazma reddedilir ve
+ConcurrentUpdateError fırlatılır.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+CONFLICT_MESSAGE = (
+    "Kayıt siz düzenlerken başka bir kullanıcı tarafından güncellendi. "
+    "Lütfen sayfayı yenileyip tekrar deneyin."
+)
+
+
+class ConcurrentUpdateError(ValueError):
+    """Kayıt, okunduğu versiyondan farklı olduğu için güncellenemedi."""
+
+    def __init__(self, message: str = CONFLICT_MESSAGE):
+        super().__init__(message)
+
+
+def ensure_version(record: dict, submitted_version: str | None) -> None:
+    """Formla gelen versiyon damgası güncel kayıttan farklıysa hata fırlatır.
+
+    Versiyon gönderilmemişse (eski formlar) kontrol atlanır.
+    """
+    if submitted_version and submitted_version != (record.get("updatedAt") or ""):
+        raise ConcurrentUpdateError()
+
+
+def retry_on_conflict(
+    record: T,
+    mutate: Callable[[T], None],
+    save: Callable[[T], None],
+    reload: Callable[[], T],
+    attempts: int = 3,
+) -> T:
+    """Değişikliği uygular ve kaydeder; çakışmada güncel kayda tekrar uygular.
+
+    Sadece "delta" niteliğindeki değişiklikler için kullanılmalıdır (galeriye
+    görsel ekleme gibi). Böylece eşzamanlı düzenlemeler alan bazında birleşir.
+
+    Args:
+        record: Başlangıç kaydı
+        mutate: Kaydı yerinde değiştiren fonksiyon
+        save: Kaydı ön koşullu olarak yazan fonksiyon
+        reload: Güncel kaydı Supabase'den tekrar okuyan fonksiyon
+        attempts: Toplam deneme sayısı
+
+    Returns:
+        Başarıyla kaydedilen (gerekirse yeniden okunmuş) kayıt
+    """
+    for attempt in range(1, attempts + 1):
+        mutate(record)
+        try:
+            save(record)
+            return record
+        except ConcurrentUpdateError:
+            if attempt == attempts:
+                raise
+            record = reload()
+    return record
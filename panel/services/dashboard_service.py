@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 from collections import Counter
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import Any
+from functools import cached_property
+from typing import Any, Callable
 
+from django.conf import settings
+
+from ..dateparse import parse_date
+from . import data_version
+from .async_client import arows, get_async_client
+from .cache_invalidation import WATCHED_TABLES
+from .circuit_breaker import LastKnownGood
 from .supabase_client import get_supabase_client
-from .hospital_service import _get_active_hospital_id, _format_hospital_from_db
+from .swr_cache import panel_cache
+from .hospital_service import _get_active_hospital_id, _format_hospital_from_db, aget_hospital_by_id
 from .appointment_service import get_appointments, _format_appointment_from_db
 from .doctor_service import get_doctors, _format_doctor_from_db
-from .service_service import get_services
+from .service_service import aget_services, get_services
 from .review_service import _load_reviews, _load_ratings
-from .user_service import get_user_map
+from .user_service import aget_user_map, get_user_map
 
 
 @dataclass
@@ -23,117 +33,429 @@ class KPI:
     color: str
 
 
-def _parse_date(value: str) -> date | None:
-    try:
-        return datetime.strptime(value, "%Y-%m-%d").date()
-    except ValueError:
-        return None
+@dataclass
+class AppointmentAggregate:
+    upcoming_count: int = 0
+    today_count: int = 0
+    service_counts: Counter = field(default_factory=Counter)
+    todays: list = field(default_factory=list)
+
+
+@dataclass
+class RatingAggregate:
+    hospital_total: float = 0
+    hospital_count: int = 0
+    # doctor_id -> [toplam, adet]
+    doctor_totals: dict = field(default_factory=dict)
+
+    @property
+    def hospital_average(self) -> float:
+        return self.hospital_total / self.hospital_count if self.hospital_count else 0
 
 
 def _today() -> date:
     return datetime.now().date()
 
 
-def load_dashboard_context(request=None) -> dict[str, Any]:
-    """Dashboard için gerekli tüm verileri Supabase'den getirir."""
-    supabase = get_supabase_client()
+# Hastane tablolarından okunan kaynaklar ve satır dönüştürücüleri
+_SOURCE_TABLES = {
+    'doctors': 'doctors',
+    'appointments': 'appointments',
+    'todays': 'appointments',
+    'ratings': 'ratings',
+    'reviews': 'reviews',
+    'holidays': 'holidays',
+}
+_SOURCE_FORMATTERS = {
+    'doctors': _format_doctor_from_db,
+    'appointments': _format_appointment_from_db,
+    'todays': _format_appointment_from_db,
+}
+
+
+class DashboardSources:
+    """Widget'ların kullandığı veriler; her kaynak ilk erişimde bir kez yüklenir.
+
+    Tek bir widget istendiğinde yalnızca onun ihtiyaç duyduğu tablolar
+    sorgulanır. Önceden yüklenmiş veriler anahtar kelime argümanı olarak
+    verilebilir (cached_property aynı adlı örnek özniteliğini kullanır);
+    `aload` kaynakları asenkron client ile aynı anda bu şekilde yükler.
+    """
+
+    def __init__(self, hospital_id: str | None, today: date, **preloaded):
+        self.hospital_id = hospital_id
+        self.today = today
+        self.__dict__.update(preloaded)
+
+    def _query(self, client, name: str):
+        query = client.table(_SOURCE_TABLES[name]).select("*").eq("hospital_id", self.hospital_id)
+        if name == 'todays':
+            # Sadece bugünün randevuları sorgulanır
+            return query.eq("date", self.today.isoformat())
+        if name == 'holidays':
+            return query.gte("date", self.today.isoformat())
+        return query
+
+    def _format(self, name: str, rows: list) -> list:
+        formatter = _SOURCE_FORMATTERS.get(name)
+        return [formatter(row) for row in rows] if formatter else rows
+
+    def _load(self, name: str) -> list:
+        return self._format(name, self._query(get_supabase_client(), name).execute().data or [])
+
+    async def _aload(self, name: str):
+        if name == 'services':
+            return await aget_services()
+        if name == 'users':
+            return await aget_user_map()
+        return self._format(name, await arows(self._query(get_async_client(), name)))
+
+    @classmethod
+    async def aload(cls, hospital_id: str | None, today: date, names) -> DashboardSources:
+        """Verilen kaynakları asenkron client ile aynı anda yükler."""
+        names = set(names)
+        if 'appointments' in names:
+            # Bugünün randevuları tüm randevulardan ayrılır
+            names.discard('todays')
+        sources = cls(hospital_id, today)
+        names = sorted(names)
+        values = await asyncio.gather(*(sources._aload(name) for name in names))
+        sources.__dict__.update(zip(names, values))
+        return sources
+
+    @cached_property
+    def doctors(self) -> list:
+        return self._load('doctors')
+
+    @cached_property
+    def appointments(self) -> list:
+        return self._load('appointments')
+
+    @cached_property
+    def todays(self) -> list:
+        if "appointments" in self.__dict__:
+            return self.appointment_stats.todays
+        return self._load('todays')
+
+    @cached_property
+    def services(self) -> list:
+        return get_services()
+
+    @cached_property
+    def ratings(self) -> list:
+        return self._load('ratings')
+
+    @cached_property
+    def reviews(self) -> list:
+        return self._load('reviews')
+
+    @cached_property
+    def users(self) -> dict:
+        return get_user_map()
+
+    @cached_property
+    def holidays(self) -> list:
+        return self._load('holidays')
+
+    @cached_property
+    def appointment_stats(self) -> AppointmentAggregate:
+        return aggregate_appointments(self.appointments, self.today)
+
+    @cached_property
+    def rating_stats(self) -> RatingAggregate:
+        return aggregate_ratings(self.ratings)
+
+
+def _widget_kpis(sources: DashboardSources) -> dict[str, Any]:
+    appointment_stats = sources.appointment_stats
+    return {'kpi_cards': [
+        KPI("Yaklaşan Randevu", str(appointment_stats.upcoming_count), "Planlanmış randevular", "schedule", "#BFDBFE"),
+        KPI("Bugünkü Randevu", str(appointment_stats.today_count), "Günün toplam randevusu", "today", "#A5F3FC"),
+        KPI("Aktif Doktor", str(len(sources.doctors)), "Paneldeki toplam doktor", "medical_services", "#C7D2FE"),
+        KPI("Ortalama Puan", f"{sources.rating_stats.hospital_average:.1f}", "Hastane ortalaması", "star", "#FBCFE8"),
+    ]}
+
+
+def _widget_todays_appointments(sources: DashboardSources) -> dict[str, Any]:
+    doctor_map = {d['id']: d for d in sources.doctors}
+    service_map = {str(s['id']): s for s in sources.services}
+    users = sources.users
+    return {'todays_appointments': [
+        _build_appointment_card(apt, doctor_map, service_map, users)
+        for apt in sorted(sources.todays, key=lambda a: a['time'])[:6]
+    ]}
+
+
+def _widget_doctor_status(sources: DashboardSources) -> dict[str, Any]:
+    return {'doctor_status': [_build_doctor_status(doc, sources.today) for doc in sources.doctors]}
+
+
+def _widget_service_stats(sources: DashboardSources) -> dict[str, Any]:
+    return {'service_stats': _build_service_stats(sources.appointment_stats.service_counts, sources.services)}
+
+
+def _widget_doctor_ratings(sources: DashboardSources) -> dict[str, Any]:
+    return {'doctor_ratings': _build_doctor_ratings(sources.doctors, sources.rating_stats.doctor_totals)}
+
+
+def _widget_latest_reviews(sources: DashboardSources) -> dict[str, Any]:
+    return {'latest_reviews': _build_reviews(sources.reviews, sources.users)}
+
+
+def _widget_upcoming_holidays(sources: DashboardSources) -> dict[str, Any]:
+    return {'upcoming_holidays': _build_upcoming_holidays(sources.holidays, sources.today)}
+
+
+# Widget adı -> context parçası. Adlar URL'de ve şablon adlarında kullanılır
+# (panel/includes/dashboard/<ad>.html).
+WIDGETS: dict[str, Callable[[DashboardSources], dict[str, Any]]] = {
+    'kpis': _widget_kpis,
+    'todays_appointments': _widget_todays_appointments,
+    'doctor_status': _widget_doctor_status,
+    'service_stats': _widget_service_stats,
+    'doctor_ratings': _widget_doctor_ratings,
+    'latest_reviews': _widget_latest_reviews,
+    'upcoming_holidays': _widget_upcoming_holidays,
+}
+
+
+# Widget adı -> kullandığı kaynaklar. Asenkron yolda bu kaynaklar önceden ve
+# aynı anda yüklenir; listede olmayan bir kaynağa erişim senkron sorguya düşer.
+WIDGET_SOURCES: dict[str, tuple[str, ...]] = {
+    'kpis': ('appointments', 'doctors', 'ratings'),
+    'todays_appointments': ('todays', 'doctors', 'services', 'users'),
+    'doctor_status': ('doctors',),
+    'service_stats': ('appointments', 'services'),
+    'doctor_ratings': ('doctors', 'ratings'),
+    'latest_reviews': ('reviews', 'users'),
+    'upcoming_holidays': ('holidays',),
+}
+
+
+# Parça önbelleğinde (`{% cache %}`) saklanan widget'lar ve HTML'lerinin
+# bağlı olduğu tablolar. Bu tablolara yazma yapıldığında sürüm değişir ve
+# parça yeniden render edilir.
+FRAGMENT_SCOPES: dict[str, tuple[str, ...]] = {
+    'service_stats': ('appointments', 'services'),
+    'doctor_ratings': ('doctors', 'ratings'),
+    'upcoming_holidays': ('holidays',),
+}
+
+# Panel dışından (hasta uygulaması) yazılan tablolar: panel bu yazmalarda
+# sürümü yenilemez. Bu tablolara bağlı parçalar, değişiklik bildirimi tabloyu
+# izlemiyorsa yalnızca kısa süre (PANEL_FRAGMENT_EXTERNAL_TTL) saklanır.
+EXTERNAL_SCOPES = frozenset({'appointments', 'ratings'})
+
+# Dashboard context'inde hesaplanan widget'lar; parça widget'ları ayrıca ve
+# yalnızca parçaları önbellekte yoksa yüklenir
+DASHBOARD_WIDGETS = tuple(name for name in WIDGETS if name not in FRAGMENT_SCOPES)
+
+
+def _fragment_ttl(name: str) -> int:
+    """Parçanın önbellek süresi.
+
+    Dış yazmaları bildirimle izlenmeyen parçalar ve sürümler süreç içiyken
+    (diğer worker'ların yazmaları görünmez) tüm parçalar için kısadır.
+    """
+    external = set(FRAGMENT_SCOPES[name]) & EXTERNAL_SCOPES
+    watched = settings.PANEL_CACHE_INVALIDATION != 'off' and external <= set(WATCHED_TABLES)
+    if external and not watched:
+        return min(settings.PANEL_FRAGMENT_EXTERNAL_TTL, settings.PANEL_FRAGMENT_CACHE_TTL)
+    return data_version.bounded_ttl(settings.PANEL_FRAGMENT_CACHE_TTL)
+
+
+def get_fragment_context(request=None, names=None) -> dict[str, Any]:
+    """Widget parçalarının önbellek anahtarı ve süresi için gereken context'i döndürür.
+
+    `fragment_versions[name]` hastane kimliği ile widget tablolarının veri
+    sürümünü içerir; böylece anahtar hem kiracıya hem veriye bağlıdır.
+    Bugünün tarihi de eklenir: yaklaşan tatiller gün değişince yeniden hesaplanır.
+    `fragment_ttls[name]` parçanın önbellekte kalacağı süredir.
+    """
     hospital_id = _get_active_hospital_id(request)
-    
+    today = _today().isoformat()
+    names = names or tuple(FRAGMENT_SCOPES)
+    return {
+        'fragment_ttls': {name: _fragment_ttl(name) for name in names},
+        'fragment_versions': {
+            name: f"{hospital_id}:{today}:{data_version.get_version(hospital_id, *FRAGMENT_SCOPES[name])}"
+            for name in names
+        },
+    }
+
+
+def load_dashboard_context(hospital_id: str) -> dict[str, Any]:
+    """Dashboard'un parça önbelleği dışındaki widget'larını Supabase'den hesaplar.
+
+    Parça widget'ları (FRAGMENT_SCOPES) burada hesaplanmaz; view'lar onları
+    yalnızca parça önbellekte yoksa ayrıca yükler. Yalnızca hastane id'si
+    alır: önbellek yenilemesi istek bittikten sonra arka planda çalışabilir.
+    """
+    supabase = get_supabase_client()
+
     # Hastane bilgisi
     hospital_result = supabase.table("hospitals").select("*").eq("id", hospital_id).single().execute()
     hospital = _format_hospital_from_db(hospital_result.data)
     
-    # Doktorlar
-    doctors_result = supabase.table("doctors").select("*").eq("hospital_id", hospital_id).execute()
-    doctors = [_format_doctor_from_db(d) for d in doctors_result.data] if doctors_result.data else []
-    
-    # Randevular
-    appointments_result = supabase.table("appointments").select("*").eq("hospital_id", hospital_id).execute()
-    appointments = [_format_appointment_from_db(a) for a in appointments_result.data] if appointments_result.data else []
-    
-    # Hizmetler
-    services_result = supabase.table("services").select("*").execute()
-    services = services_result.data if services_result.data else []
-    
-    # Puanlamalar
-    ratings_result = supabase.table("ratings").select("*").eq("hospital_id", hospital_id).execute()
-    ratings = ratings_result.data if ratings_result.data else []
-    
-    # Yorumlar
-    reviews_result = supabase.table("reviews").select("*").eq("hospital_id", hospital_id).execute()
-    reviews = reviews_result.data if reviews_result.data else []
-    
-    # Kullanıcılar
-    users = get_user_map()
-    
-    # Tatiller
-    holidays_result = supabase.table("holidays").select("*").eq("hospital_id", hospital_id).execute()
-    holidays = holidays_result.data if holidays_result.data else []
-    
-    # KPI hesaplamaları
-    today = _today()
-    upcoming_count = 0
+    sources = DashboardSources(hospital_id, _today())
+    context = {}
+    for name in DASHBOARD_WIDGETS:
+        context.update(WIDGETS[name](sources))
+    context['hospital'] = hospital
+    return context
+
+
+async def aload_dashboard_context(hospital_id: str) -> dict[str, Any]:
+    """`load_dashboard_context`'in asenkron karşılığı; tablolar aynı anda okunur."""
+    names = {source for name in DASHBOARD_WIDGETS for source in WIDGET_SOURCES[name]}
+    sources, hospital = await asyncio.gather(
+        DashboardSources.aload(hospital_id, _today(), names),
+        aget_hospital_by_id(hospital_id),
+    )
+    context = {}
+    for name in DASHBOARD_WIDGETS:
+        context.update(WIDGETS[name](sources))
+    context['hospital'] = hospital
+    return context
+
+
+def get_dashboard_context(request=None) -> dict[str, Any]:
+    """load_dashboard_context sonucunu stale-while-revalidate önbellekten döndürür.
+
+    View'lar context'e anahtar eklediği için önbellekteki dict'in kopyası döner.
+    """
+    hospital_id = _get_active_hospital_id(request)
+    context = panel_cache.get(("dashboard", hospital_id), lambda: load_dashboard_context(hospital_id))
+    return dict(context)
+
+
+async def aget_dashboard_context(request=None) -> dict[str, Any]:
+    """`get_dashboard_context`'in asenkron karşılığı (aynı önbellek kaydı)."""
+    hospital_id = _get_active_hospital_id(request)
+    context = await panel_cache.aget(("dashboard", hospital_id), lambda: aload_dashboard_context(hospital_id))
+    return dict(context)
+
+
+# (hastane, widget) -> son başarılı hesaplama; yalnızca backend yanıt vermediğinde
+# kısmi render için okunur (geçersiz kılınmaz, TTL'i yoktur, en fazla
+# PANEL_BREAKER_FALLBACK_ENTRIES kayıt tutulur)
+_last_good_widgets: LastKnownGood | None = None
+
+
+def _widget_fallbacks() -> LastKnownGood:
+    global _last_good_widgets
+    if _last_good_widgets is None:
+        _last_good_widgets = LastKnownGood(settings.PANEL_BREAKER_FALLBACK_ENTRIES)
+    return _last_good_widgets
+
+
+def load_widget(name: str, hospital_id: str) -> dict[str, Any]:
+    """Tek bir widget'ın context parçasını yalnızca gerekli tabloları sorgulayarak hesaplar.
+
+    İstek yerine hastane id'si alır; önbellek yenilemesi arka planda çalışabilir.
+    """
+    context = WIDGETS[name](DashboardSources(hospital_id, _today()))
+    _widget_fallbacks().put((hospital_id, name), context)
+    return context
+
+
+def get_widget(name: str, request=None) -> dict[str, Any]:
+    """Widget'ı kendi stale-while-revalidate önbellek kaydından döndürür.
+
+    Raises:
+        KeyError: Widget adı bilinmiyorsa
+    """
+    if name not in WIDGETS:
+        raise KeyError(name)
+    hospital_id = _get_active_hospital_id(request)
+    return panel_cache.get(("dashboard_widget", hospital_id, name), lambda: load_widget(name, hospital_id))
+
+
+def get_cached_dashboard_context(request=None) -> dict[str, Any] | None:
+    """Dashboard'un önbellekteki son context'i (süresi dolmuş olabilir); yoksa None.
+
+    Backend isteğin süresi içinde yanıt vermediğinde kısmi render için kullanılır.
+    """
+    context = panel_cache.peek(("dashboard", _get_active_hospital_id(request)))
+    return None if context is None else dict(context)
+
+
+def get_cached_widget(name: str, request=None) -> dict[str, Any] | None:
+    """Widget'ın bu süreçte son başarıyla hesaplanan değeri; yoksa None."""
+    return _widget_fallbacks().get((_get_active_hospital_id(request), name))
+
+
+async def aload_widget(name: str, hospital_id: str) -> dict[str, Any]:
+    """`load_widget`'ın asenkron karşılığı; widget'ın kaynakları aynı anda okunur."""
+    sources = await DashboardSources.aload(hospital_id, _today(), WIDGET_SOURCES[name])
+    context = WIDGETS[name](sources)
+    _widget_fallbacks().put((hospital_id, name), context)
+    return context
+
+
+async def aget_widget(name: str, request=None) -> dict[str, Any]:
+    """`get_widget`'ın asenkron karşılığı (aynı önbellek kaydı).
+
+    Raises:
+        KeyError: Widget adı bilinmiyorsa
+    """
+    if name not in WIDGETS:
+        raise KeyError(name)
+    hospital_id = _get_active_hospital_id(request)
+    return await panel_cache.aget(("dashboard_widget", hospital_id, name), lambda: aload_widget(name, hospital_id))
+
+
+def aggregate_appointments(appointments, today: date) -> AppointmentAggregate:
+    """Randevuları tek geçişte toplar."""
+    aggregate = AppointmentAggregate()
     for apt in appointments:
-        if apt.get('status') == 'cancelled':
+        apt_date = parse_date(apt.get('date'))
+
+        aggregate.service_counts[apt['service']] += 1
+        if apt_date is None:
             continue
-        apt_date = _parse_date(apt.get('date', ''))
-        if apt_date and apt_date >= today:
-            upcoming_count += 1
-    today_count = sum(1 for apt in appointments if _parse_date(apt['date']) == today)
-    doctor_count = len(doctors)
-    
-    # Ortalama puan hesapla
-    hospital_ratings = [r.get('hospital_rating', 0) or 0 for r in ratings]
-    avg_rating = sum(hospital_ratings) / len(hospital_ratings) if hospital_ratings else 0
-    
-    kpi_cards = [
-        KPI("Yaklaşan Randevu", str(upcoming_count), "Planlanmış randevular", "schedule", "#BFDBFE"),
-        KPI("Bugünkü Randevu", str(today_count), "Günün toplam randevusu", "today", "#A5F3FC"),
-        KPI("Aktif Doktor", str(doctor_count), "Paneldeki toplam doktor", "medical_services", "#C7D2FE"),
-        KPI("Ortalama Puan", f"{avg_rating:.1f}", "Hastane ortalaması", "star", "#FBCFE8"),
-    ]
-    
-    # Bugünkü randevular
-    upcoming_appointments = sorted(
-        appointments,
-        key=lambda a: (a['date'], a['time'])
+        if apt_date == today:
+            aggregate.today_count += 1
+            aggregate.todays.append(apt)
+        if apt_date >= today and apt.get('status') != 'cancelled':
+            aggregate.upcoming_count += 1
+    return aggregate
+
+
+def aggregate_ratings(ratings) -> RatingAggregate:
+    """Hastane ve doktor puanlarını tek geçişte toplar."""
+    aggregate = RatingAggregate()
+    doctor_totals = aggregate.doctor_totals
+    for rating in ratings:
+        aggregate.hospital_total += rating.get('hospital_rating', 0) or 0
+        aggregate.hospital_count += 1
+        doctor_rating = rating.get('doctor_rating')
+        if doctor_rating:
+            totals = doctor_totals.setdefault(str(rating.get('doctor_id', '')), [0, 0])
+            totals[0] += doctor_rating
+            totals[1] += 1
+    return aggregate
+
+
+def build_dashboard_context(doctors, appointments, services, ratings, reviews, users, holidays, today) -> dict[str, Any]:
+    """Dashboard widget'larını yüklenmiş verilerden hesaplar.
+
+    Doktor ve hizmetler ID'ye göre bir kez map'lenir; randevular ve puanlar
+    birer kez dolaşılır.
+    """
+    sources = DashboardSources(
+        None, today, doctors=doctors, appointments=appointments, services=services,
+        ratings=ratings, reviews=reviews, users=users, holidays=holidays,
     )
-    todays_appointments = [
-        _build_appointment_card(apt, doctors, services, users)
-        for apt in upcoming_appointments
-        if _parse_date(apt['date']) == today
-    ][:6]
-    
-    # Doktor durumları
-    doctor_status = [_build_doctor_status(doc, today) for doc in doctors]
-    
-    # Hizmet istatistikleri
-    service_stats = _build_service_stats(appointments, services)
-    
-    # Son yorumlar
-    latest_reviews = _build_reviews(reviews, users)
-    
-    # Yaklaşan tatiller
-    upcoming_holidays = _build_upcoming_holidays(holidays, today)
-    
-    # Doktor puanlamaları
-    doctor_ratings = _build_doctor_ratings(doctors, ratings)
-    
-    return {
-        'hospital': hospital,
-        'kpi_cards': kpi_cards,
-        'todays_appointments': todays_appointments,
-        'doctor_status': doctor_status,
-        'service_stats': service_stats,
-        'latest_reviews': latest_reviews,
-        'upcoming_holidays': upcoming_holidays,
-        'doctor_ratings': doctor_ratings,
-    }
+    context = {}
+    for build in WIDGETS.values():
+        context.update(build(sources))
+    return context
 
 
-def _build_appointment_card(apt, doctors, services, users):
-    doctor = next((d for d in doctors if d['id'] == apt['doctorId']), None)
-    service = next((s for s in services if str(s['id']) == apt['service']), None)
+def _build_appointment_card(apt, doctor_map, service_map, users):
+    doctor = doctor_map.get(apt['doctorId'])
+    service = service_map.get(apt['service'])
     user = users.get(apt['userId'])
     return {
         'time': apt['time'],
@@ -156,8 +478,7 @@ def _build_doctor_status(doctor, today):
     }
 
 
-def _build_service_stats(appointments, services):
-    counts = Counter(apt['service'] for apt in appointments)
+def _build_service_stats(counts, services):
     total = sum(counts.values()) or 1
     stats = []
     for service in services:
@@ -192,7 +513,7 @@ def _build_upcoming_holidays(holidays, today):
     for holiday in holidays:
         h_date_str = holiday.get('date')
         if h_date_str:
-            h_date = _parse_date(h_date_str)
+            h_date = parse_date(h_date_str)
             if h_date and h_date >= today:
                 parsed.append({
                     'date': h_date.strftime('%d %B %Y'),
@@ -202,28 +523,17 @@ def _build_upcoming_holidays(holidays, today):
     return parsed[:4]
 
 
-def _build_doctor_ratings(doctors, ratings):
+def _build_doctor_ratings(doctors, doctor_totals):
     """
     Her doktor için ortalama puanı hesaplar.
     Sadece aktif hastanenin doktorları için puanları döndürür.
+    doctor_totals: aggregate_ratings ile hesaplanan doctor_id -> [toplam, adet]
     """
     doctor_ratings_list = []
     
     for doctor in doctors:
-        doctor_id = str(doctor['id'])
-        # Bu doktora ait tüm puanları filtrele
-        doctor_ratings_data = [
-            r.get('doctor_rating', 0) or 0 for r in ratings
-            if str(r.get('doctor_id', '')) == doctor_id and r.get('doctor_rating')
-        ]
-        
-        # Ortalama puanı hesapla
-        if doctor_ratings_data:
-            avg_rating = sum(doctor_ratings_data) / len(doctor_ratings_data)
-            rating_count = len(doctor_ratings_data)
-        else:
-            avg_rating = 0.0
-            rating_count = 0
+        total, rating_count = doctor_totals.get(str(doctor['id']), (0, 0))
+        avg_rating = total / rating_count if rating_count else 0.0
         
         doctor_ratings_list.append({
             'id': doctor['id'],
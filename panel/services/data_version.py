@@ -0,0 +1,108 @@
+"""Hastane (kiracı) bazlı veri sürümleri.
+
+Her (hastane, kapsam) çifti için rastgele bir sürüm belirteci tutulur;
+kapsamlar tablo adlarıdır (`hospitals`, `doctors`, `services` ...). Servislerdeki
+yazma işlemleri ve değişiklik bildirimleri (cache_invalidation) ilgili
+belirteci yeniler. Session'daki hastane özeti gibi türetilmiş veriler
+oluşturuldukları sürümü saklar ve sürüm değişene kadar backend'e gitmeden
+kullanılır.
+
+Belirteçler paylaşılan önbellekte (SharedCache) tutulur, böylece bir worker'daki
+yazma diğer worker'larda da görünür. Paylaşılan önbellek kapalıysa sürümler
+süreç içidir; başka bir worker'daki yazma görünmez, bu yüzden sürüme güvenen
+kullanıcılar `is_shared()` ile bunu kontrol edip ek bir üst süre uygular.
+Hastanesi bilinmeyen değişiklikler (ör. global `services` tablosu) tüm
+hastanelerin ilgili kapsamını geçersiz kılar.
+"""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from collections.abc import Mapping
+
+from django.conf import settings
+
+from .shared_cache import get_shared_cache
+
+_GLOBAL = "*"
+
+_local_versions: dict[str, str] = {}
+_local_lock = threading.Lock()
+
+
+def _key(hospital_id: str | None, scope: str) -> str:
+    return f"version:v1:{hospital_id or _GLOBAL}:{scope}"
+
+
+def _new_token() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def is_shared() -> bool:
+    """Sürümler worker'lar arasında paylaşılıyor mu (paylaşılan önbellek açık mı)."""
+    return get_shared_cache() is not None
+
+
+def bounded_ttl(ttl: int) -> int:
+    """Sürümle anahtarlanan önbellek kaydının süresi.
+
+    Sürümler süreç içiyse diğer worker'lardaki yazmalar anahtarı değiştirmez;
+    kayıt en fazla PANEL_FRAGMENT_EXTERNAL_TTL saniye kullanılır.
+    """
+    if is_shared():
+        return ttl
+    return min(ttl, settings.PANEL_FRAGMENT_EXTERNAL_TTL)
+
+
+def _token(key: str) -> str:
+    cache = get_shared_cache()
+    if cache is None:
+        with _local_lock:
+            return _local_versions.setdefault(key, _new_token())
+    token = cache.get(key)
+    if token is None:
+        # Kayıt yok veya tahliye edilmiş; aynı anda üreten worker'lardan yalnızca
+        # ilkinin belirteci yazılır ve herkes onu okur
+        candidate = _new_token()
+        if cache.add(key, candidate):
+            return candidate
+        token = cache.get(key, candidate)
+    return token
+
+
+def get_version(hospital_id: str, *scopes: str) -> str:
+    """Hastanenin verilen kapsamlarının birleşik sürümünü döndürür."""
+    parts = []
+    for scope in scopes:
+        parts.append(_token(_key(hospital_id, scope)))
+        parts.append(_token(_key(None, scope)))
+    return "-".join(parts)
+
+
+def bump(hospital_id: str | None, *scopes: str) -> None:
+    """Kapsamların sürümünü yeniler (hospital_id None ise tüm hastaneler için)."""
+    tokens = {_key(hospital_id, scope): _new_token() for scope in scopes}
+    cache = get_shared_cache()
+    if cache is None:
+        with _local_lock:
+            _local_versions.update(tokens)
+        return
+    cache.set_many(tokens)
+
+
+def bump_rows(rows, *scopes: str) -> None:
+    """Yazma sonucunda dönen satırların hastanelerinde kapsamları yeniler.
+
+    Ham satırlar (`hospital_id`) ve kayıt sınıfları (`hospitalId`) kabul edilir.
+    Hastane bilgisi yoksa (ör. global `services` tablosu veya id ile silinen
+    bir kayıt) kapsamlar tüm hastaneler için yenilenir.
+    """
+    hospital_ids = set()
+    for row in rows or ():
+        if isinstance(row, Mapping):
+            hospital_id = row.get("hospital_id") or row.get("hospitalId")
+            if hospital_id:
+                hospital_ids.add(str(hospital_id))
+    for hospital_id in hospital_ids or {None}:
+        bump(hospital_id, *scopes)
@@ -0,0 +1,106 @@
+"""İstek başına zaman bütçesi (deadline).
+
+`panel.middleware.DeadlineMiddleware` her istek için bir `Deadline` başlatır;
+süre view'a göre belirlenir (bkz. `view_budget`). Deadline bir contextvar'da
+tutulur ve Supabase'e giden her HTTP çağrısı (senkron ve asenkron client,
+Auth ve Storage dahil) bağlantı/okuma zaman aşımlarını kalan süreyle sınırlar
+(`http_transport`). Süre dolduğunda yeni çağrı yapılmaz ve `DeadlineExceeded`
+fırlatılır; view'lar önbellekteki son veriyle kısmi render yapabilir,
+yakalanmayan hata ise middleware'de hızlı bir 503 yanıtına dönüşür.
+
+İstek dışındaki işler (ısıtma, arka plan önbellek yenilemesi, realtime
+dinleyicisi) deadline taşımaz; yalnızca client'ın sabit zaman aşımları geçerlidir.
+
+Per-view süre:
+
+    @with_deadline(3)
+    def dashboard_widget(request, name): ...
+
+    class AppointmentManagementView(View):
+        deadline = 8
+
+`PANEL_VIEW_DEADLINES` (URL adı -> saniye) koddaki değerlerin önüne geçer.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+from django.conf import settings
+
+
+class DeadlineExceeded(TimeoutError):
+    """İsteğin zaman bütçesi doldu ya da backend çağrısı zaman aşımına uğradı."""
+
+
+class Deadline:
+    """Bir isteğin başlangıcı ve bitiş anı (time.monotonic)."""
+
+    __slots__ = ("started", "expires_at")
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.started = clock()
+        self.expires_at = self.started + seconds
+
+    def set_budget(self, seconds: float) -> None:
+        """Bütçeyi isteğin başlangıcından itibaren `seconds` olarak değiştirir."""
+        self.expires_at = self.started + seconds
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+
+_current: ContextVar[Deadline | None] = ContextVar("panel_deadline", default=None)
+
+
+def current() -> Deadline | None:
+    return _current.get()
+
+
+def remaining() -> float | None:
+    """Aktif isteğin kalan süresi (saniye); istek dışında None."""
+    deadline = _current.get()
+    return deadline.remaining() if deadline is not None else None
+
+
+def check() -> float | None:
+    """Kalan süreyi döndürür; süre dolduysa DeadlineExceeded fırlatır."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("İstek için ayrılan süre doldu")
+    return left
+
+
+@contextmanager
+def budget(seconds: float) -> Iterator[Deadline]:
+    """Blok için deadline başlatır (middleware ve testler kullanır)."""
+    deadline = Deadline(seconds)
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def with_deadline(seconds: float):
+    """Fonksiyon tabanlı view'ın zaman bütçesini belirler."""
+
+    def decorator(view_func):
+        view_func.panel_deadline = seconds
+        return view_func
+
+    return decorator
+
+
+def view_budget(view_func, url_name: str | None = None) -> float:
+    """View için zaman bütçesi: ayar, view özniteliği veya varsayılan."""
+    overrides = settings.PANEL_VIEW_DEADLINES
+    if url_name and url_name in overrides:
+        return overrides[url_name]
+    seconds = getattr(view_func, "panel_deadline", None)
+    if seconds is None:
+        seconds = getattr(getattr(view_func, "view_class", None), "deadline", None)
+    return settings.PANEL_REQUEST_DEADLINE if seconds is None else seconds
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
+from . import data_version
+from .async_client import arows, get_async_client
+from .concurrency import ConcurrentUpdateError
+from .records import DoctorRecord
 from .supabase_client import get_supabase_client
-from .hospital_service import _get_active_hospital_id, get_hospital
+from .hospital_service import _get_active_hospital_id, get_request_hospital
 
 
 def get_doctors(request=None) -> list[dict]:
@@ -20,6 +24,13 @@ def get_doctors(request=None) -> list[dict]:
     return [_format_doctor_from_db(d) for d in result.data]
 
 
+async def aget_doctors(request=None) -> list[dict]:
+    """`get_doctors`'ın asenkron karşılığı."""
+    hospital_id = _get_active_hospital_id(request)
+    rows = await arows(get_async_client().table("doctors").select("*").eq("hospital_id", hospital_id))
+    return [_format_doctor_from_db(d) for d in rows]
+
+
 # ID generation artık Supabase tarafından yapılıyor (UUID)
 
 
@@ -155,12 +166,17 @@ def add_doctor(data: dict, image_file=None, request=None) -> dict:
     
     if not result.data:
         raise ValueError("Doktor eklenemedi")
+    data_version.bump(hospital_id, "doctors")
     
     return _format_doctor_from_db(result.data[0])
 
 
-def update_doctor(doctor_id: str, data: dict, image_file=None) -> dict:
-    """Doktor bilgilerini günceller."""
+def update_doctor(doctor_id: str, data: dict, image_file=None, expected_updated_at: str | None = None) -> dict:
+    """Doktor bilgilerini günceller.
+
+    expected_updated_at verilirse güncelleme sadece doktor kaydı bu versiyondaysa
+    yapılır; aksi halde ConcurrentUpdateError fırlatılır.
+    """
     supabase = get_supabase_client()
     
     update_data = {
@@ -169,41 +185,49 @@ def update_doctor(doctor_id: str, data: dict, image_file=None) -> dict:
         "bio": data.get("bio", ""),
         "services": list(data.get("services", [])),
         "is_active": data.get("is_active", False),
+        "updated_at": datetime.now(timezone.utc).isoformat(),
     }
     
+    old_image = None
     if image_file:
-        # Eski resmi sil
         old_doctor_result = supabase.table("doctors").select("image").eq("id", doctor_id).execute()
-        if old_doctor_result.data and old_doctor_result.data[0].get("image"):
-            _delete_file(old_doctor_result.data[0]["image"])
+        if old_doctor_result.data:
+            old_image = old_doctor_result.data[0].get("image")
         
         update_data["image"] = _save_image(image_file)
     
-    result = supabase.table("doctors").update(update_data).eq("id", doctor_id).execute()
+    query = supabase.table("doctors").update(update_data).eq("id", doctor_id)
+    if expected_updated_at:
+        query = query.eq("updated_at", expected_updated_at)
+    result = query.execute()
     
     if not result.data:
+        # Güncelleme yapılmadıysa yeni yüklenen resmi geri al
+        _delete_file(update_data.get("image"))
+        if expected_updated_at:
+            raise ConcurrentUpdateError()
         raise ValueError("Doktor bulunamadı veya güncellenemedi")
     
+    # Eski resmi sadece güncelleme başarılı olduktan sonra sil
+    _delete_file(old_image)
+    data_version.bump_rows(result.data, "doctors")
+    
     return _format_doctor_from_db(result.data[0])
 
 
 def delete_doctor(doctor_id: str) -> None:
-    """Doktoru siler."""
+    """Doktoru ve tatillerini tek transaction'da siler (`delete_doctor_cascade`)."""
     supabase = get_supabase_client()
     
-    # Önce resmi al
-    doctor_result = supabase.table("doctors").select("image").eq("id", doctor_id).execute()
-    if doctor_result.data and doctor_result.data[0].get("image"):
-        _delete_file(doctor_result.data[0]["image"])
-    
-    # Doktor tatillerini sil
-    _delete_doctor_holidays(doctor_id)
-    
-    # Doktoru sil
-    result = supabase.table("doctors").delete().eq("id", doctor_id).execute()
+    result = supabase.rpc("delete_doctor_cascade", {"p_doctor_id": doctor_id}).execute()
     
     if not result.data:
         raise ValueError("Doktor bulunamadı veya silinemedi")
+    # Fonksiyon doktorun hastanesini döndürür; yalnızca o hastanenin sürümleri yenilenir
+    data_version.bump_rows(result.data, "doctors", "holidays")
+    
+    # Storage transaction dışında kalır; kayıt silindikten sonra görseli temizle
+    _delete_file(result.data[0].get("doctor_image"))
 
 
 def update_working_hours(doctor_id: str, working_hours: dict) -> None:
@@ -213,6 +237,7 @@ def update_working_hours(doctor_id: str, working_hours: dict) -> None:
     
     if not result.data:
         raise ValueError("Doktor bulunamadı veya güncellenemedi")
+    data_version.bump_rows(result.data, "doctors")
 
 
 def build_initial_working_hours(doctor: dict) -> dict:
@@ -301,6 +326,7 @@ def add_doctor_holiday(doctor_id: str, date_str: str, reason: str, request=None)
     
     if not result.data:
         raise ValueError("Doktor tatili eklenemedi")
+    data_version.bump(hospital_id, "holidays")
 
 
 def delete_doctor_holiday(holiday_id: str) -> None:
@@ -310,6 +336,7 @@ def delete_doctor_holiday(holiday_id: str) -> None:
     
     if not result.data:
         raise ValueError("Tatil bulunamadı veya silinemedi")
+    data_version.bump_rows(result.data, "holidays")
 
 
 def toggle_active(doctor_id: str, is_active: bool) -> None:
@@ -319,6 +346,7 @@ def toggle_active(doctor_id: str, is_active: bool) -> None:
     
     if not result.data:
         raise ValueError("Doktor bulunamadı veya güncellenemedi")
+    data_version.bump_rows(result.data, "doctors")
 
 
 def _default_working_hours() -> dict:
@@ -333,7 +361,7 @@ def _default_working_hours() -> dict:
 def _build_default_working_hours(request=None) -> dict:
     """Hastane çalışma saatlerinden varsayılan doktor çalışma saatlerini oluşturur."""
     try:
-        hospital = get_hospital(request)
+        hospital = get_request_hospital(request)
         hospital_hours = hospital.get("workingHours", {}) or {}
     except ValueError:
         hospital_hours = {}
@@ -385,26 +413,9 @@ def _delete_file(file_url_or_path: str | None) -> None:
                 pass
 
 
-def _delete_doctor_holidays(doctor_id: str) -> None:
-    """Doktorun tüm tatillerini siler."""
-    supabase = get_supabase_client()
-    supabase.table("holidays").delete().eq("doctor_id", doctor_id).execute()
-
-
-def _format_doctor_from_db(db_doctor: dict) -> dict:
+def _format_doctor_from_db(db_doctor: dict) -> DoctorRecord:
     """Supabase'den gelen doktor verisini mevcut formata çevirir."""
-    return {
-        "id": str(db_doctor.get("id", "")),
-        "hospitalId": str(db_doctor.get("hospital_id", "")),
-        "name": db_doctor.get("name", ""),
-        "surname": db_doctor.get("surname", ""),
-        "image": db_doctor.get("image"),
-        "bio": db_doctor.get("bio", ""),
-        "workingHours": db_doctor.get("working_hours", {}),
-        "isActive": db_doctor.get("is_active", True),
-        "services": db_doctor.get("services", []),
-        "createdAt": db_doctor.get("created_at", ""),
-    }
+    return DoctorRecord(db_doctor)
 
 
 def _format_holiday_from_db(db_holiday: dict) -> dict:
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 from django.conf import settings
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 
 
@@ -16,6 +15,9 @@ def send_hospital_registration_notification(hospital_data: dict) -> bool:
     Returns:
         bool: Email başarıyla gönderildiyse True
     """
+    # django.core.mail ve email.* modülleri ilk gönderimde yüklenir
+    from django.core.mail import send_mail
+
     try:
         subject = f"Yeni Hastane Kayıt İsteği - {hospital_data.get('name', 'Bilinmeyen')}"
         
@@ -64,6 +66,8 @@ def send_hospital_approval_notification(hospital_email: str, hospital_code: str,
     Returns:
         bool: Email başarıyla gönderildiyse True
     """
+    from django.core.mail import send_mail
+
     try:
         subject = f"Hastane Kaydınız Onaylandı - {hospital_name}"
         
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import copy
 import mimetypes
 import os
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
 from django.conf import settings
 
-from . import location_service
+from . import data_version, location_service
+from .async_client import arows, get_async_client
+from .circuit_breaker import BACKEND_UNAVAILABLE
+from .concurrency import ConcurrentUpdateError, retry_on_conflict
 from .supabase_client import get_supabase_client
 
 REQUIRED_LOGO_WIDTH = 400
@@ -38,9 +42,19 @@ UPLOAD_DIR = Path(settings.BASE_DIR, "panel", "static", "uploads")
 def get_hospital(request=None) -> dict:
     """Aktif hastaneyi Supabase'den getirir (session'dan veya ilk hastaneyi alır)."""
     try:
-        supabase = get_supabase_client()
         hospital_id = _get_active_hospital_id(request)
+    except BACKEND_UNAVAILABLE:
+        # View'lar ve DeadlineMiddleware kısmi sayfa ya da 503 ile karşılar
+        raise
+    except Exception as exc:
+        raise ValueError(f"Hastane bulunamadı: {exc}") from exc
+    return get_hospital_by_id(hospital_id)
 
+
+def get_hospital_by_id(hospital_id: str) -> dict:
+    """Hastaneyi id ile getirir; istekten bağımsız işler (önbellek yenileme) kullanır."""
+    try:
+        supabase = get_supabase_client()
         result = supabase.table("hospitals").select("*").eq("id", hospital_id).single().execute()
         data = result.data
 
@@ -51,29 +65,166 @@ def get_hospital(request=None) -> dict:
         else:
             raise ValueError("Supabase'den hastane verisi alınamadı.")
 
-        return _format_hospital_from_db(hospital)
+        return TrackedHospital(_format_hospital_from_db(hospital))
+    except BACKEND_UNAVAILABLE:
+        raise
     except Exception as exc:
         raise ValueError(f"Hastane bulunamadı: {exc}") from exc
 
 
-def save_hospital(updated: dict, request=None) -> None:
-    """Hastane bilgilerini Supabase'e kaydeder."""
-    supabase = get_supabase_client()
-    # Veriyi Supabase formatına çevir
-    db_data = _format_hospital_to_db(updated)
+def get_request_hospital(request=None) -> dict:
+    """Aktif hastaneyi istek başına bir kez getirir.
+
+    Sonuç request üzerinde saklanır; aynı istekteki view'lar, servisler ve
+    şablonlar (context processor) tek bir Supabase sorgusunu paylaşır.
+    Dönen nesne salt okunur kullanılmalıdır; güncelleme yapacak kod
+    `get_hospital` ile taze bir kopya almalıdır.
+    """
+    if request is None:
+        return get_hospital(request)
+    hospital = getattr(request, "_panel_hospital", None)
+    if hospital is None:
+        hospital = request._panel_hospital = get_hospital(request)
+    return hospital
+
+
+async def aget_request_hospital(request) -> dict:
+    """`get_request_hospital`'ın asenkron karşılığı; aynı request önbelleğini kullanır."""
+    hospital = getattr(request, "_panel_hospital", None)
+    if hospital is None:
+        hospital = request._panel_hospital = await aget_hospital_by_id(_get_active_hospital_id(request))
+    return hospital
+
+
+async def aget_hospital_by_id(hospital_id: str) -> dict:
+    """`get_hospital_by_id`'nin asenkron karşılığı."""
+    rows = await arows(get_async_client().table("hospitals").select("*").eq("id", hospital_id).limit(1))
+    if not rows:
+        raise ValueError("Hastane bulunamadı")
+    return TrackedHospital(_format_hospital_from_db(rows[0]))
+
+
+class TrackedHospital(dict):
+    """Değişen alanları takip eden hastane sözlüğü.
+
+    `get_hospital` bu sınıfı döndürür; `save_hospital` yalnızca değişen
+    alanları (dirty_fields) Supabase'e gönderir. Atanan alanların yanı sıra
+    okunduğu andaki kopyadan farklılaşan alanlar da kirli sayılır; böylece
+    `pop`, `del` ve `working_hours[day] = ...` gibi yerinde değişiklikler
+    de kaydedilir.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._assigned: set[str] = set()
+        self._original = copy.deepcopy(dict(self))
+
+    @property
+    def dirty_fields(self) -> set[str]:
+        missing = object()
+        changed = {
+            key for key in self.keys() | self._original.keys()
+            if self.get(key, missing) != self._original.get(key, missing)
+        }
+        return self._assigned | changed
+
+    def __setitem__(self, key, value):
+        # Listeler yerinde değiştirilip tekrar atanabildiği için (gallery.append)
+        # değer karşılaştırması yapılmaz, her atama alanı kirli işaretler.
+        super().__setitem__(key, value)
+        self._assigned.add(key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def mark_clean(self, updated_at: str | None = None) -> None:
+        """Kayıt sonrası kirli alanları temizler ve versiyon damgasını yeniler."""
+        if updated_at:
+            super().__setitem__("updatedAt", updated_at)
+        self._assigned.clear()
+        self._original = copy.deepcopy(dict(self))
+
+
+def save_hospital(updated: dict, request=None, *, expected_updated_at: str | None = None) -> None:
+    """Hastane bilgilerini Supabase'e kaydeder.
+
+    TrackedHospital verilirse sadece değişen kolonlar gönderilir ve kaydın
+    okunduğu versiyon (updatedAt) ön koşul olarak kullanılır; düz dict
+    verilirse (geriye dönük uyumluluk) tüm satır yazılır.
+
+    Raises:
+        ConcurrentUpdateError: Kayıt okunduktan sonra başkası tarafından değiştirildiyse
+    """
     hospital_id = updated.get("id") or _get_active_hospital_id(request)
-    
-    result = supabase.table("hospitals").update(db_data).eq("id", hospital_id).execute()
-    
+
+    if isinstance(updated, TrackedHospital):
+        if not updated.dirty_fields:
+            return
+        db_data = _format_hospital_changes_to_db(updated, updated.dirty_fields)
+        if expected_updated_at is None:
+            expected_updated_at = updated.get("updatedAt") or None
+    else:
+        # Veriyi Supabase formatına çevir
+        db_data = _format_hospital_to_db(updated)
+
+    row = update_hospital_fields(hospital_id, db_data, expected_updated_at=expected_updated_at)
+
+    if isinstance(updated, TrackedHospital):
+        updated.mark_clean(row.get("updated_at"))
+
+
+def update_hospital_fields(
+    hospital_id: str,
+    changes: dict,
+    *,
+    expected_updated_at: str | None = None,
+    returning: str = "id, updated_at",
+) -> dict:
+    """Hastanenin sadece verilen kolonlarını günceller.
+
+    Args:
+        hospital_id: Hastane ID'si
+        changes: Supabase kolon adı -> yeni değer
+        expected_updated_at: Verilirse satır sadece updated_at bu değerdeyse güncellenir
+        returning: Yanıtta dönecek kolonlar
+
+    Returns:
+        dict: Güncellenen satırın `returning` kolonları
+
+    Raises:
+        ConcurrentUpdateError: updated_at ön koşulu sağlanmazsa
+        ValueError: Satır bulunamazsa
+    """
+    supabase = get_supabase_client()
+    payload = dict(changes)
+    payload["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+    query = supabase.table("hospitals").update(payload).eq("id", hospital_id)
+    if expected_updated_at:
+        query = query.eq("updated_at", expected_updated_at)
+    result = query.select(returning).execute()
+
     if not result.data:
+        if expected_updated_at:
+            raise ConcurrentUpdateError()
         raise ValueError("Hastane güncellenemedi")
 
+    # Session'daki hastane özetleri bir sonraki istekte yenilenir
+    data_version.bump(hospital_id, "hospitals")
+    return result.data[0]
+
 
 def get_services() -> list[dict]:
-    """Tüm hizmetleri Supabase'den getirir."""
-    supabase = get_supabase_client()
-    result = supabase.table("services").select("*").execute()
-    return result.data if result.data else []
+    """Tüm hizmetleri getirir (service_service ile aynı paylaşılan önbellek)."""
+    from .service_service import get_services as _get_services
+
+    return _get_services()
 
 
 def get_holidays(request=None) -> list[dict]:
@@ -90,43 +241,29 @@ def get_holidays(request=None) -> list[dict]:
 
 
 def add_holiday(date_str: str, reason: str, is_full_day: bool = True, start_time: str | None = None, end_time: str | None = None, request=None) -> None:
-    """Yeni tatil ekler."""
-    from datetime import datetime, date
-    
+    """Yeni tatil ekler.
+
+    Saatli tatillerde o günün çalışma saatleri tatil başlangıcına kadar
+    kısaltılır. Ekleme ve kısaltma `add_hospital_holiday` Postgres fonksiyonu
+    ile tek transaction'da yapılır (supabase/migrations).
+    """
     supabase = get_supabase_client()
     hospital_id = _get_active_hospital_id(request)
-    payload = {
-        "hospital_id": hospital_id,
-        "doctor_id": None,
-        "date": date_str,
-        "reason": reason,
-        "is_full_day": is_full_day,
-        "start_time": start_time if not is_full_day else None,
-        "end_time": end_time if not is_full_day else None,
+    params = {
+        "p_hospital_id": hospital_id,
+        "p_date": date_str,
+        "p_reason": reason,
+        "p_is_full_day": is_full_day,
+        "p_start_time": start_time if not is_full_day else None,
+        "p_end_time": end_time if not is_full_day else None,
     }
     
-    result = supabase.table("holidays").insert(payload).execute()
+    result = supabase.rpc("add_hospital_holiday", params).execute()
     
     if not result.data:
         raise ValueError("Tatil eklenemedi")
-    
-    # Saatli tatil ise, o günün çalışma saatlerini tatil başlangıç saatine kadar kısalt
-    if not is_full_day and start_time:
-        holiday_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        weekday_names = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-        weekday_name = weekday_names[holiday_date.weekday()]
-        
-        hospital = get_hospital(request)
-        working_hours = hospital.get("workingHours", {})
-        day_hours = working_hours.get(weekday_name, {})
-        
-        # Eğer o gün çalışma günü ise ve başlangıç saati varsa
-        if day_hours.get("isAvailable") and day_hours.get("start"):
-            # Çalışma saatlerini tatil başlangıç saatine kadar kısalt
-            day_hours["end"] = start_time
-            working_hours[weekday_name] = day_hours
-            hospital["workingHours"] = working_hours
-            save_hospital(hospital)
+    # Saatli tatil hastanenin çalışma saatlerini de değiştirir
+    data_version.bump(hospital_id, "holidays", "hospitals")
 
 
 def delete_holiday(holiday_id: str) -> None:
@@ -136,6 +273,7 @@ def delete_holiday(holiday_id: str) -> None:
     
     if not result.data:
         raise ValueError("Tatil bulunamadı veya silinemedi")
+    data_version.bump_rows(result.data, "holidays")
 
 
 def save_logo(file) -> str:
@@ -363,23 +501,45 @@ def update_is_open_24_hours(hospital: dict, is_open_24_hours: bool, request=None
 
 
 def add_gallery_image(hospital: dict, file, request=None) -> dict:
-    public_url = save_gallery_image(file)
-    gallery = hospital.get("gallery", [])
-    if len(gallery) >= 5:
+    if len(hospital.get("gallery", [])) >= 5:
         raise ValueError("Maksimum 5 görsel eklenebilir")
-    gallery.append(public_url)  # Artık tam URL kaydediyoruz
-    hospital["gallery"] = gallery
-    save_hospital(hospital, request)
-    return hospital
+    public_url = save_gallery_image(file)
+
+    def _append(record: dict) -> None:
+        gallery = list(record.get("gallery", []))
+        if len(gallery) >= 5:
+            raise ValueError("Maksimum 5 görsel eklenebilir")
+        gallery.append(public_url)  # Artık tam URL kaydediyoruz
+        record["gallery"] = gallery
+
+    return retry_on_conflict(
+        hospital,
+        mutate=_append,
+        save=lambda record: save_hospital(record, request),
+        reload=lambda: get_hospital(request),
+    )
 
 
 def remove_gallery_image(hospital: dict, index: int, request=None) -> dict:
     gallery = hospital.get("gallery", [])
-    if 0 <= index < len(gallery):
-        delete_file_if_exists(gallery[index])
-        gallery.pop(index)
-        hospital["gallery"] = gallery
-        save_hospital(hospital, request)
+    if not 0 <= index < len(gallery):
+        return hospital
+    # Çakışmada index kayabileceği için görsel URL'si üzerinden silinir
+    image_url = gallery[index]
+
+    def _remove(record: dict) -> None:
+        record_gallery = list(record.get("gallery", []))
+        if image_url in record_gallery:
+            record_gallery.remove(image_url)
+            record["gallery"] = record_gallery
+
+    hospital = retry_on_conflict(
+        hospital,
+        mutate=_remove,
+        save=lambda record: save_hospital(record, request),
+        reload=lambda: get_hospital(request),
+    )
+    delete_file_if_exists(image_url)
     return hospital
 
 
@@ -458,11 +618,12 @@ def _format_hospital_from_db(db_hospital: dict) -> dict:
         "email": db_hospital.get("email", ""),
         "description": db_hospital.get("description", ""),
         "image": db_hospital.get("image"),
-        "gallery": db_hospital.get("gallery", []),
-        "services": db_hospital.get("services", []),
-        "workingHours": db_hospital.get("working_hours", {}),
+        "gallery": list(db_hospital.get("gallery") or []),
+        "services": list(db_hospital.get("services") or []),
+        "workingHours": copy.deepcopy(db_hospital.get("working_hours") or {}),
         "is_open_24_hours": db_hospital.get("is_open_24_hours", False),
         "createdAt": db_hospital.get("created_at", ""),
+        "updatedAt": db_hospital.get("updated_at", ""),
         "provinceId": db_hospital.get("province_id", ""),
         "provinceName": db_hospital.get("province_name", ""),
         "districtId": db_hospital.get("district_id", ""),
@@ -496,6 +657,36 @@ def _format_hospital_to_db(hospital: dict) -> dict:
     }
 
 
+# Uygulama alanı -> Supabase kolonu (kısmi güncellemelerde kullanılır)
+_HOSPITAL_FIELD_COLUMNS = {
+    "name": "name",
+    "address": "address",
+    "latitude": "latitude",
+    "longitude": "longitude",
+    "phone": "phone",
+    "email": "email",
+    "description": "description",
+    "image": "image",
+    "gallery": "gallery",
+    "services": "services",
+    "workingHours": "working_hours",
+    "isOpen24Hours": "is_open_24_hours",
+    "provinceId": "province_id",
+    "provinceName": "province_name",
+    "districtId": "district_id",
+    "districtName": "district_name",
+    "neighborhoodId": "neighborhood_id",
+    "neighborhoodName": "neighborhood_name",
+}
+
+
+def _format_hospital_changes_to_db(hospital: dict, fields) -> dict:
+    """Sadece verilen alanları Supabase kolonlarına çevirir."""
+    db_hospital = _format_hospital_to_db(hospital)
+    columns = {_HOSPITAL_FIELD_COLUMNS[f] for f in fields if f in _HOSPITAL_FIELD_COLUMNS}
+    return {column: db_hospital[column] for column in columns}
+
+
 def _format_holiday_from_db(db_holiday: dict) -> dict:
     """Supabase'den gelen tatil verisini mevcut formata çevirir."""
     return {
@@ -0,0 +1,71 @@
+"""Supabase client'larının kullandığı, deadline'a uyan httpx transport'ları.
+
+Her istekte httpx zaman aşımları (connect/read/write/pool) aktif isteğin
+kalan süresiyle sınırlanır; süre dolmuşsa istek gönderilmez. httpx zaman
+aşımı hataları `DeadlineExceeded`'e çevrilir, böylece view'lar tek bir hata
+türünü yakalar. httpx yalnızca client oluşturulurken import edilir.
+"""
+
+from __future__ import annotations
+
+import httpx
+from django.conf import settings
+
+from . import deadline
+from .deadline import DeadlineExceeded
+
+
+def client_timeout() -> httpx.Timeout:
+    """Deadline olmayan çağrılar için de geçerli sabit zaman aşımları."""
+    return httpx.Timeout(settings.PANEL_SUPABASE_READ_TIMEOUT, connect=settings.PANEL_SUPABASE_CONNECT_TIMEOUT)
+
+
+def _bound_timeouts(request: httpx.Request) -> None:
+    left = deadline.check()
+    if left is None:
+        return
+    timeouts = request.extensions.get("timeout", {})
+    bounded = {}
+    for key in ("connect", "read", "write", "pool"):
+        value = timeouts.get(key)
+        bounded[key] = left if value is None else min(value, left)
+    request.extensions["timeout"] = bounded
+
+
+class DeadlineTransport(httpx.HTTPTransport):
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        _bound_timeouts(request)
+        try:
+            return super().handle_request(request)
+        except httpx.TimeoutException as exc:
+            raise DeadlineExceeded(f"Supabase isteği zaman aşımına uğradı: {request.url.path}") from exc
+
+
+class AsyncDeadlineTransport(httpx.AsyncHTTPTransport):
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        _bound_timeouts(request)
+        try:
+            return await super().handle_async_request(request)
+        except httpx.TimeoutException as exc:
+            raise DeadlineExceeded(f"Supabase isteği zaman aşımına uğradı: {request.url.path}") from exc
+
+
+def create_http_client() -> httpx.Client:
+    """Senkron Supabase client'larının (PostgREST, Auth, Storage) paylaştığı httpx client'ı."""
+    return httpx.Client(
+        timeout=client_timeout(),
+        transport=DeadlineTransport(http2=True),
+        follow_redirects=True,
+    )
+
+
+def create_async_http_client(max_connections: int) -> httpx.AsyncClient:
+    """Asenkron PostgREST client'ının httpx client'ı."""
+    return httpx.AsyncClient(
+        timeout=client_timeout(),
+        transport=AsyncDeadlineTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        ),
+        follow_redirects=True,
+    )
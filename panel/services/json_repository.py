@@ -13,6 +13,11 @@ from typing import Any
 
 from django.conf import settings
 
+from . import data_version
+
+# JSON dosyalarından türetilen verilerin (ör. ayarlardaki veri istatistikleri) sürüm kapsamı
+DATA_SCOPE = "panel_data"
+
 # Dosya bazlı kilit mekanizması: aynı anda birden fazla yazma olursa veri
 # kaybını önlemek için basit bir Lock havuzu kullanıyoruz.
 _FILE_LOCKS: dict[Path, Lock] = {}
@@ -55,6 +60,7 @@ def save_json(file_name: str, data: Any) -> None:
         with tmp_path.open('w', encoding='utf-8') as fp:
             json.dump(data, fp, ensure_ascii=False, indent=2)
         tmp_path.replace(data_path)
+    data_version.bump(None, DATA_SCOPE)
 
 
 def update_collection(file_name: str, predicate, update_fn) -> Any:
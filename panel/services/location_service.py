@@ -3,7 +3,9 @@ from __future__ import annotations
 import json
 from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable
+
+from .shared_cache import get_shared_cache
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 
@@ -50,16 +52,134 @@ def _normalize_name(value: str) -> str:
     return value.title()
 
 
+# Paylaşılan önbellekteki konum indeksi anahtarları. İndeks JSON dosyalarından
+# bir kez oluşturulur; worker'lar sadece ihtiyaç duydukları küçük kayıtları okur
+# ve ~11 MB'lık mahalle verisini kendi belleklerine yüklemez.
+_INDEX_VERSION = "v1"
+_INDEX_READY_KEY = f"locations:{_INDEX_VERSION}:ready"
+
+
+def _index_key(kind: str, item_id: str = "") -> str:
+    return f"locations:{_INDEX_VERSION}:{kind}:{item_id}"
+
+
+def build_location_index() -> dict[str, object]:
+    """Tüm konum sorgularının yanıtlarını anahtar -> değer olarak üretir."""
+    provinces = _load_json(PROVINCE_FILE)
+    districts = _load_json(DISTRICT_FILE)
+    province_names = {}
+    for item in provinces:
+        province_names.setdefault(item["sehir_id"], _normalize_name(item["sehir_adi"]))
+
+    index: dict[str, object] = {
+        _index_key("provinces"): [{"id": item["sehir_id"], "name": _normalize_name(item["sehir_adi"])} for item in provinces],
+    }
+    for item in provinces:
+        index.setdefault(_index_key("province", item["sehir_id"]), {"id": item["sehir_id"], "name": _normalize_name(item["sehir_adi"])})
+        # Alt kaydı olmayan konumlar da "boş liste" olarak indekslenir
+        index.setdefault(_index_key("districts", item["sehir_id"]), [])
+
+    district_details = {}
+    for item in districts:
+        name = _normalize_name(item["ilce_adi"])
+        index.setdefault(_index_key("districts", item["sehir_id"]), []).append({"id": item["ilce_id"], "name": name})
+        district_details.setdefault(item["ilce_id"], {
+            "id": item["ilce_id"],
+            "name": name,
+            "provinceId": item["sehir_id"],
+            "provinceName": province_names.get(item["sehir_id"]),
+        })
+    for district_id, detail in district_details.items():
+        index[_index_key("district", district_id)] = detail
+        index.setdefault(_index_key("neighborhoods", district_id), [])
+
+    for filename in NEIGHBORHOOD_FILES:
+        for item in _load_json(filename):
+            name = _normalize_name(item["mahalle_adi"])
+            index.setdefault(_index_key("neighborhoods", item["ilce_id"]), []).append({"id": item["mahalle_id"], "name": name})
+            # get_neighborhood ilk eşleşmeyi döndürür
+            detail_key = _index_key("neighborhood", item["mahalle_id"])
+            if detail_key not in index:
+                district = district_details.get(item["ilce_id"])
+                index[detail_key] = {
+                    "id": item["mahalle_id"],
+                    "name": name,
+                    "districtId": item["ilce_id"],
+                    "districtName": district["name"] if district else None,
+                    "provinceId": district["provinceId"] if district else None,
+                    "provinceName": district["provinceName"] if district else None,
+                }
+
+    index[_INDEX_READY_KEY] = True
+    return index
+
+
+def warm_location_index() -> bool:
+    """Paylaşılan önbellekte konum indeksi yoksa oluşturur; önbellek kapalıysa False."""
+    cache = get_shared_cache()
+    if cache is None:
+        return False
+    if cache.get(_INDEX_READY_KEY) is None:
+        # Aynı anda iki worker oluşturursa ikisi de aynı içeriği yazar
+        cache.set_many(build_location_index())
+    return True
+
+
+def _lookup(kind: str, item_id: str, local: Callable[[], object]) -> object:
+    """Paylaşılan indeksten okur.
+
+    Önbellek kapalıysa veya kayıt bulunamadıysa (tahliye edilmiş ya da
+    geçersiz id) eski yoldan, süreç içi JSON verisiyle hesaplanır.
+    """
+    if warm_location_index():
+        value = get_shared_cache().get(_index_key(kind, item_id))
+        if value is not None:
+            return value
+    return local()
+
+
 def get_provinces() -> list[dict]:
+    return _lookup("provinces", "", _local_provinces)
+
+
+def get_districts(province_id: str | None) -> list[dict]:
+    if not province_id:
+        return []
+    return _lookup("districts", province_id, lambda: _local_districts(province_id))
+
+
+def get_neighborhoods(district_id: str | None) -> list[dict]:
+    if not district_id:
+        return []
+    return _lookup("neighborhoods", district_id, lambda: _local_neighborhoods(district_id))
+
+
+def get_province(province_id: str | None) -> dict | None:
+    if not province_id:
+        return None
+    return _lookup("province", province_id, lambda: _local_province(province_id))
+
+
+def get_district(district_id: str | None) -> dict | None:
+    if not district_id:
+        return None
+    return _lookup("district", district_id, lambda: _local_district(district_id))
+
+
+def get_neighborhood(neighborhood_id: str | None) -> dict | None:
+    if not neighborhood_id:
+        return None
+    return _lookup("neighborhood", neighborhood_id, lambda: _local_neighborhood(neighborhood_id))
+
+
+def _local_provinces() -> list[dict]:
     return [
         {"id": item["sehir_id"], "name": _normalize_name(item["sehir_adi"])}
         for item in _provinces()
     ]
 
 
-def get_districts(province_id: str | None) -> list[dict]:
-    if not province_id:
-        return []
+def _local_districts(province_id: str) -> list[dict]:
     return [
         {"id": item["ilce_id"], "name": _normalize_name(item["ilce_adi"])}
         for item in _districts()
@@ -67,9 +187,7 @@ def get_districts(province_id: str | None) -> list[dict]:
     ]
 
 
-def get_neighborhoods(district_id: str | None) -> list[dict]:
-    if not district_id:
-        return []
+def _local_neighborhoods(district_id: str) -> list[dict]:
     return [
         {"id": item["mahalle_id"], "name": _normalize_name(item["mahalle_adi"])}
         for item in _neighborhoods()
@@ -77,9 +195,7 @@ def get_neighborhoods(district_id: str | None) -> list[dict]:
     ]
 
 
-def get_province(province_id: str | None) -> dict | None:
-    if not province_id:
-        return None
+def _local_province(province_id: str) -> dict | None:
     for province in _provinces():
         if province["sehir_id"] == province_id:
             return {
@@ -89,12 +205,10 @@ def get_province(province_id: str | None) -> dict | None:
     return None
 
 
-def get_district(district_id: str | None) -> dict | None:
-    if not district_id:
-        return None
+def _local_district(district_id: str) -> dict | None:
     for district in _districts():
         if district["ilce_id"] == district_id:
-            province = get_province(district["sehir_id"])
+            province = _local_province(district["sehir_id"])
             return {
                 "id": district["ilce_id"],
                 "name": _normalize_name(district["ilce_adi"]),
@@ -104,12 +218,10 @@ def get_district(district_id: str | None) -> dict | None:
     return None
 
 
-def get_neighborhood(neighborhood_id: str | None) -> dict | None:
-    if not neighborhood_id:
-        return None
+def _local_neighborhood(neighborhood_id: str) -> dict | None:
     for neighborhood in _neighborhoods():
         if neighborhood["mahalle_id"] == neighborhood_id:
-            district = get_district(neighborhood["ilce_id"])
+            district = _local_district(neighborhood["ilce_id"])
             return {
                 "id": neighborhood["mahalle_id"],
                 "name": _normalize_name(neighborhood["mahalle_adi"]),
@@ -0,0 +1,195 @@
+"""
+Supabase satırları için hafif kayıt sınıfları.
+
+`_format_*_from_db` fonksiyonları eskiden her satır için yeni bir dict
+oluşturup tüm alanları baştan dönüştürüyordu. Kayıt sınıfları ham satırı
+saklar ve alanı yalnızca okunduğunda dönüştürür; `__slots__` sayesinde satır
+başına ek maliyet iki referanstır.
+
+Kayıtlar dict gibi davranır (`record["id"]`, `.get()`, `.update()`, `in`,
+iterasyon, dict ile eşitlik), bu yüzden şablonlar ve view'lar değişmeden
+çalışır. `dict` alt sınıfı değildirler: tip kontrolleri `Mapping` ile yapılır,
+JSON'a yazmadan önce `to_dict()` çağrılır (widget JSON encoder'ı bunu yapar).
+Sonradan yazılan alanlar (ör. yorumlara eklenen "user") ayrı bir dict'te
+tutulur; bu dict ilk yazmada oluşturulur.
+"""
+
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+from typing import Any, Callable, Iterator
+
+
+class _Deleted:
+    """Silinmiş alan işareti; pickle sonrası da aynı nesneye çözülür."""
+
+    def __reduce__(self):
+        return "_DELETED"
+
+
+_DELETED = _Deleted()
+
+
+def _raw(column: str, default: Any = None) -> Callable[[dict], Any]:
+    return lambda row: row.get(column, default)
+
+
+class _RawOrNew:
+    """Eksik alan için değiştirilebilir bir varsayılan üretir; kayıt onu ilk okumada saklar."""
+
+    __slots__ = ("column", "factory")
+
+    def __init__(self, column: str, factory: Callable[[], Any]):
+        self.column = column
+        self.factory = factory
+
+    def __call__(self, row: dict) -> Any:
+        return row[self.column] if self.column in row else self.factory()
+
+
+_raw_or_new = _RawOrNew
+
+
+def _text(column: str) -> Callable[[dict], str]:
+    return lambda row: str(row.get(column, ""))
+
+
+def _optional_text(column: str) -> Callable[[dict], str | None]:
+    return lambda row: str(row[column]) if row.get(column) else None
+
+
+class Record(MutableMapping):
+    """Alan adı -> dönüştürücü eşlemesi (FIELDS) ile tanımlanan kayıt tabanı."""
+
+    __slots__ = ("_row", "_extra")
+
+    FIELDS: dict[str, Callable[[dict], Any]] = {}
+
+    def __init__(self, row: dict):
+        self._row = row
+        self._extra: dict | None = None
+
+    def __getitem__(self, key: str) -> Any:
+        extra = self._extra
+        if extra is not None and key in extra:
+            value = extra[key]
+            if value is _DELETED:
+                raise KeyError(key)
+            return value
+        try:
+            convert = self.FIELDS[key]
+        except KeyError:
+            raise KeyError(key) from None
+        value = convert(self._row)
+        if type(convert) is _RawOrNew and convert.column not in self._row:
+            # Varsayılan saklanır: record["services"].append(x) sonraki okumada görünür
+            self[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if key in self.FIELDS:
+            self[key] = _DELETED
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        extra = self._extra
+        if extra is not None and key in extra:
+            return extra[key] is not _DELETED
+        return key in self.FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        extra = self._extra or {}
+        for key in self.FIELDS:
+            if extra.get(key) is not _DELETED:
+                yield key
+        for key, value in extra.items():
+            if key not in self.FIELDS and value is not _DELETED:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> dict:
+        """Tüm alanları dönüştürülmüş düz bir dict döndürür (JSON vb. için)."""
+        return {key: self[key] for key in self}
+
+    def copy(self) -> dict:
+        return self.to_dict()
+
+
+class AppointmentRecord(Record):
+    __slots__ = ()
+
+    FIELDS = {
+        "id": _text("id"),
+        "userId": _text("user_id"),
+        "hospitalId": _text("hospital_id"),
+        "doctorId": _text("doctor_id"),
+        "date": _raw("date", ""),
+        "time": _raw("time", ""),
+        # Durumu boş olan randevular tamamlanmış kabul edilir
+        "status": lambda row: row.get("status") or "completed",
+        "service": _text("service_id"),
+        "notes": _raw("notes", ""),
+        "createdAt": _raw("created_at", ""),
+    }
+
+
+class DoctorRecord(Record):
+    __slots__ = ()
+
+    FIELDS = {
+        "id": _text("id"),
+        "hospitalId": _text("hospital_id"),
+        "name": _raw("name", ""),
+        "surname": _raw("surname", ""),
+        "image": _raw("image"),
+        "bio": _raw("bio", ""),
+        "workingHours": _raw_or_new("working_hours", dict),
+        "isActive": _raw("is_active", True),
+        "services": _raw_or_new("services", list),
+        "createdAt": _raw("created_at", ""),
+        "updatedAt": _raw("updated_at", ""),
+    }
+
+
+class ReviewRecord(Record):
+    __slots__ = ()
+
+    FIELDS = {
+        "id": _text("id"),
+        "userId": _text("user_id"),
+        "hospitalId": _text("hospital_id"),
+        "doctorId": _optional_text("doctor_id"),
+        "appointmentId": _text("appointment_id"),
+        "comment": _raw("comment", ""),
+        "reply": _raw("reply"),
+        "repliedAt": _raw("replied_at"),
+        "createdAt": _raw("created_at", ""),
+    }
+
+
+class UserRecord(Record):
+    __slots__ = ()
+
+    FIELDS = {
+        "id": _text("id"),
+        "email": _raw("email", ""),  # auth.users'dan alınacak
+        "password": lambda row: "",  # Şifre gösterilmez
+        "name": _raw("name", ""),
+        "surname": _raw("surname", ""),
+        "phone": _raw("phone", ""),
+        "profileImage": _raw("profile_image"),
+        "createdAt": _raw("created_at", ""),
+    }
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional
 
+from . import data_version
+from .async_client import arows, get_async_client
+from .records import ReviewRecord
 from .supabase_client import get_supabase_client
-from .doctor_service import get_doctors
-from .hospital_service import get_hospital
-from .user_service import get_user_map
+from .doctor_service import aget_doctors, get_doctors
+from .hospital_service import aget_request_hospital, get_request_hospital
+from .user_service import aget_user_map, get_user_map
 
 from .hospital_service import _get_active_hospital_id
 
@@ -37,12 +41,37 @@ def get_reviews_with_details(
     request=None,
 ) -> list[dict]:
     """Yorumları detaylı bilgilerle birlikte getirir."""
-    reviews = _load_reviews()
-    ratings = _load_ratings()
-    user_map = get_user_map()
-    doctors = {d["id"]: d for d in get_doctors(request)}
-    hospital = get_hospital(request)
-    hospital_id = _get_active_hospital_id(request)
+    return _build_review_details(
+        _load_reviews(),
+        _load_ratings(),
+        get_user_map(),
+        get_doctors(request),
+        get_request_hospital(request),
+        _get_active_hospital_id(request),
+        doctor_id=doctor_id,
+        min_rating=min_rating,
+        max_rating=max_rating,
+        date_from=date_from,
+        date_to=date_to,
+        has_reply=has_reply,
+    )
+
+
+def _build_review_details(
+    reviews: list[dict],
+    ratings: list[dict],
+    user_map: dict,
+    doctor_list: list[dict],
+    hospital: dict,
+    hospital_id: str,
+    doctor_id: Optional[str] = None,
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    has_reply: Optional[bool] = None,
+) -> list[dict]:
+    doctors = {d["id"]: d for d in doctor_list}
 
     # Rating'leri appointment_id'ye göre map'le
     rating_map = {str(r.get("appointment_id", "")): r for r in ratings}
@@ -114,9 +143,38 @@ def get_reviews_with_details(
 
 def get_review_statistics(request=None) -> dict:
     """Yorum istatistiklerini hesaplar."""
-    reviews = get_reviews_with_details(request=request)
-    ratings = _load_ratings()
+    return _build_review_statistics(
+        get_reviews_with_details(request=request), _load_ratings(), _get_active_hospital_id(request)
+    )
+
+
+async def aget_review_page(request=None, **filters) -> tuple[list[dict], dict, list[dict]]:
+    """Yorum sayfası için filtrelenmiş yorumları, istatistikleri ve doktorları döndürür.
+
+    `get_reviews_with_details` ve `get_review_statistics`'in asenkron
+    karşılığıdır: tablolar bir kez ve aynı anda okunur. Doktor listesi
+    sayfanın filtre formunda da kullanılır.
+    """
+    client = get_async_client()
+    reviews, ratings, user_map, doctors, hospital = await asyncio.gather(
+        arows(client.table("reviews").select("*")),
+        arows(client.table("ratings").select("*")),
+        aget_user_map(),
+        aget_doctors(request),
+        aget_request_hospital(request),
+    )
     hospital_id = _get_active_hospital_id(request)
+    details = _build_review_details(reviews, ratings, user_map, doctors, hospital, hospital_id, **filters)
+    # İstatistikler filtresiz listeden hesaplanır (senkron yolla aynı)
+    all_details = (
+        _build_review_details(reviews, ratings, user_map, doctors, hospital, hospital_id)
+        if any(value is not None for value in filters.values())
+        else details
+    )
+    return details, _build_review_statistics(all_details, ratings, hospital_id), doctors
+
+
+def _build_review_statistics(reviews: list[dict], ratings: list[dict], hospital_id: str) -> dict:
     hospital_ratings = [
         r.get("hospital_rating", 0) or 0
         for r in ratings
@@ -158,6 +216,7 @@ def add_reply(review_id: str, reply_text: str) -> dict:
     
     if not result.data:
         raise ValueError("Yorum bulunamadı veya güncellenemedi")
+    data_version.bump_rows(result.data, "reviews")
     
     return _format_review_from_db(result.data[0])
 
@@ -172,21 +231,12 @@ def delete_reply(review_id: str) -> dict:
     
     if not result.data:
         raise ValueError("Yorum bulunamadı veya güncellenemedi")
+    data_version.bump_rows(result.data, "reviews")
     
     return _format_review_from_db(result.data[0])
 
 
-def _format_review_from_db(db_review: dict) -> dict:
+def _format_review_from_db(db_review: dict) -> ReviewRecord:
     """Supabase'den gelen yorum verisini mevcut formata çevirir."""
-    return {
-        "id": str(db_review.get("id", "")),
-        "userId": str(db_review.get("user_id", "")),
-        "hospitalId": str(db_review.get("hospital_id", "")),
-        "doctorId": str(db_review.get("doctor_id", "")) if db_review.get("doctor_id") else None,
-        "appointmentId": str(db_review.get("appointment_id", "")),
-        "comment": db_review.get("comment", ""),
-        "reply": db_review.get("reply"),
-        "repliedAt": db_review.get("replied_at"),
-        "createdAt": db_review.get("created_at", ""),
-    }
+    return ReviewRecord(db_review)
 
@@ -1,27 +1,36 @@
 from __future__ import annotations
 
+import asyncio
 from calendar import monthrange
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
 
+from ..dateparse import parse_date
+from .async_client import arows, get_async_client
+from .circuit_breaker import BACKEND_UNAVAILABLE
 from .supabase_client import get_supabase_client
-from .hospital_service import _get_active_hospital_id, get_hospital
+from .swr_cache import panel_cache
+from .hospital_service import _get_active_hospital_id, aget_hospital_by_id, get_hospital_by_id, get_request_hospital
 from .doctor_service import get_doctors
 
 
 def get_hospital_working_hours(request=None) -> dict:
     """Hastane çalışma saatlerini getirir."""
     try:
-        hospital = get_hospital(request)
+        hospital = get_request_hospital(request)
         return hospital.get("workingHours", {})
-    except:
+    except BACKEND_UNAVAILABLE:
+        raise
+    except Exception:
         return {}
 
 
 def get_hospital_info(request=None) -> dict:
     """Hastane bilgilerini getirir (7/24 açık durumu dahil)."""
     try:
-        return get_hospital(request)
-    except:
+        return get_request_hospital(request)
+    except BACKEND_UNAVAILABLE:
+        raise
+    except Exception:
         return {}
 
 
@@ -34,58 +43,123 @@ def get_doctor_working_hours(doctor_id: str | None = None) -> dict:
         supabase = get_supabase_client()
         result = supabase.table("doctors").select("working_hours").eq("id", doctor_id).single().execute()
         return result.data.get("working_hours", {}) if result.data else {}
-    except:
+    except BACKEND_UNAVAILABLE:
+        raise
+    except Exception:
         return {}
 
 
-def get_holidays_for_month(year: int, month: int, doctor_id: str | None = None, request=None) -> list[dict]:
-    """Belirli bir ay için tatilleri getirir."""
-    supabase = get_supabase_client()
-    hospital_id = _get_active_hospital_id(request)
-    
-    query = supabase.table("holidays").select("*").eq("hospital_id", hospital_id)
-    
+async def aget_doctor_working_hours(doctor_id: str | None = None) -> dict:
+    """`get_doctor_working_hours`'ın asenkron karşılığı."""
+    if not doctor_id:
+        return {}
+    try:
+        rows = await arows(get_async_client().table("doctors").select("working_hours").eq("id", doctor_id).limit(1))
+        return (rows[0].get("working_hours") or {}) if rows else {}
+    except BACKEND_UNAVAILABLE:
+        raise
+    except Exception:
+        return {}
+
+
+async def _ahospital_info_by_id(hospital_id: str) -> dict:
+    try:
+        return await aget_hospital_by_id(hospital_id)
+    except BACKEND_UNAVAILABLE:
+        raise
+    except Exception:
+        return {}
+
+
+def _holidays_query(client, doctor_id: str | None, hospital_id: str):
+    query = client.table("holidays").select("*").eq("hospital_id", hospital_id)
     if doctor_id:
-        query = query.eq("doctor_id", doctor_id)
-    else:
-        query = query.is_("doctor_id", "null")
-    
-    result = query.execute()
-    
-    if not result.data:
-        return []
-    
+        return query.eq("doctor_id", doctor_id)
+    return query.is_("doctor_id", "null")
+
+
+def _month_holidays(rows: list[dict], year: int, month: int) -> list[dict]:
     holidays = []
-    for holiday in result.data:
+    for holiday in rows:
         h_date_str = holiday.get("date")
         if h_date_str:
-            try:
-                h_date = datetime.strptime(h_date_str, "%Y-%m-%d").date()
-                if h_date.year == year and h_date.month == month:
-                    # Format dönüştür
-                    holidays.append({
-                        "id": str(holiday.get("id", "")),
-                        "hospitalId": str(holiday.get("hospital_id", "")),
-                        "doctorId": str(holiday.get("doctor_id", "")) if holiday.get("doctor_id") else None,
-                        "date": h_date_str,
-                        "reason": holiday.get("reason", ""),
-                        "isFullDay": holiday.get("is_full_day", True),
-                        "startTime": holiday.get("start_time"),
-                        "endTime": holiday.get("end_time"),
-                    })
-            except ValueError:
-                continue
-    
+            h_date = parse_date(h_date_str)
+            if h_date and h_date.year == year and h_date.month == month:
+                # Format dönüştür
+                holidays.append({
+                    "id": str(holiday.get("id", "")),
+                    "hospitalId": str(holiday.get("hospital_id", "")),
+                    "doctorId": str(holiday.get("doctor_id", "")) if holiday.get("doctor_id") else None,
+                    "date": h_date_str,
+                    "reason": holiday.get("reason", ""),
+                    "isFullDay": holiday.get("is_full_day", True),
+                    "startTime": holiday.get("start_time"),
+                    "endTime": holiday.get("end_time"),
+                })
     return holidays
 
 
-def build_calendar_data(year: int, month: int, selected_doctor_id: str | None = None, request=None) -> dict:
-    """Takvim verilerini oluşturur."""
+def get_holidays_for_month(year: int, month: int, doctor_id: str | None = None, request=None) -> list[dict]:
+    """Belirli bir ay için tatilleri getirir."""
+    result = _holidays_query(get_supabase_client(), doctor_id, _get_active_hospital_id(request)).execute()
+    return _month_holidays(result.data or [], year, month)
+
+
+def _hospital_info_by_id(hospital_id: str) -> dict:
+    try:
+        return get_hospital_by_id(hospital_id)
+    except BACKEND_UNAVAILABLE:
+        raise
+    except Exception:
+        return {}
+
+
+def build_calendar_data(year: int, month: int, selected_doctor_id: str | None, hospital_id: str) -> dict:
+    """Takvim verilerini oluşturur.
+
+    İstek yerine hastane id'si alır; önbellek yenilemesi istek bittikten
+    sonra arka planda çalışabilir.
+    """
+    hospital_info = _hospital_info_by_id(hospital_id)
+    doctor_hours = get_doctor_working_hours(selected_doctor_id) if selected_doctor_id else {}
+    holiday_rows = _holidays_query(get_supabase_client(), selected_doctor_id, hospital_id).execute().data or []
+    return _assemble_calendar(year, month, selected_doctor_id, hospital_info, doctor_hours, holiday_rows)
+
+
+async def abuild_calendar_data(year: int, month: int, selected_doctor_id: str | None, hospital_id: str) -> dict:
+    """`build_calendar_data`'nın asenkron karşılığı; kaynaklar aynı anda okunur."""
+    hospital_info, doctor_hours, holiday_rows = await asyncio.gather(
+        _ahospital_info_by_id(hospital_id),
+        aget_doctor_working_hours(selected_doctor_id),
+        arows(_holidays_query(get_async_client(), selected_doctor_id, hospital_id)),
+    )
+    return _assemble_calendar(year, month, selected_doctor_id, hospital_info, doctor_hours, holiday_rows)
+
+
+def _assemble_calendar(
+    year: int,
+    month: int,
+    selected_doctor_id: str | None,
+    hospital_info: dict,
+    doctor_working_hours: dict,
+    holiday_rows: list[dict],
+) -> dict:
     first_day = date(year, month, 1)
     last_day = date(year, month, monthrange(year, month)[1])
     start_cal = first_day - timedelta(days=first_day.weekday())
     end_cal = last_day + timedelta(days=(6 - last_day.weekday()))
-    
+
+    # Hastane bilgileri (7/24 açık durumu için)
+    is_open_24_hours = hospital_info.get("is_open_24_hours", False)
+    hospital_working_hours = hospital_info.get("workingHours", {})
+
+    # Takvim en fazla üç aya yayılır; tatiller gün bazında gruplanır
+    holidays_by_day: dict[date, list[dict]] = {}
+    for month_start in {start_cal.replace(day=1), first_day, end_cal.replace(day=1)}:
+        for holiday in _month_holidays(holiday_rows, month_start.year, month_start.month):
+            holidays_by_day.setdefault(parse_date(holiday["date"]), []).append(holiday)
+
+    today = date.today()
     weeks = []
     current = start_cal
     while current <= end_cal:
@@ -94,19 +168,15 @@ def build_calendar_data(year: int, month: int, selected_doctor_id: str | None =
             day_data = {
                 "date": current,
                 "is_current_month": current.month == month,
-                "is_today": current == date.today(),
-                "is_past": current < date.today(),
+                "is_today": current == today,
+                "is_past": current < today,
                 "holidays": [],
                 "hospital_hours": None,
                 "doctor_hours": None,
             }
             weekday_name = _get_weekday_name(current.weekday())
             
-            # Hastane bilgilerini al (7/24 açık durumu için)
-            hospital_info = get_hospital_info(request)
-            is_open_24_hours = hospital_info.get("is_open_24_hours", False)
-            
-            hospital_hours = get_hospital_working_hours(request).get(weekday_name, {})
+            hospital_hours = hospital_working_hours.get(weekday_name, {})
             if hospital_hours.get("isAvailable"):
                 # 7/24 açıksa "Tüm Gün" göster
                 if is_open_24_hours:
@@ -119,15 +189,11 @@ def build_calendar_data(year: int, month: int, selected_doctor_id: str | None =
                         day_data["hospital_hours"] = f"{start} - {end}"
             
             if selected_doctor_id:
-                doctor_hours = get_doctor_working_hours(selected_doctor_id).get(weekday_name, {})
+                doctor_hours = doctor_working_hours.get(weekday_name, {})
                 if doctor_hours.get("isAvailable"):
                     day_data["doctor_hours"] = f"{doctor_hours.get('start')} - {doctor_hours.get('end')}"
             
-            month_holidays = get_holidays_for_month(current.year, current.month, selected_doctor_id, request=request)
-            day_holidays = [
-                h for h in month_holidays 
-                if datetime.strptime(h["date"], "%Y-%m-%d").date() == current
-            ]
+            day_holidays = holidays_by_day.get(current, [])
             day_data["holidays"] = day_holidays
             
             # Tüm gün tatil kontrolü
@@ -150,6 +216,26 @@ def build_calendar_data(year: int, month: int, selected_doctor_id: str | None =
     }
 
 
+def get_calendar_data(year: int, month: int, selected_doctor_id: str | None = None, request=None) -> dict:
+    """build_calendar_data sonucunu stale-while-revalidate önbellekten döndürür."""
+    hospital_id = _get_active_hospital_id(request)
+    calendar_data = panel_cache.get(
+        ("calendar", hospital_id, year, month, selected_doctor_id),
+        lambda: build_calendar_data(year, month, selected_doctor_id, hospital_id),
+    )
+    return dict(calendar_data)
+
+
+async def aget_calendar_data(year: int, month: int, selected_doctor_id: str | None = None, request=None) -> dict:
+    """`get_calendar_data`'nın asenkron karşılığı (aynı önbellek kayıtları)."""
+    hospital_id = _get_active_hospital_id(request)
+    calendar_data = await panel_cache.aget(
+        ("calendar", hospital_id, year, month, selected_doctor_id),
+        lambda: abuild_calendar_data(year, month, selected_doctor_id, hospital_id),
+    )
+    return dict(calendar_data)
+
+
 def _get_weekday_name(weekday: int) -> str:
     names = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
     return names[weekday]
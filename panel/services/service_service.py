@@ -1,10 +1,44 @@
 from __future__ import annotations
 
+from django.conf import settings
+
+from . import data_version
+from .async_client import arows, get_async_client
+from .shared_cache import get_shared_cache
 from .supabase_client import get_supabase_client
 
+# Hizmet listesi tüm hastanelerde ortaktır; worker'lar arası paylaşılan önbellekte tutulur
+SERVICES_CACHE_KEY = "services:all"
+
 
 def get_services() -> list[dict]:
-    """Tüm hizmetleri Supabase'den getirir."""
+    """Tüm hizmetleri getirir (paylaşılan önbellek açıksa oradan)."""
+    cache = get_shared_cache()
+    if cache is None:
+        return _fetch_services()
+    return cache.get_or_set(SERVICES_CACHE_KEY, _fetch_services, ttl=settings.PANEL_REFERENCE_CACHE_TTL)
+
+
+async def aget_services() -> list[dict]:
+    """`get_services`'in asenkron karşılığı; paylaşılan önbellek önce denenir."""
+    cache = get_shared_cache()
+    services = cache.get(SERVICES_CACHE_KEY) if cache is not None else None
+    if services is None:
+        services = await arows(get_async_client().table("services").select("*"))
+        if cache is not None:
+            cache.set(SERVICES_CACHE_KEY, services, ttl=settings.PANEL_REFERENCE_CACHE_TTL)
+    return services
+
+
+def invalidate_services_cache() -> None:
+    cache = get_shared_cache()
+    if cache is not None:
+        cache.delete(SERVICES_CACHE_KEY)
+    # Hizmet tablosu global: tüm hastanelerin sürümü yenilenir
+    data_version.bump(None, "services")
+
+
+def _fetch_services() -> list[dict]:
     supabase = get_supabase_client()
     result = supabase.table("services").select("*").execute()
     return result.data if result.data else []
@@ -19,6 +53,7 @@ def add_service(data: dict) -> dict:
     }
     
     result = supabase.table("services").insert(service_data).execute()
+    invalidate_services_cache()
     
     if not result.data:
         raise ValueError("Hizmet eklenemedi")
@@ -35,6 +70,7 @@ def update_service(service_id: str, data: dict) -> dict:
     }
     
     result = supabase.table("services").update(update_data).eq("id", service_id).execute()
+    invalidate_services_cache()
     
     if not result.data:
         raise ValueError("Hizmet bulunamadı veya güncellenemedi")
@@ -52,6 +88,7 @@ def delete_service(service_id: str) -> None:
     
     # Hizmeti sil
     result = supabase.table("services").delete().eq("id", service_id).execute()
+    invalidate_services_cache()
     
     if not result.data:
         raise ValueError("Hizmet bulunamadı veya silinemedi")
@@ -78,6 +115,7 @@ def update_doctor_assignments(service_id: str, doctor_ids: list[str]) -> None:
         
         # Güncelle
         supabase.table("doctors").update({"services": list(services)}).eq("id", doctor_id).execute()
+    data_version.bump(None, "doctors")
 
 
 def update_hospital_assignments(service_id: str, hospital_ids: list[str]) -> None:
@@ -101,6 +139,7 @@ def update_hospital_assignments(service_id: str, hospital_ids: list[str]) -> Non
         
         # Güncelle
         supabase.table("hospitals").update({"services": list(services)}).eq("id", hospital_id).execute()
+    data_version.bump(None, "hospitals")
 
 
 def _remove_service_from_doctors(service_id: str) -> None:
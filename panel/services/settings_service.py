@@ -8,7 +8,8 @@ from pathlib import Path
 from django.conf import settings
 from django.http import HttpResponse
 
-from .json_repository import load_json, save_json
+from . import data_version
+from .json_repository import DATA_SCOPE, load_json, save_json
 from .hospital_service import get_hospitals
 
 
@@ -90,6 +91,16 @@ def get_data_statistics() -> dict:
     return stats
 
 
+def get_data_statistics_version() -> str:
+    """Veri istatistikleri parçasının önbellek sürümü; JSON yazıldığında değişir."""
+    return data_version.get_version(None, DATA_SCOPE)
+
+
+def get_data_statistics_ttl() -> int:
+    """Veri istatistikleri parçasının önbellek süresi."""
+    return data_version.bounded_ttl(settings.PANEL_FRAGMENT_CACHE_TTL)
+
+
 def export_data_as_json() -> bytes:
     """Tüm JSON verilerini tek bir JSON dosyası olarak export eder."""
     import json
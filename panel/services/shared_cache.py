@@ -0,0 +1,208 @@
+"""Worker'lar arası paylaşılan, SQLite tabanlı önbellek.
+
+Gunicorn N worker ile çalıştığında süreç içi önbellekler (lru_cache, dict) her
+worker'da ayrı ayrı tutulur: bellek N ile çarpılır, isabet oranı N'e bölünür.
+SharedCache, değerleri yerel bir dizindeki tek bir SQLite dosyasında (WAL
+modu) pickle olarak saklar; aynı makinedeki tüm worker'lar aynı kayıtları
+okur. Harici servis gerektirmez.
+
+Tahliye:
+- TTL: süresi dolan kayıtlar okunmaz ve yazma sırasında silinir
+- Boyut: toplam boyut `max_bytes` değerini aşarsa en uzun süredir
+  erişilmeyen kayıtlar silinir (erişim zamanı en fazla dakikada bir yazılır).
+  Toplam boyut, tetikleyicilerle güncellenen tek satırlık `totals`
+  tablosunda tutulur; yazmalar tabloyu taramaz. `max_bytes=None` boyut
+  tahliyesini kapatır (ör. oturumlar: tahliye kullanıcının çıkışı demektir).
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable
+
+from django.conf import settings
+
+_MISSING = object()
+# Okuma başına yazma yapmamak için erişim zamanı bu aralıktan seyrek güncellenir
+_TOUCH_INTERVAL = 60.0
+# Boyut aşıldığında bu orana kadar tahliye edilir (her yazmada tahliye olmasın)
+_EVICT_TARGET = 0.9
+
+_SCHEMA = """
+begin immediate;
+create table if not exists entries (
+    key text primary key,
+    value blob not null,
+    size integer not null,
+    expires_at real,
+    accessed_at real not null
+);
+create index if not exists entries_expires_at on entries (expires_at) where expires_at is not null;
+create table if not exists totals (id integer primary key check (id = 0), bytes integer not null);
+insert or ignore into totals (id, bytes) select 0, coalesce(sum(size), 0) from entries;
+create trigger if not exists entries_inserted after insert on entries begin
+    update totals set bytes = bytes + new.size where id = 0;
+end;
+create trigger if not exists entries_deleted after delete on entries begin
+    update totals set bytes = bytes - old.size where id = 0;
+end;
+create trigger if not exists entries_resized after update of size on entries begin
+    update totals set bytes = bytes - old.size + new.size where id = 0;
+end;
+commit;
+"""
+
+
+class SharedCache:
+    """Süreçler arası paylaşılan anahtar/değer önbelleği."""
+
+    def __init__(self, path: str | Path, max_bytes: int | None = 128 * 1024 * 1024,
+                 clock: Callable[[], float] = time.time):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # fork sonrası ebeveynden gelen bağlantı kullanılmaz
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("pragma journal_mode=wal")
+            connection.execute("pragma synchronous=normal")
+            connection.executescript(_SCHEMA)
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = self._clock()
+        row = self._connection().execute(
+            "select value, expires_at, accessed_at from entries where key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return default
+        value, expires_at, accessed_at = row
+        if expires_at is not None and expires_at <= now:
+            return default
+        if now - accessed_at > _TOUCH_INTERVAL:
+            self._connection().execute("update entries set accessed_at = ? where key = ?", (now, key))
+        return pickle.loads(value)
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items: dict[str, Any], ttl: float | None = None) -> None:
+        """Kayıtları tek transaction içinde yazar."""
+        now = self._clock()
+        expires_at = now + ttl if ttl is not None else None
+        rows = []
+        for key, value in items.items():
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((key, blob, len(blob), expires_at, now))
+
+        connection = self._connection()
+        with _transaction(connection):
+            # `insert or replace` silme tetikleyicisini çalıştırmaz; upsert boyutu günceller
+            connection.executemany(
+                "insert into entries (key, value, size, expires_at, accessed_at) values (?, ?, ?, ?, ?) "
+                "on conflict (key) do update set value = excluded.value, size = excluded.size, "
+                "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at",
+                rows,
+            )
+            self._evict(connection, now)
+
+    def add(self, key: str, value: Any, ttl: float | None = None) -> bool:
+        """Anahtar yoksa (veya süresi dolmuşsa) yazar; yazıldıysa True."""
+        now = self._clock()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        connection = self._connection()
+        with _transaction(connection):
+            connection.execute(
+                "delete from entries where key = ? and expires_at is not null and expires_at <= ?", (key, now)
+            )
+            cursor = connection.execute(
+                "insert or ignore into entries (key, value, size, expires_at, accessed_at) values (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + ttl if ttl is not None else None, now),
+            )
+            if cursor.rowcount:
+                self._evict(connection, now)
+        return bool(cursor.rowcount)
+
+    def get_or_set(self, key: str, loader: Callable[[], Any], ttl: float | None = None) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value, ttl)
+        return value
+
+    def delete(self, key: str) -> bool:
+        return bool(self._connection().execute("delete from entries where key = ?", (key,)).rowcount)
+
+    def delete_prefix(self, prefix: str) -> None:
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        self._connection().execute("delete from entries where key like ? escape '\\'", (escaped + "%",))
+
+    def clear(self) -> None:
+        self._connection().execute("delete from entries")
+
+    def stats(self) -> dict:
+        connection = self._connection()
+        count = connection.execute("select count(*) from entries").fetchone()[0]
+        total = connection.execute("select bytes from totals where id = 0").fetchone()[0]
+        return {"entries": count, "bytes": total, "max_bytes": self.max_bytes}
+
+    def _evict(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute("delete from entries where expires_at is not null and expires_at <= ?", (now,))
+        if self.max_bytes is None:
+            return
+        total = connection.execute("select bytes from totals where id = 0").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * _EVICT_TARGET)
+        doomed = []
+        for key, size in connection.execute("select key, size from entries order by accessed_at"):
+            if total <= target:
+                break
+            doomed.append((key,))
+            total -= size
+        connection.executemany("delete from entries where key = ?", doomed)
+
+
+@contextmanager
+def _transaction(connection: sqlite3.Connection):
+    """Autocommit bağlantıda `begin immediate` ... `commit` bloğu."""
+    connection.execute("begin immediate")
+    try:
+        yield
+    except BaseException:
+        connection.execute("rollback")
+        raise
+    connection.execute("commit")
+
+
+_shared_cache: SharedCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> SharedCache | None:
+    """Ayarlardaki dizin için paylaşılan önbelleği döndürür (kapalıysa None)."""
+    global _shared_cache
+    directory = getattr(settings, "PANEL_SHARED_CACHE_DIR", "")
+    if not directory:
+        return None
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = SharedCache(
+                    Path(directory) / "panel_cache.sqlite3",
+                    max_bytes=settings.PANEL_SHARED_CACHE_MAX_BYTES,
+                )
+    return _shared_cache
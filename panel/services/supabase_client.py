@@ -3,11 +3,17 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from supabase import create_client, Client
 from django.conf import settings
 
+from . import circuit_breaker
+from .circuit_breaker import CircuitBreakerClient
+from .coalescing import CoalescingClient
+
+if TYPE_CHECKING:
+    from supabase import Client
+
 
 class SupabaseClient:
     """Supabase client singleton sınıfı.
@@ -48,13 +54,28 @@ class SupabaseClient:
                 ".env dosyasında SUPABASE_SERVICE_ROLE_KEY değişkenini ayarlayın."
             )
         
+        # supabase paketi (~300 ms import) yalnızca ilk client oluşturulurken yüklenir
+        from supabase import ClientOptions, create_client
+
+        from .http_transport import create_http_client
+
         try:
-            self._client = create_client(supabase_url, supabase_key)
+            # Zaman aşımları isteğin deadline'ıyla sınırlanır (bkz. http_transport)
+            options = ClientOptions(httpx_client=create_http_client())
+            client = create_client(supabase_url, supabase_key, options=options)
         except Exception as e:
             raise ConnectionError(
                 f"Supabase client oluşturulamadı: {str(e)}. "
                 "Lütfen SUPABASE_URL ve SUPABASE_SERVICE_ROLE_KEY değerlerini kontrol edin."
             ) from e
+
+        # Supabase sağlıksızken tablo bazlı devre kesici hızlı hata / son veri döndürür
+        if getattr(settings, 'PANEL_CIRCUIT_BREAKER', True):
+            client = CircuitBreakerClient(client)
+        # Eşzamanlı aynı okumalar tek HTTP çağrısında birleştirilir
+        if getattr(settings, 'PANEL_COALESCE_READS', True):
+            client = CoalescingClient(client)
+        self._client = client
     
     def get_client(self) -> Client:
         """Supabase client instance'ını döndürür.
@@ -93,3 +114,18 @@ def get_supabase_client() -> Client:
     client_manager = SupabaseClient()
     return client_manager.get_client()
 
+
+def get_read_coalescing_metrics() -> dict:
+    """Okuma birleştirme sayaçlarını döndürür (katman kapalıysa boş dict)."""
+    instance = SupabaseClient._instance
+    client = instance._client if instance is not None else None
+    if isinstance(client, CoalescingClient):
+        return client.flight.metrics()
+    return {}
+
+
+def get_circuit_breaker_metrics() -> dict:
+    """Tablo bazlı devre kesici durumu ve sayaçları (kesici kapalıysa boş dict)."""
+    if not getattr(settings, 'PANEL_CIRCUIT_BREAKER', True):
+        return {}
+    return circuit_breaker.get_breaker().metrics()
@@ -0,0 +1,186 @@
+"""Stale-while-revalidate önbellek.
+
+Okuma ağırlıklı paneller (dashboard, çalışma takvimi) birkaç saniyelik eski
+veriye tolerans gösterebilir. Bir anahtar için:
+
+- yaş < soft TTL: önbellekteki değer döner;
+- soft TTL <= yaş < hard TTL: eski değer hemen döner ve arka planda tek bir
+  yenileme başlatılır;
+- yaş >= hard TTL veya kayıt yoksa: istek yüklemeyi bekler.
+
+Aynı anahtar için aynı anda yalnızca bir yükleme çalışır (single-flight);
+bekleyen istekler o yüklemenin sonucunu paylaşır. Asenkron view'lar `aget` ile
+aynı kayıtları kullanır; yükleme event loop'u bloklamadan beklenir.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    stored_at: float
+
+
+def _spawn_thread(target: Callable[[], None]) -> None:
+    threading.Thread(target=target, daemon=True, name="panel-swr-refresh").start()
+
+
+class StaleWhileRevalidateCache:
+    """Süreç içi, thread-safe stale-while-revalidate önbellek."""
+
+    def __init__(
+        self,
+        soft_ttl: float,
+        hard_ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+        spawn: Callable[[Callable[[], None]], None] = _spawn_thread,
+    ):
+        if hard_ttl < soft_ttl:
+            raise ValueError("hard_ttl, soft_ttl değerinden küçük olamaz")
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self._clock = clock
+        self._spawn = spawn
+        self._lock = threading.Lock()
+        self._entries: dict[Hashable, _Entry] = {}
+        self._inflight: dict[Hashable, Future] = {}
+        # Geçersiz kılma sırasında sürmekte olan yüklemeler sonucu yazmasın diye
+        self._generation = 0
+        # Arka plan yenileme task'ları tamamlanana kadar referansları tutulur
+        self._tasks: set[asyncio.Task] = set()
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Anahtarın değerini döndürür; gerekirse loader ile yükler veya yeniler."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.stored_at < self.hard_ttl:
+                if now - entry.stored_at >= self.soft_ttl and key not in self._inflight:
+                    future = self._inflight[key] = Future()
+                    generation = self._generation
+                    self._spawn(lambda: self._load(key, loader, future, generation, background=True))
+                return entry.value
+
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                generation = self._generation
+
+        if leader:
+            self._load(key, loader, future, generation)
+        return future.result()
+
+    async def aget(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """`get`'in asenkron karşılığı; loader bir coroutine fonksiyonudur.
+
+        Arka plan yenilemesi event loop'ta bir task olarak çalışır. Senkron ve
+        asenkron istekler aynı anahtarda aynı yüklemeyi paylaşır.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.stored_at < self.hard_ttl:
+                if now - entry.stored_at >= self.soft_ttl and key not in self._inflight:
+                    future = self._inflight[key] = Future()
+                    # Yenileme, onu tetikleyen isteğin context'ini (deadline) devralmaz
+                    task = asyncio.get_running_loop().create_task(
+                        self._aload(key, loader, future, self._generation, background=True),
+                        context=contextvars.Context(),
+                    )
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                return entry.value
+
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                generation = self._generation
+
+        if leader:
+            await self._aload(key, loader, future, generation)
+        return await asyncio.wrap_future(future)
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Son yüklenen değeri TTL'e bakmadan döndürür; yükleme başlatmaz.
+
+        Backend yanıt vermediğinde kısmi render için kullanılır. Geçersiz
+        kılınan kayıtlar için `default` döner.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        return default if entry is None else entry.value
+
+    def invalidate(self, predicate: Callable[[Hashable], bool] | None = None) -> None:
+        """Koşulu sağlayan (verilmezse tüm) anahtarları siler."""
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if predicate is None or predicate(key)]:
+                del self._entries[key]
+            for key in [key for key in self._inflight if predicate is None or predicate(key)]:
+                # Sürmekte olan yükleme bekleyenlerine yine sonuç verir, fakat önbelleğe yazmaz
+                del self._inflight[key]
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], future: Future, generation: int,
+              background: bool = False) -> None:
+        try:
+            value = loader()
+        except BaseException as exc:
+            self._fail(key, future, exc, background)
+            return
+        self._store(key, value, future, generation)
+
+    async def _aload(self, key: Hashable, loader: Callable[[], Awaitable[Any]], future: Future,
+                     generation: int, background: bool = False) -> None:
+        try:
+            value = await loader()
+        except BaseException as exc:
+            self._fail(key, future, exc, background)
+            return
+        self._store(key, value, future, generation)
+
+    def _fail(self, key: Hashable, future: Future, exc: BaseException, background: bool) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        if background:
+            # Eski değer hard TTL dolana kadar sunulmaya devam eder
+            logger.warning("Önbellek yenilemesi başarısız (%s): %s", key, exc)
+        future.set_exception(exc)
+
+    def _store(self, key: Hashable, value: Any, future: Future, generation: int) -> None:
+        with self._lock:
+            if self._generation == generation:
+                self._entries[key] = _Entry(value, self._clock())
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        future.set_result(value)
+
+
+panel_cache = StaleWhileRevalidateCache(
+    soft_ttl=settings.PANEL_CACHE_SOFT_TTL,
+    hard_ttl=settings.PANEL_CACHE_HARD_TTL,
+)
+
+
+def invalidate_hospital(hospital_id: str) -> None:
+    """Bir hastaneye ait tüm önbellek kayıtlarını siler.
+
+    Anahtarlar (ad, hospital_id, ...) biçimindedir.
+    """
+    panel_cache.invalidate(lambda key: len(key) > 1 and key[1] == hospital_id)
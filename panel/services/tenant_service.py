@@ -0,0 +1,97 @@
+"""Session'da saklanan hastane özeti.
+
+Ana şablon (başlık, yan menü, üst çubuk) hastanenin yalnızca birkaç alanını
+kullanır. Bu alanlar girişte ve sonrasında sürüm değiştiğinde session'a
+yazılır; sayfalar arasında ana şablon backend'e gitmeden render edilir.
+
+Özet, oluşturulduğu `hospitals` veri sürümünü (data_version) ve şema
+numarasını taşır. Hastane güncellendiğinde sürüm değişir ve bir sonraki
+istekte özet tek bir küçük sorguyla yenilenir. Paylaşılan önbellek kapalıyken
+sürümler süreç içidir ve diğer worker'lardaki yazmaları görmez; bu durumda
+özet en fazla PANEL_TENANT_SNAPSHOT_MAX_AGE saniye kullanılır.
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+
+from . import data_version
+from .circuit_breaker import BACKEND_UNAVAILABLE
+from .supabase_client import get_supabase_client
+
+SESSION_KEY = "tenant"
+# Özetin alanları değiştiğinde artırılır; eski session'lar yeniden oluşturulur
+SNAPSHOT_SCHEMA = 1
+SNAPSHOT_COLUMNS = "id, name, image, status, is_open_24_hours, updated_at"
+
+
+def snapshot_from_row(row: dict, version: str) -> dict:
+    """Supabase hastane satırından session'a yazılacak özeti oluşturur."""
+    return {
+        "schema": SNAPSHOT_SCHEMA,
+        "version": version,
+        "id": str(row.get("id", "")),
+        "name": row.get("name", ""),
+        "image": row.get("image"),
+        "status": row.get("status"),
+        "is_open_24_hours": bool(row.get("is_open_24_hours", False)),
+        "updatedAt": row.get("updated_at", ""),
+        "storedAt": time.time(),
+    }
+
+
+def store_snapshot(request, row: dict) -> dict:
+    """Satırı güncel sürümle session'a yazar ve özeti döndürür."""
+    hospital_id = str(row.get("id", ""))
+    snapshot = snapshot_from_row(row, data_version.get_version(hospital_id, "hospitals"))
+    request.session[SESSION_KEY] = snapshot
+    return snapshot
+
+
+def get_snapshot(request) -> dict | None:
+    """Session'daki güncel özeti döndürür; yoksa veya eskiyse yeniler.
+
+    Oturumda hastane yoksa None döner ve backend'e gidilmez. Yenileme isteğin
+    süresi içinde tamamlanmazsa eski özet döner.
+    """
+    session = getattr(request, "session", None)
+    hospital_id = session.get("hospital_id") if session is not None else None
+    if not hospital_id:
+        return None
+
+    snapshot = session.get(SESSION_KEY)
+    if (
+        snapshot
+        and snapshot.get("schema") == SNAPSHOT_SCHEMA
+        and snapshot.get("id") == hospital_id
+        and snapshot.get("version") == data_version.get_version(hospital_id, "hospitals")
+        and (
+            data_version.is_shared()
+            or time.time() - snapshot.get("storedAt", 0) < settings.PANEL_TENANT_SNAPSHOT_MAX_AGE
+        )
+    ):
+        return snapshot
+
+    # Sürüm sorgudan önce okunur: sorgu sırasında gelen bir yazma özeti eski bırakmaz
+    version = data_version.get_version(hospital_id, "hospitals")
+    try:
+        result = (
+            get_supabase_client()
+            .table("hospitals")
+            .select(SNAPSHOT_COLUMNS)
+            .eq("id", hospital_id)
+            .limit(1)
+            .execute()
+        )
+    except BACKEND_UNAVAILABLE:
+        # Backend yanıt vermedi: aynı hastanenin eski özeti ana şablon için yeterli
+        if snapshot and snapshot.get("id") == hospital_id:
+            return snapshot
+        raise
+    if not result.data:
+        raise ValueError("Hastane bulunamadı")
+    snapshot = snapshot_from_row(result.data[0], version)
+    session[SESSION_KEY] = snapshot
+    return snapshot
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from .async_client import arows, get_async_client
+from .records import UserRecord
 from .supabase_client import get_supabase_client
 
 
@@ -22,15 +24,12 @@ def get_user_map() -> dict[str, dict]:
     return {user["id"]: user for user in users}
 
 
-def _format_user_from_db(db_user: dict) -> dict:
+async def aget_user_map() -> dict[str, dict]:
+    """`get_user_map`'in asenkron karşılığı."""
+    rows = await arows(get_async_client().table("user_profiles").select("*"))
+    return {user["id"]: user for user in map(_format_user_from_db, rows)}
+
+
+def _format_user_from_db(db_user: dict) -> UserRecord:
     """Supabase'den gelen kullanıcı verisini mevcut formata çevirir."""
-    return {
-        "id": str(db_user.get("id", "")),
-        "email": db_user.get("email", ""),  # auth.users'dan alınacak
-        "password": "",  # Şifre gösterilmez
-        "name": db_user.get("name", ""),
-        "surname": db_user.get("surname", ""),
-        "phone": db_user.get("phone", ""),
-        "profileImage": db_user.get("profile_image"),
-        "createdAt": db_user.get("created_at", ""),
-    }
+    return UserRecord(db_user)
@@ -0,0 +1,32 @@
+/**
+ * Dashboard JavaScript
+ * Sayfa iskeleti hemen render edilir; her widget kendi endpoint'inden
+ * paralel olarak yüklenir (data-widget-url).
+ */
+
+(function () {
+    'use strict';
+
+    function loadWidget(container) {
+        return fetch(container.dataset.widgetUrl, {
+            credentials: 'same-origin',
+            headers: { 'X-Requested-With': 'XMLHttpRequest' },
+        })
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error(response.status);
+                }
+                return response.text();
+            })
+            .then(function (html) {
+                container.innerHTML = html;
+            })
+            .catch(function () {
+                container.innerHTML = '<p class="empty-state">Veri yüklenemedi.</p>';
+            });
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('[data-widget-url]').forEach(loadWidget);
+    });
+})();
@@ -179,3 +179,129 @@ class AppointmentBlockingTests(TestCase):
         )
 
 
+
+    @patch("panel.services.appointment_service._get_active_hospital_id", return_value="hospital-1")
+    @patch("panel.services.appointment_service.get_supabase_client")
+    def test_are_appointment_times_blocked_uses_one_ranged_query(self, mock_get_client, _):
+        query = _build_query(
+            [
+                {"date": "2024-04-01", "is_full_day": False, "start_time": "09:00", "end_time": "11:00"},
+                {"date": "2024-04-01", "is_full_day": False, "start_time": "14:00", "end_time": "15:00"},
+                {"date": "2024-04-03", "is_full_day": True, "start_time": None, "end_time": None},
+            ]
+        )
+        mock_supabase = MagicMock()
+        mock_supabase.table.return_value = query
+        mock_get_client.return_value = mock_supabase
+
+        result = appointment_service.are_appointment_times_blocked(
+            [
+                (date(2024, 4, 3), "10:00"),
+                (date(2024, 4, 1), "11:00"),
+                (date(2024, 4, 1), "12:00"),
+                (date(2024, 4, 1), "14:30"),
+                (date(2024, 4, 2), "10:00"),
+                (date(2024, 4, 1), "invalid"),
+            ],
+            request=object(),
+        )
+
+        self.assertEqual(result, [True, True, False, True, False, False])
+        query.gte.assert_called_once_with("date", "2024-04-01")
+        query.lte.assert_called_once_with("date", "2024-04-03")
+        query.execute.assert_called_once()
+
+
+def _appointment(appointment_id, doctor_id, day, time_str, status="planned"):
+    return {"id": appointment_id, "doctorId": doctor_id, "date": day, "time": time_str, "status": status}
+
+
+class BookingIndexTests(TestCase):
+    def test_conflicts_detects_overlapping_slots_for_same_doctor(self):
+        index = appointment_service.BookingIndex(
+            [
+                _appointment("a1", "doc-1", "2024-05-06", "09:00"),
+                _appointment("a2", "doc-1", "2024-05-06", "10:00"),
+                _appointment("a3", "doc-2", "2024-05-06", "09:30"),
+                _appointment("a4", "doc-1", "2024-05-06", "09:30", status="cancelled"),
+            ]
+        )
+
+        self.assertEqual(index.conflicts("doc-1", "2024-05-06", "09:15"), ["a1"])
+        self.assertEqual(index.conflicts("doc-1", "2024-05-06", "09:30"), [])
+        self.assertEqual(index.conflicts("doc-1", "2024-05-06", "10:00", exclude_id="a2"), [])
+        self.assertEqual(index.conflicts("doc-1", "2024-05-07", "09:00"), [])
+
+    def test_find_all_conflicts_groups_double_bookings(self):
+        index = appointment_service.BookingIndex(
+            [
+                _appointment("a1", "doc-1", "2024-05-06", "09:00"),
+                _appointment("a2", "doc-1", "2024-05-06", "09:00"),
+                _appointment("a3", "doc-1", "2024-05-06", "09:15"),
+                _appointment("a4", "doc-1", "2024-05-06", "11:00"),
+            ]
+        )
+
+        self.assertEqual(
+            index.find_all_conflicts(),
+            [{"doctorId": "doc-1", "date": "2024-05-06", "time": "09:00", "appointmentIds": ["a1", "a2", "a3"]}],
+        )
+
+    @patch("panel.services.appointment_service.is_appointment_time_blocked", return_value=False)
+    @patch("panel.services.appointment_service.get_supabase_client")
+    def test_reschedule_appointment_rejects_taken_slot_and_updates_index(self, mock_get_client, _):
+        query = _build_query([{"id": "a2", "doctor_id": "doc-1", "date": "2024-05-06", "time": "11:00"}])
+        mock_get_client.return_value.table.return_value = query
+        index = appointment_service.BookingIndex(
+            [
+                _appointment("a1", "doc-1", "2024-05-06", "09:00"),
+                _appointment("a2", "doc-1", "2024-05-06", "10:00"),
+            ]
+        )
+
+        with self.assertRaises(appointment_service.AppointmentConflictError):
+            appointment_service.reschedule_appointment("a2", date(2024, 5, 6), "09:00", booking_index=index)
+        query.update.assert_not_called()
+
+        appointment_service.reschedule_appointment("a2", date(2024, 5, 6), "11:00", booking_index=index)
+
+        query.update.assert_called_once_with({"date": "2024-05-06", "time": "11:00"})
+        self.assertEqual(index.conflicts("doc-1", "2024-05-06", "10:00"), [])
+        self.assertEqual(index.conflicts("doc-1", "2024-05-06", "11:00"), ["a2"])
+
+
+class UpdateAppointmentSlotTests(TestCase):
+    """update_appointment tarih/saat değişikliklerini kontrol etmeden yazmaz."""
+
+    def setUp(self):
+        patcher = patch("panel.services.appointment_service.get_supabase_client")
+        self.client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.tables = {"appointments": _build_query([]), "holidays": _build_query([])}
+        self.client.table.side_effect = self.tables.__getitem__
+        # İlk sorgu taşınan randevuyu (a2), ikincisi doktorun o günkü randevularını döndürür
+        self.tables["appointments"].execute.side_effect = [
+            SimpleNamespace(data=[{"id": "a2", "doctor_id": "doc-1", "date": "2024-05-06", "time": "10:00"}]),
+            SimpleNamespace(data=[
+                {"id": "a1", "doctor_id": "doc-1", "date": "2024-05-06", "time": "09:00", "status": "planned"},
+                {"id": "a2", "doctor_id": "doc-1", "date": "2024-05-06", "time": "10:00", "status": "planned"},
+            ]),
+        ]
+
+    @patch("panel.services.appointment_service._get_active_hospital_id", return_value="hospital-1")
+    def test_time_change_into_taken_slot_is_rejected(self, _):
+        with self.assertRaises(appointment_service.AppointmentConflictError):
+            appointment_service.update_appointment("a2", time="09:15")
+
+        self.tables["appointments"].update.assert_not_called()
+
+    @patch("panel.services.appointment_service._get_active_hospital_id", return_value="hospital-1")
+    def test_time_change_into_holiday_is_rejected(self, _):
+        self.tables["holidays"].execute.return_value = SimpleNamespace(
+            data=[{"date": "2024-05-07", "is_full_day": True}]
+        )
+
+        with self.assertRaises(appointment_service.AppointmentConflictError):
+            appointment_service.update_appointment("a2", date=date(2024, 5, 7))
+
+        self.tables["appointments"].update.assert_not_called()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+
+from panel.forms import AppointmentStatusForm
+from panel.views.appointment_views import AppointmentManagementView, AppointmentRow
+
+DOCTORS = [{"id": "d1", "name": "Ayşe", "surname": "Yılmaz"}]
+SERVICES = [{"id": "s1", "name": "Dolgu"}]
+USERS = {"u1": {"name": "Ali", "surname": "Kaya"}}
+
+
+def appointment(index: int, day: date, status: str = "planned") -> dict:
+    return {
+        "id": f"a{index}", "doctorId": "d1", "service": "s1", "userId": "u1",
+        "status": status, "date": day.isoformat(), "time": "10:00",
+    }
+
+
+class AppointmentRowsTests(TestCase):
+    def setUp(self):
+        today = date.today()
+        self.past = appointment(1, today - timedelta(days=3), "completed")
+        self.cancelled = appointment(2, today + timedelta(days=1), "cancelled")
+        self.later = appointment(3, today + timedelta(days=5))
+        self.sooner = appointment(4, today + timedelta(days=2))
+        self.view = AppointmentManagementView()
+
+    def test_rows_are_ordered_upcoming_cancelled_then_past(self):
+        ordered = self.view._sort_appointments([self.past, self.cancelled, self.later, self.sooner])
+
+        self.assertEqual([apt["id"] for apt, _, _ in ordered], ["a4", "a3", "a2", "a1"])
+        self.assertEqual([status for _, status, _ in ordered], ["planned", "planned", "cancelled", "completed"])
+
+    def test_only_the_current_page_is_enriched(self):
+        appointments = [appointment(index, date.today() + timedelta(days=index + 1)) for index in range(25)]
+        request = RequestFactory().get("/appointments/", {"page": "3"})
+        form, filters = self.view._filter_form(request, DOCTORS, SERVICES)
+
+        with patch("panel.views.appointment_views.format_date", return_value="01.01.2030") as format_date:
+            context = self.view._assemble_context(
+                request, form, filters, appointments, DOCTORS, SERVICES, USERS, {}
+            )
+
+        rows = list(context["appointments"])
+        self.assertEqual(format_date.call_count, 5)
+        self.assertEqual([row.data["id"] for row in rows], ["a20", "a21", "a22", "a23", "a24"])
+        self.assertIsInstance(rows[0], AppointmentRow)
+        self.assertEqual((rows[0].patient, rows[0].doctor, rows[0].service), ("Ali Kaya", "Ayşe Yılmaz", "Dolgu"))
+        self.assertEqual((rows[0].status_label, rows[0].status_class), ("Planlandı", "planned"))
+        self.assertEqual(context["paginator"].count, 25)
+
+    def test_status_include_selects_current_status(self):
+        html = render_to_string(
+            "panel/includes/appointment_status_form.html",
+            {"appointment": self.cancelled, "status_choices": AppointmentStatusForm.base_fields["status"].choices},
+        )
+
+        self.assertIn('id="id_status_a2"', html)
+        self.assertIn('<option value="cancelled" selected>', html)
+        self.assertIn('name="appointment_id" value="a2"', html)
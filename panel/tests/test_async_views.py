@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.core.cache import caches
+from django.test import RequestFactory
+
+from panel.services import dashboard_service, tenant_service
+from panel.views import async_views
+
+TODAY = date.today()
+TABLES = {
+    "hospitals": [{"id": "h1", "name": "Merkez", "status": "approved", "working_hours": {}, "is_open_24_hours": True}],
+    "doctors": [{"id": "d1", "hospital_id": "h1", "name": "Ayşe", "surname": "Yılmaz", "working_hours": {}}],
+    "services": [{"id": "s1", "name": "Dolgu"}],
+    "user_profiles": [{"id": "u1", "name": "Ali", "surname": "Kaya"}],
+    "appointments": [
+        {"id": "a1", "hospital_id": "h1", "doctor_id": "d1", "service_id": "s1", "user_id": "u1",
+         "date": (TODAY + timedelta(days=1)).isoformat(), "time": "10:00", "status": "planned"},
+    ],
+    "reviews": [
+        {"id": "r1", "hospital_id": "h1", "doctor_id": "d1", "user_id": "u1", "comment": "Çok ilgililer",
+         "created_at": "2024-06-01T10:00:00+00:00"},
+    ],
+    "ratings": [{"id": "t1", "hospital_id": "h1", "doctor_id": "d1", "user_id": "u1",
+                 "doctor_rating": 5, "hospital_rating": 4}],
+    "holidays": [],
+}
+
+
+class FakeAsyncClient:
+    """Tabloları bellekten döndüren async PostgREST client'ı; yalnızca `eq` filtreleri uygulanır."""
+
+    def __init__(self, tables: dict[str, list[dict]]):
+        self.tables = tables
+        self.queried = []
+
+    def table(self, name):
+        self.queried.append(name)
+        return FakeAsyncQuery(self.tables.get(name, []))
+
+
+class FakeAsyncQuery:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def eq(self, column, value):
+        return FakeAsyncQuery([row for row in self.rows if str(row.get(column)) == str(value)])
+
+    def __getattr__(self, name):
+        if name == "not_":
+            return self
+        return lambda *args, **kwargs: self
+
+    async def execute(self):
+        await asyncio.sleep(0)
+        return SimpleNamespace(data=[dict(row) for row in self.rows])
+
+
+def make_request(path: str, logged_in: bool = True, **params):
+    request = RequestFactory().get(path, params)
+    request.session = SessionStore()
+    if logged_in:
+        request.session.update({"user_id": "u1", "hospital_id": "h1"})
+    request._messages = FallbackStorage(request)
+    return request
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        dashboard_service.panel_cache.invalidate()
+        self.addCleanup(dashboard_service.panel_cache.invalidate)
+        caches["fragments"].clear()
+        self.client = FakeAsyncClient(TABLES)
+        for target, kwargs in (
+            ("panel.services.async_client._create_client", {"return_value": self.client}),
+            # Senkron Supabase çağrısı yapılmamalı
+            ("panel.services.supabase_client.get_supabase_client", {"side_effect": AssertionError("senkron sorgu")}),
+            ("panel.services.dashboard_service.get_supabase_client", {"side_effect": AssertionError("senkron sorgu")}),
+            ("panel.services.schedule_service.get_supabase_client", {"side_effect": AssertionError("senkron sorgu")}),
+            ("panel.services.tenant_service.get_supabase_client", {"side_effect": AssertionError("senkron sorgu")}),
+        ):
+            patcher = patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def render(self, view, request, *args):
+        # Ana şablon hastane özetini session'dan okur
+        tenant_service.store_snapshot(request, TABLES["hospitals"][0])
+        response = asyncio.run(view(request, *args))
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def test_appointment_management(self):
+        html = self.render(async_views.AsyncAppointmentManagementView.as_view(), make_request("/appointments/"))
+
+        self.assertIn("Ali Kaya", html)
+        self.assertIn("Dolgu", html)
+        self.assertIn("appointments", self.client.queried)
+
+    def test_review_management(self):
+        html = self.render(async_views.AsyncReviewManagementView.as_view(), make_request("/reviews/"))
+
+        self.assertIn("Çok ilgililer", html)
+        self.assertEqual(sorted({"reviews", "ratings"} & set(self.client.queried)), ["ratings", "reviews"])
+
+    def test_schedule_management(self):
+        request = make_request("/schedule/", year=str(TODAY.year), month=str(TODAY.month))
+
+        html = self.render(async_views.AsyncScheduleManagementView.as_view(), request)
+
+        self.assertIn("Ayşe", html)
+        self.assertIn("holidays", self.client.queried)
+
+    def test_inline_dashboard(self):
+        html = self.render(async_views.adashboard, make_request("/", inline="1"))
+
+        self.assertIn("Dolgu", html)
+        self.assertIn("hospitals", self.client.queried)
+
+    def test_login_required_redirects_anonymous_async_requests(self):
+        request = make_request("/", logged_in=False)
+
+        response = asyncio.run(async_views.adashboard(request))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.client.queried, [])
+        self.assertEqual([str(message) for message in request._messages], ["Lütfen giriş yapın."])
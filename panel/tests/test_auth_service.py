@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from panel.services import auth_service
+
+HOSPITAL = {"id": "h1", "name": "Merkez", "status": "approved", "created_by_user_id": "user-1"}
+
+
+class LoginTests(TestCase):
+    def setUp(self):
+        self.query = MagicMock()
+        for method in ("select", "eq", "limit"):
+            getattr(self.query, method).return_value = self.query
+        self.query.execute.return_value = SimpleNamespace(data=[dict(HOSPITAL)])
+        patcher = patch("panel.services.auth_service.get_supabase_client")
+        patcher.start().return_value.table.return_value = self.query
+        self.addCleanup(patcher.stop)
+
+        patcher = patch("panel.services.auth_service.sign_in", return_value={"user_id": "user-1"})
+        self.sign_in = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_single_hospital_query_and_auth_call(self):
+        hospital, auth_response = auth_service.login("H1", "a@b.c", "secret")
+
+        self.assertEqual(hospital["id"], "h1")
+        self.assertEqual(auth_response["user_id"], "user-1")
+        self.query.execute.assert_called_once_with()
+        self.query.select.assert_called_once_with(auth_service.LOGIN_HOSPITAL_COLUMNS)
+        self.sign_in.assert_called_once_with("a@b.c", "secret")
+
+    def test_auth_runs_while_hospital_query_is_in_flight(self):
+        auth_started = threading.Event()
+        self.sign_in.side_effect = lambda *args: auth_started.set() or {"user_id": "user-1"}
+
+        def slow_lookup():
+            # Auth çağrısı hastane sorgusu bitmeden başlamış olmalı
+            self.assertTrue(auth_started.wait(timeout=2))
+            return SimpleNamespace(data=[dict(HOSPITAL)])
+
+        self.query.execute.side_effect = slow_lookup
+
+        auth_service.login("H1", "a@b.c", "secret")
+
+    def test_unknown_hospital_code(self):
+        self.query.execute.return_value = SimpleNamespace(data=[])
+
+        with self.assertRaisesRegex(ValueError, "Geçersiz hastane kodu"):
+            auth_service.login("XX", "a@b.c", "secret")
+
+    def test_user_must_own_the_hospital(self):
+        self.sign_in.return_value = {"user_id": "user-2"}
+
+        with self.assertRaisesRegex(ValueError, "bu hastaneye ait değil"):
+            auth_service.login("H1", "a@b.c", "secret")
+
+
+class AuthClientPoolTests(TestCase):
+    def test_clients_are_reused_up_to_pool_size(self):
+        factory = MagicMock(side_effect=lambda: MagicMock())
+        pool = auth_service.AuthClientPool(factory, size=1)
+
+        with pool.client() as first:
+            with pool.client() as second:
+                self.assertIsNot(first, second)
+        with pool.client() as third:
+            pass
+
+        self.assertEqual(factory.call_count, 2)
+        self.assertIn(third, (first, second))
+
+    def test_client_that_cannot_be_reset_is_not_reused(self):
+        factory = MagicMock(side_effect=lambda: MagicMock())
+        pool = auth_service.AuthClientPool(factory, size=1, reset=MagicMock(side_effect=RuntimeError))
+
+        with self.assertLogs("panel.services.auth_service", level="ERROR"):
+            with pool.client() as first:
+                pass
+        with pool.client() as second:
+            self.assertIsNot(first, second)
+
+    def test_clear_session_works_with_the_installed_auth_client(self):
+        from supabase import ClientOptions, create_client
+
+        client = create_client(
+            "http://localhost:1", "anon-key", options=ClientOptions(auto_refresh_token=False, persist_session=False)
+        )
+        # Havuz hataları yutar; iç metotlar yeniden adlandırılırsa burada doğrudan hata alınır
+        auth_service.clear_session(client)
+
+        self.assertIsNone(client.auth.get_session())
+        self.assertEqual(client.options.headers["Authorization"], "Bearer anon-key")
+
+    def test_returned_client_does_not_keep_the_previous_session(self):
+        from supabase import ClientOptions, create_client
+
+        client = create_client(
+            "http://localhost:1", "anon-key", options=ClientOptions(auto_refresh_token=False, persist_session=False)
+        )
+        # Auth paketinin adı sürümler arasında değişti (gotrue -> supabase_auth); yalnızca
+        # client'ın okuduğu alanlar verilir
+        session = SimpleNamespace(
+            access_token="user-token", refresh_token="r", expires_in=3600, expires_at=int(time.time()) + 3600, user=None
+        )
+        pool = auth_service.AuthClientPool(MagicMock(return_value=client), size=1)
+
+        with pool.client() as used:
+            # sign_in_with_password'ün yaptığı gibi oturum kaydedilir
+            used.auth._save_session(session)
+            used.auth._notify_all_subscribers("SIGNED_IN", session)
+            self.assertEqual(used.options.headers["Authorization"], "Bearer user-token")
+
+        with pool.client() as reused:
+            self.assertIs(reused, client)
+            self.assertIsNone(reused.auth.get_session())
+            self.assertEqual(reused.options.headers["Authorization"], "Bearer anon-key")
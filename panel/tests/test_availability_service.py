@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from unittest import TestCase
+
+from panel.services import availability_service
+
+MONDAY = date(2024, 6, 3)
+
+
+def _hours(start, end):
+    return {"monday": {"isAvailable": True, "start": start, "end": end}}
+
+
+class ComputeFreeSlotsTests(TestCase):
+    def _compute(self, holidays=(), appointments=(), doctors=None, **kwargs):
+        hospital = {"workingHours": _hours("08:00", "18:00"), "is_open_24_hours": False}
+        doctors = doctors or [{"id": "doc-1", "isActive": True, "workingHours": _hours("09:00", "12:00")}]
+        data = availability_service.build_availability_data(hospital, doctors, list(holidays), list(appointments))
+        return availability_service.compute_free_slots(data, MONDAY, MONDAY, **kwargs)
+
+    def test_slots_follow_doctor_hours_within_hospital_hours(self):
+        result = self._compute()
+
+        self.assertEqual(
+            result["doc-1"]["2024-06-03"],
+            ["09:00", "09:30", "10:00", "10:30", "11:00", "11:30"],
+        )
+
+    def test_booked_and_partial_holiday_slots_are_removed(self):
+        result = self._compute(
+            holidays=[{"doctor_id": None, "date": "2024-06-03", "is_full_day": False,
+                       "start_time": "10:00", "end_time": "10:30"}],
+            appointments=[
+                {"doctor_id": "doc-1", "date": "2024-06-03", "time": "09:00", "status": "planned"},
+                {"doctor_id": "doc-1", "date": "2024-06-03", "time": "11:30", "status": "cancelled"},
+            ],
+        )
+
+        # The holiday end minute is blocked too, matching is_appointment_time_blocked
+        self.assertEqual(result["doc-1"]["2024-06-03"], ["09:30", "11:00", "11:30"])
+
+    def test_full_day_doctor_holiday_and_inactive_doctor(self):
+        doctors = [
+            {"id": "doc-1", "isActive": True, "workingHours": _hours("09:00", "12:00")},
+            {"id": "doc-2", "isActive": False, "workingHours": _hours("09:00", "12:00")},
+        ]
+        result = self._compute(
+            holidays=[{"doctor_id": "doc-1", "date": "2024-06-03", "is_full_day": True}],
+            doctors=doctors,
+        )
+
+        self.assertEqual(result, {"doc-1": {"2024-06-03": []}})
+
+    def test_not_before_skips_past_slots(self):
+        result = self._compute(not_before=datetime(2024, 6, 3, 10, 10))
+
+        self.assertEqual(result["doc-1"]["2024-06-03"], ["10:30", "11:00", "11:30"])
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.contrib.sessions.backends.cache import SessionStore
+
+from panel.cache_backend import SharedSQLiteCache
+
+
+class SharedSQLiteCacheTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.location = str(Path(directory.name) / "sessions.sqlite3")
+        self.cache = SharedSQLiteCache(self.location, {})
+
+    def test_add_only_writes_missing_keys(self):
+        self.assertTrue(self.cache.add("key", 1))
+        self.assertFalse(self.cache.add("key", 2))
+        self.assertEqual(self.cache.get("key"), 1)
+
+    def test_expired_entries_are_missing(self):
+        with patch("time.time", return_value=1000.0):
+            self.cache.set("key", "value", timeout=10)
+        self.cache._cache._clock = lambda: 1011.0
+
+        self.assertFalse(self.cache.has_key("key"))
+        self.assertTrue(self.cache.add("key", "new"))
+
+    def test_sessions_are_shared_between_cache_instances(self):
+        other_worker = SharedSQLiteCache(self.location, {})
+        with patch("django.contrib.sessions.backends.cache.caches", {"sessions": self.cache}):
+            session = SessionStore()
+            session["hospital_id"] = "h1"
+            session.save()
+
+        with patch("django.contrib.sessions.backends.cache.caches", {"sessions": other_worker}):
+            loaded = SessionStore(session_key=session.session_key)
+
+            self.assertEqual(loaded["hospital_id"], "h1")
+
+            loaded.delete()
+        self.assertIsNone(self.cache.get(f"{SessionStore.cache_key_prefix}{session.session_key}"))
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from panel.services import cache_invalidation
+from panel.services.cache_invalidation import (
+    ChangeEvent,
+    InvalidationListener,
+    LocalChangeSource,
+    PollingChangeSource,
+)
+from panel.services.swr_cache import StaleWhileRevalidateCache
+
+
+class InvalidationListenerTests(TestCase):
+    def setUp(self):
+        self.cache = StaleWhileRevalidateCache(soft_ttl=60, hard_ttl=600, spawn=lambda fn: None)
+        for target in ("panel.services.swr_cache.panel_cache", "panel.services.cache_invalidation.panel_cache"):
+            patcher = patch(target, self.cache)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch("panel.services.cache_invalidation.invalidate_services_cache")
+        self.invalidate_services = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("panel.services.cache_invalidation.data_version")
+        self.data_version = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.source = LocalChangeSource()
+        self.listener = InvalidationListener(self.source)
+        self.listener.start()
+        for hospital_id in ("h1", "h2"):
+            self.cache.get(("dashboard", hospital_id), lambda: "cached")
+
+    def _cached_keys(self):
+        return set(self.cache._entries)
+
+    def test_change_evicts_only_matching_tenant(self):
+        self.source.emit("appointments", {"id": 5, "hospital_id": "h1"}, "INSERT")
+
+        self.assertEqual(self._cached_keys(), {("dashboard", "h2")})
+        self.assertEqual(self.listener.events_seen, 1)
+        self.data_version.bump.assert_called_once_with("h1", "appointments")
+
+    def test_hospital_rows_use_their_own_id(self):
+        self.source.emit("hospitals", {"id": "h2", "name": "Yeni"})
+
+        self.assertEqual(self._cached_keys(), {("dashboard", "h1")})
+
+    def test_services_and_pk_only_deletes_evict_everything(self):
+        self.source.emit("holidays", {"id": 9}, "DELETE")
+        self.assertEqual(self._cached_keys(), set())
+
+        self.cache.get(("dashboard", "h1"), lambda: "cached")
+        self.source.emit("services", {"id": 1, "name": "Dolgu"})
+        self.assertEqual(self._cached_keys(), set())
+        self.invalidate_services.assert_called_once_with()
+
+    def test_unwatched_tables_and_stopped_source_are_ignored(self):
+        self.source.emit("ratings", {"id": 1, "hospital_id": "h1"})
+        self.listener.stop()
+        self.source.emit("doctors", {"id": 1, "hospital_id": "h1"})
+
+        self.assertEqual(len(self._cached_keys()), 2)
+        self.assertEqual(self.listener.events_seen, 0)
+
+
+class PollingChangeSourceTests(TestCase):
+    def make_source(self, *results):
+        query = MagicMock()
+        for method in ("select", "gte", "order", "limit"):
+            setattr(query, method, MagicMock(return_value=query))
+        query.execute.side_effect = [SimpleNamespace(data=rows) for rows in results]
+        client = MagicMock()
+        client.table.return_value = query
+        return PollingChangeSource(lambda: client, tables=("doctors",), overlap=30), query
+
+    def test_poll_starts_from_database_timestamp_and_overlaps_window(self):
+        latest = {"id": 1, "updated_at": "2024-06-03T09:00:00.5+00:00"}
+        late = {"id": 2, "hospital_id": "h1", "updated_at": "2024-06-03T08:59:50+00:00"}
+        newer = {"id": 3, "hospital_id": "h2", "updated_at": "2024-06-03T09:00:01Z"}
+        source, query = self.make_source([latest], [dict(latest, hospital_id="h0"), late], [late, newer], [])
+        events = []
+
+        for _ in range(3):
+            source.poll_once(lambda payload: events.append(cache_invalidation.change_from_payload(payload)))
+
+        # Tohum satırı tekrar bildirilmez; geç commit edilen satır pencere sayesinde yakalanır
+        self.assertEqual(events, [
+            ChangeEvent(table="doctors", hospital_id="h1"),
+            ChangeEvent(table="doctors", hospital_id="h2"),
+        ])
+        self.assertEqual(query.gte.call_args_list[0].args, ("updated_at", "2024-06-03T08:59:30.500000+00:00"))
+        self.assertEqual(query.gte.call_args_list[2].args, ("updated_at", "2024-06-03T08:59:31+00:00"))
+
+    def test_empty_table_reports_every_new_row(self):
+        row = {"id": 1, "hospital_id": "h1", "updated_at": "2024-06-03T09:00:00+00:00"}
+        source, query = self.make_source([], [row])
+        events = []
+
+        source.poll_once(lambda payload: events.append(cache_invalidation.change_from_payload(payload)))
+
+        self.assertEqual(events, [ChangeEvent(table="doctors", hospital_id="h1")])
+        query.gte.assert_not_called()
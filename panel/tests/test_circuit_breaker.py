@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest import TestCase
+
+from django.test import RequestFactory
+from postgrest import AsyncPostgrestClient, SyncPostgrestClient
+from postgrest.exceptions import APIError
+
+from panel.benchmarks import _PostgrestStandIn
+from panel.middleware import DeadlineMiddleware
+from panel.services.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerClient,
+    CircuitOpen,
+    LastKnownGood,
+    is_backend_failure,
+)
+from panel.services.deadline import DeadlineExceeded, budget
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeBuilder:
+    """Zincirlenen sahte sorgu; execute sıradaki sonucu döndürür ya da fırlatır."""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        self.client.executions.append(self.table)
+        outcome = self.client.outcomes.pop(0) if self.client.outcomes else self.client.default
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+class FakeClient:
+    def __init__(self):
+        self.executions = []
+        self.outcomes = []
+        self.default = SimpleNamespace(data=[{"id": "fresh"}])
+
+    def table(self, name):
+        return FakeBuilder(self, name)
+
+
+def make_breaker(clock, **overrides) -> CircuitBreaker:
+    options = dict(window=30, min_calls=4, error_rate=0.5, slow_call=2, open_seconds=15)
+    options.update(overrides)
+    return CircuitBreaker(clock=clock, **options)
+
+
+class CircuitBreakerTests(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = make_breaker(self.clock)
+
+    def fail(self, table="doctors", times=1):
+        for _ in range(times):
+            self.assertTrue(self.breaker.allow(table))
+            self.breaker.record(table, 0.1, failed=True)
+
+    def test_opens_when_error_rate_reached_with_enough_calls(self):
+        self.fail(times=3)
+        self.assertEqual(self.breaker.state("doctors"), CLOSED)
+        self.breaker.allow("doctors")
+        self.breaker.record("doctors", 0.1, failed=False)
+        # 4 çağrının 3'ü hatalı (>= %50)
+        self.assertEqual(self.breaker.state("doctors"), OPEN)
+        self.assertFalse(self.breaker.allow("doctors"))
+        self.assertEqual(self.breaker.state("services"), CLOSED)
+
+    def test_old_outcomes_leave_the_window(self):
+        self.fail(times=3)
+        self.clock.now += 31
+        self.fail(times=1)
+        self.assertEqual(self.breaker.state("doctors"), CLOSED)
+
+    def test_slow_successes_count_against_the_circuit(self):
+        for _ in range(4):
+            self.breaker.allow("appointments")
+            self.breaker.record("appointments", 2.5, failed=False)
+        self.assertEqual(self.breaker.state("appointments"), OPEN)
+        self.assertEqual(self.breaker.metrics()["by_table"]["appointments"]["slow"], 4)
+
+    def test_half_open_allows_a_single_probe(self):
+        self.fail(times=4)
+        self.clock.now += 15
+        self.assertTrue(self.breaker.allow("doctors"))
+        self.assertEqual(self.breaker.state("doctors"), HALF_OPEN)
+        self.assertFalse(self.breaker.allow("doctors"))
+
+        self.breaker.record("doctors", 0.1, failed=False)
+        self.assertEqual(self.breaker.state("doctors"), CLOSED)
+        self.assertTrue(self.breaker.allow("doctors"))
+
+    def test_failed_probe_reopens_the_circuit(self):
+        self.fail(times=4)
+        self.clock.now += 15
+        self.fail(times=1)
+        self.assertEqual(self.breaker.state("doctors"), OPEN)
+        self.clock.now += 14
+        self.assertFalse(self.breaker.allow("doctors"))
+        metrics = self.breaker.metrics()
+        self.assertEqual(metrics["open"], ["doctors"])
+        self.assertEqual(metrics["by_table"]["doctors"]["opened"], 2)
+        self.assertEqual(metrics["by_table"]["doctors"]["rejected"], 1)
+
+    def test_backend_failures_are_classified(self):
+        self.assertTrue(is_backend_failure(DeadlineExceeded("süre doldu")))
+        self.assertTrue(is_backend_failure(ConnectionRefusedError()))
+        self.assertTrue(is_backend_failure(APIError({"message": "x", "code": 503})))
+        self.assertTrue(is_backend_failure(APIError({"message": "x", "code": "PGRST001"})))
+        self.assertFalse(is_backend_failure(APIError({"message": "x", "code": "23505"})))
+        self.assertFalse(is_backend_failure(APIError({"message": "x", "code": "PGRST116"})))
+        self.assertFalse(is_backend_failure(ValueError("geçersiz")))
+
+
+class CircuitBreakerClientTests(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = make_breaker(self.clock)
+        self.raw = FakeClient()
+        self.client = CircuitBreakerClient(
+            self.raw, self.breaker, LastKnownGood(8), fallback_tables=frozenset({"doctors"})
+        )
+
+    def read(self, table="doctors"):
+        return self.client.table(table).select("*").eq("hospital_id", "h1").execute()
+
+    def open_circuit(self, table):
+        self.raw.outcomes = [ConnectionResetError()] * 4
+        for _ in range(4):
+            try:
+                self.read(table)
+            except ConnectionError:
+                pass
+        self.assertEqual(self.breaker.state(table), OPEN)
+
+    def test_open_circuit_serves_last_known_good_reads(self):
+        good = self.read()
+        self.open_circuit("doctors")
+        calls = len(self.raw.executions)
+
+        self.assertEqual(self.read(), good)
+        self.assertEqual(len(self.raw.executions), calls)
+        self.assertGreater(self.breaker.metrics()["by_table"]["doctors"]["fallbacks"], 0)
+
+    def test_fallback_responses_are_not_shared(self):
+        self.read()
+        self.open_circuit("doctors")
+
+        first = self.read()
+        first.data.append({"id": "eklenen"})
+        self.assertEqual(self.read().data, [{"id": "fresh"}])
+        self.assertIsNot(self.read(), first)
+
+    def test_expired_budget_is_not_a_backend_failure(self):
+        with budget(0):
+            for _ in range(6):
+                with self.assertRaises(DeadlineExceeded):
+                    self.read()
+
+        self.assertEqual(self.breaker.state("doctors"), CLOSED)
+        self.assertEqual(self.raw.executions, [])
+        self.assertEqual(self.breaker.metrics()["by_table"], {})
+
+    def test_deadline_before_sending_releases_the_probe(self):
+        self.open_circuit("appointments")
+        self.clock.now += 15
+        self.raw.outcomes = [DeadlineExceeded("süre doldu")]
+        with self.assertRaises(DeadlineExceeded):
+            self.read("appointments")
+        self.assertEqual(self.breaker.state("appointments"), HALF_OPEN)
+
+        self.assertEqual(self.read("appointments").data, [{"id": "fresh"}])
+        self.assertEqual(self.breaker.state("appointments"), CLOSED)
+
+    def test_open_circuit_fails_fast_without_cached_data(self):
+        self.open_circuit("appointments")
+        calls = len(self.raw.executions)
+        with self.assertRaises(CircuitOpen):
+            self.read("appointments")
+        with self.assertRaises(CircuitOpen):
+            self.client.table("appointments").update({"status": "cancelled"}).eq("id", 1).execute()
+        self.assertEqual(len(self.raw.executions), calls)
+
+    def test_writes_fail_fast_while_reads_fall_back(self):
+        self.read()
+        self.open_circuit("doctors")
+        with self.assertRaises(CircuitOpen):
+            self.client.table("doctors").insert({"name": "Yeni"}).execute()
+
+    def test_client_errors_do_not_open_the_circuit(self):
+        self.raw.outcomes = [APIError({"message": "unique", "code": "23505"})] * 6
+        for _ in range(6):
+            with self.assertRaises(APIError):
+                self.client.table("services").insert({"name": "Dolgu"}).execute()
+        self.assertEqual(self.breaker.state("services"), CLOSED)
+
+    def test_async_queries_share_the_breaker(self):
+        class AsyncBuilder(FakeBuilder):
+            async def execute(self):
+                return FakeBuilder.execute(self)
+
+        class AsyncClient(FakeClient):
+            def table(self, name):
+                return AsyncBuilder(self, name)
+
+        raw = AsyncClient()
+        client = CircuitBreakerClient(raw, self.breaker, LastKnownGood(8), fallback_tables=frozenset({"doctors"}))
+        good = asyncio.run(client.table("doctors").select("*").execute())
+        self.open_circuit("doctors")
+        self.assertEqual(asyncio.run(client.table("doctors").select("*").execute()), good)
+        with self.assertRaises(CircuitOpen):
+            asyncio.run(client.table("doctors").insert({"name": "Yeni"}).execute())
+
+
+class BackendFailurePageTests(TestCase):
+    def process(self, exc):
+        request = RequestFactory().get("/appointments/")
+        request.session = {}
+        return DeadlineMiddleware(lambda request: None).process_exception(request, exc)
+
+    def test_backend_failures_become_503(self):
+        for exc in (CircuitOpen("doctors"), ConnectionResetError(), APIError({"message": "x", "code": 503})):
+            with self.assertLogs("panel.middleware", level="WARNING"):
+                response = self.process(exc)
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response["Retry-After"], "5")
+
+    def test_client_errors_are_left_to_django(self):
+        self.assertIsNone(self.process(APIError({"message": "x", "code": "23505"})))
+        self.assertIsNone(self.process(ValueError("geçersiz")))
+
+
+class StandInOutageTests(TestCase):
+    """Arıza enjekte eden yerel PostgREST taklidiyle uçtan uca davranış."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = make_breaker(self.clock)
+        self.last_good = LastKnownGood(8)
+        self.server = _PostgrestStandIn({"services": [{"id": 1, "name": "Dolgu"}], "appointments": []}, 0.0)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+    def client(self, raw):
+        return CircuitBreakerClient(raw, self.breaker, self.last_good, fallback_tables=frozenset({"services"}))
+
+    def test_outage_opens_circuit_and_recovers_through_probe(self):
+        raw = SyncPostgrestClient(f"{self.server.url}/rest/v1")
+        self.addCleanup(raw.aclose)
+        client = self.client(raw)
+        self.assertEqual(client.table("services").select("*").execute().data, [{"id": 1, "name": "Dolgu"}])
+
+        self.server.failure_rate = 1.0
+        for _ in range(4):
+            self.assertEqual(client.table("services").select("*").execute().data[0]["name"], "Dolgu")
+            with self.assertRaises(APIError):
+                client.table("appointments").select("*").execute()
+        self.assertEqual(self.breaker.metrics()["open"], ["appointments", "services"])
+
+        hits = self.server.hits
+        with self.assertRaises(CircuitOpen):
+            client.table("appointments").select("*").execute()
+        with self.assertRaises(CircuitOpen):
+            client.table("services").insert({"name": "Kanal"}).execute()
+        client.table("services").select("*").execute()
+        self.assertEqual(self.server.hits, hits)
+
+        # Arıza biter; deneme çağrısı devreyi kapatır
+        self.server.failure_rate = 0.0
+        self.clock.now += 15
+        self.assertEqual(client.table("appointments").select("*").execute().data, [])
+        self.assertEqual(self.breaker.metrics()["open"], ["services"])
+
+    def test_async_client_fails_fast_when_open(self):
+        self.server.failure_rate = 1.0
+
+        async def run():
+            client = self.client(AsyncPostgrestClient(f"{self.server.url}/rest/v1"))
+            for _ in range(4):
+                with self.assertRaises(APIError):
+                    await client.table("appointments").select("*").execute()
+            with self.assertRaises(CircuitOpen):
+                await client.table("appointments").select("*").execute()
+            await client.aclose()
+
+        asyncio.run(run())
+        self.assertEqual(self.breaker.state("appointments"), OPEN)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest import TestCase
+
+from panel.services.coalescing import CoalescingClient
+from panel.services.deadline import DeadlineExceeded, budget
+
+
+class FakeBuilder:
+    """Postgrest builder gibi zincirlenen, execute'ta bekleyen sahte sorgu."""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.steps = []
+
+    def __getattr__(self, name):
+        def step(*args, **kwargs):
+            self.steps.append((name, args))
+            return self
+        return step
+
+    @property
+    def not_(self):
+        self.steps.append(("not_", ()))
+        return self
+
+    def execute(self):
+        self.client.executions.append((self.table, tuple(self.steps)))
+        self.client.release.wait(5)
+        return SimpleNamespace(data=[{"table": self.table}])
+
+
+class FakeClient:
+    def __init__(self):
+        self.executions = []
+        self.release = threading.Event()
+
+    def table(self, name):
+        return FakeBuilder(self, name)
+
+
+class CoalescingClientTests(TestCase):
+    def setUp(self):
+        self.raw = FakeClient()
+        self.client = CoalescingClient(self.raw)
+
+    def test_identical_concurrent_reads_share_one_call(self):
+        results = []
+
+        def read():
+            results.append(self.client.table("doctors").select("*").eq("hospital_id", "h1").execute())
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        # İlk çağrı execute içinde beklerken diğerleri ona katılır
+        deadline = time.monotonic() + 5
+        while self.client.flight.metrics()["coalesced"] < 7 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.raw.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(self.raw.executions), 1)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(len({id(result) for result in results}), 8)
+        results[1].data[0]["table"] = "değişti"
+        self.assertTrue(all(result.data[0]["table"] == "doctors" for result in results if result is not results[1]))
+        metrics = self.client.flight.metrics()
+        self.assertEqual((metrics["executed"], metrics["coalesced"]), (1, 7))
+        self.assertEqual(metrics["saved_ratio"], 0.875)
+
+    def test_writes_and_different_filters_are_not_coalesced(self):
+        self.raw.release.set()
+        self.client.table("doctors").select("*").eq("hospital_id", "h1").execute()
+        self.client.table("doctors").select("*").not_.is_("image", "null").execute()
+        self.client.table("doctors").update({"name": "A"}).eq("id", "1").execute()
+
+        self.assertEqual(len(self.raw.executions), 3)
+        self.assertEqual(self.client.flight.metrics()["by_table"], {"doctors": {"executed": 2, "coalesced": 0}})
+
+    def test_follower_waits_only_until_its_deadline(self):
+        leader = threading.Thread(target=lambda: self.client.table("doctors").select("*").execute())
+        leader.start()
+        self.addCleanup(leader.join, 5)
+        self.addCleanup(self.raw.release.set)
+        while not self.raw.executions:
+            time.sleep(0.001)
+
+        started = time.monotonic()
+        with budget(0.05), self.assertRaises(DeadlineExceeded):
+            self.client.table("doctors").select("*").execute()
+
+        self.assertLess(time.monotonic() - started, 1)
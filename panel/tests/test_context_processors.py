@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.template import Context, Template
+from django.test import RequestFactory
+
+from panel.context_processors import hospital_context
+from panel.services import hospital_service
+
+
+class HospitalContextTests(TestCase):
+    def setUp(self):
+        patcher = patch("panel.services.hospital_service.get_hospital", return_value={"id": "h1", "name": "Merkez"})
+        self.get_hospital = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("panel.services.tenant_service.get_snapshot", return_value={"id": "h1", "name": "Özet"})
+        self.get_snapshot = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.request = RequestFactory().get("/")
+        self.request.session = {"hospital_id": "h1"}
+
+    def test_anonymous_session_skips_backend(self):
+        self.request.session = {}
+
+        context = hospital_context(self.request)
+
+        self.assertIsNone(context["hospital"])
+        self.get_snapshot.assert_not_called()
+
+    def test_hospital_is_loaded_only_when_template_uses_it(self):
+        context = hospital_context(self.request)
+        Template("<title>Giriş</title>").render(Context(context))
+        self.get_snapshot.assert_not_called()
+
+        rendered = Template("{{ hospital.name }}").render(Context(context))
+
+        self.assertEqual(rendered, "Özet")
+        self.get_snapshot.assert_called_once_with(self.request)
+
+    def test_hospital_loaded_by_the_view_is_reused(self):
+        hospital_service.get_request_hospital(self.request)
+        context = hospital_context(self.request)
+
+        rendered = Template("{{ hospital.name }}").render(Context(context))
+
+        self.assertEqual(rendered, "Merkez")
+        self.get_hospital.assert_called_once()
+        self.get_snapshot.assert_not_called()
+
+    def test_missing_hospital_renders_as_empty(self):
+        self.get_snapshot.side_effect = ValueError("Hastane bulunamadı")
+
+        context = hospital_context(self.request)
+
+        self.assertEqual(Template("{% if hospital %}var{% endif %}").render(Context(context)), "")
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import RequestFactory, override_settings
+
+from panel.services import dashboard_service, data_version
+from panel.services.deadline import DeadlineExceeded
+from panel.views import dashboard_views
+
+TODAY = date(2024, 6, 3)
+
+
+def _appointment(appointment_id, day, time_str, status="planned", doctor_id="doc-1", service="1"):
+    return {
+        "id": appointment_id,
+        "userId": "user-1",
+        "doctorId": doctor_id,
+        "date": day,
+        "time": time_str,
+        "status": status,
+        "service": service,
+    }
+
+
+class BuildDashboardContextTests(TestCase):
+    def test_single_pass_aggregation_matches_widget_expectations(self):
+        doctors = [
+            {"id": "doc-1", "name": "Ayşe", "surname": "Yılmaz", "workingHours": {}},
+            {"id": "doc-2", "name": "Mehmet", "surname": "Kaya", "workingHours": {}},
+        ]
+        services = [{"id": 1, "name": "Dolgu"}, {"id": 2, "name": "Kanal"}]
+        appointments = [
+            _appointment("a1", "2024-06-03", "14:00"),
+            _appointment("a2", "2024-06-03", "09:00", status="cancelled", service="2"),
+            _appointment("a3", "2024-06-10", "10:00", doctor_id="doc-2"),
+            _appointment("a4", "2024-05-01", "10:00"),
+            _appointment("a5", "", "10:00"),
+        ]
+        ratings = [
+            {"doctor_id": "doc-1", "doctor_rating": 4, "hospital_rating": 5},
+            {"doctor_id": "doc-1", "doctor_rating": 5, "hospital_rating": 3},
+            {"doctor_id": "doc-2", "doctor_rating": None, "hospital_rating": 4},
+        ]
+        users = {"user-1": {"name": "Ali", "surname": "Veli"}}
+
+        context = dashboard_service.build_dashboard_context(
+            doctors, appointments, services, ratings, [], users, [], TODAY
+        )
+
+        self.assertEqual([kpi.value for kpi in context["kpi_cards"]], ["2", "2", "2", "4.0"])
+        self.assertEqual([card["time"] for card in context["todays_appointments"]], ["09:00", "14:00"])
+        self.assertEqual(context["todays_appointments"][1]["doctor"], "Ayşe Yılmaz")
+        self.assertEqual(context["todays_appointments"][1]["service"], "Dolgu")
+        self.assertEqual(context["service_stats"][0], {"name": "Dolgu", "count": 4, "percent": 80})
+        self.assertEqual(
+            context["doctor_ratings"],
+            [
+                {"id": "doc-1", "name": "Ayşe Yılmaz", "rating": 4.5, "rating_count": 2},
+                {"id": "doc-2", "name": "Mehmet Kaya", "rating": 0.0, "rating_count": 0},
+            ],
+        )
+
+
+class WidgetTests(TestCase):
+    def setUp(self):
+        dashboard_service.panel_cache.invalidate()
+        self.addCleanup(dashboard_service.panel_cache.invalidate)
+        patcher = patch("panel.services.dashboard_service._get_active_hospital_id", return_value="h1")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("panel.services.dashboard_service._today", return_value=TODAY)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("panel.services.dashboard_service.get_supabase_client")
+        self.client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.client.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [
+            {"id": "doc-1", "name": "Ayşe", "surname": "Yılmaz", "working_hours": {}},
+        ]
+
+    def test_widget_queries_only_its_tables(self):
+        context = dashboard_service.load_widget("doctor_status", "h1")
+
+        self.assertEqual(len(context["doctor_status"]), 1)
+        self.client.table.assert_called_once_with("doctors")
+
+    def test_widgets_are_cached_separately(self):
+        dashboard_service.get_widget("doctor_status")
+        dashboard_service.get_widget("doctor_status")
+
+        self.assertEqual(self.client.table.call_count, 1)
+        self.assertIn(("dashboard_widget", "h1", "doctor_status"), dashboard_service.panel_cache._entries)
+
+    def test_widget_loader_receives_hospital_id_not_request(self):
+        with patch.object(dashboard_service, "load_widget", return_value={"kpi_cards": []}) as load:
+            dashboard_service.get_widget("kpis", object())
+
+        load.assert_called_once_with("kpis", "h1")
+
+    def _widget_response(self, name):
+        request = RequestFactory().get(f"/dashboard/widgets/{name}/")
+        request.session = {"user_id": "u1", "hospital_id": "h1"}
+        return dashboard_views.dashboard_widget(request, name)
+
+    def test_widget_falls_back_to_last_good_value_when_backend_times_out(self):
+        dashboard_service._widget_fallbacks().clear()
+        self.addCleanup(dashboard_service._widget_fallbacks().clear)
+        execute = self.client.table.return_value.select.return_value.eq.return_value.execute
+        execute.side_effect = DeadlineExceeded()
+        self.assertEqual(self._widget_response("doctor_status").status_code, 503)
+
+        execute.side_effect = None
+        self._widget_response("doctor_status")
+        dashboard_service.panel_cache.invalidate()
+        execute.side_effect = DeadlineExceeded()
+        response = self._widget_response("doctor_status")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Panel-Stale"], "1")
+        self.assertIn("Ayşe", response.content.decode())
+
+    @override_settings(PANEL_BREAKER_FALLBACK_ENTRIES=2)
+    def test_last_good_widgets_are_bounded(self):
+        patcher = patch.object(dashboard_service, "_last_good_widgets", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with patch.dict(dashboard_service.WIDGETS, {"kpis": lambda sources: {"kpi_cards": [sources.hospital_id]}}):
+            for hospital_id in ("h1", "h2", "h3"):
+                dashboard_service.load_widget("kpis", hospital_id)
+
+        self.assertIsNone(dashboard_service.get_cached_widget("kpis", object()))
+        self.assertEqual(len(dashboard_service._widget_fallbacks()._entries), 2)
+
+    def test_unknown_widget_raises_key_error(self):
+        with self.assertRaises(KeyError):
+            dashboard_service.get_widget("bilinmeyen")
+
+
+class FakeAsyncClient:
+    """Sorgu zincirini kabul eden, aynı anda bekleyen sorgu sayısını ölçen async client."""
+
+    def __init__(self, rows: dict[str, list[dict]]):
+        self.rows = rows
+        self.tables = []
+        self.active = 0
+        self.peak = 0
+
+    def table(self, name):
+        self.tables.append(name)
+        return FakeAsyncQuery(self, name)
+
+
+class FakeAsyncQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    async def execute(self):
+        self.client.active += 1
+        self.client.peak = max(self.client.peak, self.client.active)
+        await asyncio.sleep(0.01)
+        self.client.active -= 1
+        return SimpleNamespace(data=self.client.rows.get(self.table, []))
+
+
+class AsyncWidgetTests(TestCase):
+    def setUp(self):
+        self.client = FakeAsyncClient({
+            "doctors": [{"id": "doc-1", "name": "Ayşe", "surname": "Yılmaz", "working_hours": {}}],
+            "ratings": [{"doctor_id": "doc-1", "doctor_rating": 4}, {"doctor_id": "doc-1", "doctor_rating": 5}],
+        })
+        for target, kwargs in (
+            ("panel.services.dashboard_service._get_active_hospital_id", {"return_value": "h1"}),
+            ("panel.services.dashboard_service._today", {"return_value": TODAY}),
+            ("panel.services.dashboard_service.get_async_client", {"return_value": self.client}),
+            ("panel.services.dashboard_service.get_supabase_client", {"side_effect": AssertionError("senkron sorgu")}),
+        ):
+            patcher = patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_widget_sources_are_queried_concurrently(self):
+        context = asyncio.run(dashboard_service.aload_widget("doctor_ratings", "h1"))
+
+        self.assertEqual(context["doctor_ratings"][0]["rating"], 4.5)
+        self.assertEqual(sorted(self.client.tables), ["doctors", "ratings"])
+        self.assertEqual(self.client.peak, 2)
+
+    def test_preloaded_appointments_replace_todays_query(self):
+        sources = asyncio.run(dashboard_service.DashboardSources.aload("h1", TODAY, ("todays", "appointments")))
+
+        self.assertEqual(self.client.tables, ["appointments"])
+        self.assertEqual(sources.appointments, [])
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        override = override_settings(
+            PANEL_SHARED_CACHE_DIR="",
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                "fragments": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "fragments-test"},
+            },
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        caches["fragments"].clear()
+        patcher = patch("panel.services.dashboard_service._get_active_hospital_id", return_value="h1")
+        self.hospital_id = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch(
+            "panel.views.dashboard_views.load_widget",
+            return_value={"upcoming_holidays": [{"reason": "Bayram", "date": "2024-06-16"}]},
+        )
+        self.load_widget = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _render(self):
+        request = RequestFactory().get("/panel/dashboard/widgets/upcoming_holidays/")
+        request.session = {"user_id": "u1", "hospital_id": self.hospital_id.return_value}
+        return dashboard_views.dashboard_widget(request, "upcoming_holidays").content.decode()
+
+    def test_fragment_is_reused_until_data_version_changes(self):
+        first = self._render()
+        second = self._render()
+
+        self.assertIn("Bayram", first)
+        self.assertEqual(first, second)
+        self.load_widget.assert_called_once_with("upcoming_holidays", "h1")
+
+        data_version.bump_rows([{"id": "hol-1", "hospital_id": "h1"}], "holidays")
+        self._render()
+
+        self.assertEqual(self.load_widget.call_count, 2)
+
+    def test_fragment_key_is_per_tenant(self):
+        self._render()
+        self.hospital_id.return_value = "h2"
+        self._render()
+
+        self.assertEqual(self.load_widget.call_count, 2)
+
+    def test_unrelated_write_keeps_fragment(self):
+        self._render()
+        data_version.bump("h1", "reviews")
+        self._render()
+
+        self.assertEqual(self.load_widget.call_count, 1)
+
+    @patch("panel.services.data_version.is_shared", return_value=True)
+    def test_external_scopes_use_a_short_ttl_unless_watched(self, _):
+        with override_settings(PANEL_CACHE_INVALIDATION="off"):
+            ttls = dashboard_service.get_fragment_context()["fragment_ttls"]
+        self.assertEqual(ttls, {"service_stats": 30, "doctor_ratings": 30, "upcoming_holidays": 600})
+
+        with override_settings(PANEL_CACHE_INVALIDATION="realtime"):
+            ttls = dashboard_service.get_fragment_context()["fragment_ttls"]
+        # Puanlar değişiklik bildirimiyle izlenmez
+        self.assertEqual(ttls, {"service_stats": 600, "doctor_ratings": 30, "upcoming_holidays": 600})
+
+    def test_local_versions_cap_every_fragment_ttl(self):
+        # Süreç içi sürümler diğer worker'ların yazmalarını görmez
+        with override_settings(PANEL_CACHE_INVALIDATION="realtime"):
+            ttls = dashboard_service.get_fragment_context()["fragment_ttls"]
+        self.assertEqual(ttls, {"service_stats": 30, "doctor_ratings": 30, "upcoming_holidays": 30})
+
+    def test_inline_dashboard_computes_fragment_widgets_only_when_not_cached(self):
+        builders = {name: (lambda sources, name=name: {name: []}) for name in dashboard_service.WIDGETS}
+        self.load_widget.side_effect = lambda name, hospital_id: {name: []}
+        request = RequestFactory().get("/panel/", {"inline": "1"})
+        request.session = {"user_id": "u1", "hospital_id": "h1"}
+        dashboard_service.panel_cache.invalidate()
+        self.addCleanup(dashboard_service.panel_cache.invalidate)
+
+        with patch.dict(dashboard_service.WIDGETS, builders), \
+                patch.object(dashboard_service, "get_supabase_client"), \
+                patch.object(dashboard_service, "_format_hospital_from_db", return_value={"id": "h1"}):
+            context = dashboard_service.load_dashboard_context("h1")
+            dashboard_views.dashboard(request)
+            dashboard_views.dashboard(request)
+
+        self.assertEqual(set(context), {*dashboard_service.DASHBOARD_WIDGETS, "hospital"})
+        self.assertFalse(set(context) & set(dashboard_service.FRAGMENT_SCOPES))
+        # İlk render parçaları önbelleğe yazar; ikinci render veri yüklemez
+        self.assertEqual(self.load_widget.call_count, len(dashboard_service.FRAGMENT_SCOPES))
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time
+from unittest import TestCase
+
+from panel import dateparse
+
+
+class DateParseTests(TestCase):
+    def test_parses_supabase_date_and_time_formats(self):
+        self.assertEqual(dateparse.parse_date("2024-06-03"), date(2024, 6, 3))
+        self.assertEqual(dateparse.parse_time("09:30"), time(9, 30))
+        self.assertEqual(dateparse.parse_time("09:30:00"), time(9, 30))
+        self.assertEqual(dateparse.parse_minutes("13:45"), 13 * 60 + 45)
+        self.assertEqual(dateparse.parse_datetime("2024-06-03", "09:30"), datetime(2024, 6, 3, 9, 30))
+
+    def test_invalid_or_empty_values_return_none(self):
+        for value in ("", None, "2024-13-01", "yarın"):
+            self.assertIsNone(dateparse.parse_date(value))
+        self.assertIsNone(dateparse.parse_time("25:00"))
+        # fromisoformat'ın kabul ettiği ama eski strptime biçimlerinin reddettiği girdiler
+        for value in ("20240603", "2024-W23-1", "2024-06-03T10:00"):
+            self.assertIsNone(dateparse.parse_date(value))
+        for value in ("0930", "09", "093000", "09:30:00.5", "09:30+03:00"):
+            self.assertIsNone(dateparse.parse_time(value))
+        self.assertIsNone(dateparse.parse_minutes(None))
+        self.assertIsNone(dateparse.parse_datetime("2024-06-03", None))
+
+    def test_repeated_values_are_served_from_cache(self):
+        dateparse.parse_date.cache_clear()
+        first = dateparse.parse_date("2024-06-03")
+
+        self.assertIs(dateparse.parse_date("2024-06-03"), first)
+        self.assertEqual(dateparse.parse_date.cache_info().hits, 1)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from unittest import TestCase
+from unittest.mock import patch
+
+import httpx
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.views import View
+
+from panel.middleware import DeadlineMiddleware
+from panel.services import deadline
+from panel.services.deadline import DeadlineExceeded, budget, with_deadline
+from panel.services.http_transport import DeadlineTransport
+
+
+@with_deadline(3)
+def widget_view(request):
+    return HttpResponse()
+
+
+class ListView(View):
+    deadline = 8
+
+
+class DeadlineTests(TestCase):
+    def test_check_raises_after_budget_expires(self):
+        self.assertIsNone(deadline.check())
+        with budget(0):
+            with self.assertRaises(DeadlineExceeded):
+                deadline.check()
+        with budget(5):
+            self.assertGreater(deadline.check(), 4)
+
+    @override_settings(PANEL_REQUEST_DEADLINE=10, PANEL_VIEW_DEADLINES={"reviews": 4})
+    def test_view_budget_precedence(self):
+        self.assertEqual(deadline.view_budget(widget_view), 3)
+        self.assertEqual(deadline.view_budget(ListView.as_view()), 8)
+        self.assertEqual(deadline.view_budget(ListView.as_view(), "reviews"), 4)
+        self.assertEqual(deadline.view_budget(lambda request: None), 10)
+
+
+class DeadlineTransportTests(TestCase):
+    def _request(self):
+        return httpx.Request("GET", "http://supabase.test/rest/v1/doctors", extensions={
+            "timeout": {"connect": 2.0, "read": 8.0, "write": 8.0, "pool": 8.0},
+        })
+
+    def test_timeouts_are_bounded_by_remaining_budget(self):
+        request = self._request()
+        with patch.object(httpx.HTTPTransport, "handle_request", return_value=httpx.Response(200)) as send:
+            with budget(1):
+                DeadlineTransport().handle_request(request)
+
+        timeouts = send.call_args.args[0].extensions["timeout"]
+        self.assertLessEqual(max(timeouts.values()), 1)
+
+    def test_expired_budget_skips_the_call_and_timeouts_are_converted(self):
+        with patch.object(httpx.HTTPTransport, "handle_request") as send:
+            with budget(0), self.assertRaises(DeadlineExceeded):
+                DeadlineTransport().handle_request(self._request())
+            send.assert_not_called()
+
+            send.side_effect = httpx.ReadTimeout("yavaş")
+            with self.assertRaises(DeadlineExceeded):
+                DeadlineTransport().handle_request(self._request())
+
+
+class DeadlineMiddlewareTests(TestCase):
+    def test_view_budget_applies_and_timeout_becomes_503(self):
+        seen = []
+
+        def get_response(request):
+            middleware.process_view(request, widget_view, (), {})
+            seen.append(deadline.remaining())
+            return middleware.process_exception(request, DeadlineExceeded("yavaş"))
+
+        middleware = DeadlineMiddleware(get_response)
+        request = RequestFactory().get("/appointments/")
+        request.session = {}
+        with self.assertLogs("panel.middleware", level="WARNING"):
+            response = middleware(request)
+
+        self.assertLessEqual(seen[0], 3)
+        self.assertGreater(seen[0], 2)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "5")
+        self.assertIsNone(deadline.current())
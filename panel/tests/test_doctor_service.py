@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from panel.services import data_version, doctor_service
+
+
+class DeleteDoctorTests(TestCase):
+    @patch("panel.services.doctor_service._delete_file")
+    @patch("panel.services.doctor_service.get_supabase_client")
+    def test_delete_bumps_only_the_doctors_hospital(self, mock_get_client, mock_delete_file):
+        rpc_call = MagicMock()
+        rpc_call.execute.return_value = SimpleNamespace(
+            data=[{"doctor_id": "doc-1", "hospital_id": "hospital-1", "doctor_image": "https://x/hospital-media/a.jpg"}]
+        )
+        mock_get_client.return_value.rpc.return_value = rpc_call
+
+        with patch.object(data_version, "bump") as bump:
+            doctor_service.delete_doctor("doc-1")
+
+        mock_get_client.return_value.rpc.assert_called_once_with("delete_doctor_cascade", {"p_doctor_id": "doc-1"})
+        bump.assert_called_once_with("hospital-1", "doctors", "holidays")
+        mock_delete_file.assert_called_once_with("https://x/hospital-media/a.jpg")
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 from datetime import time as time_obj
+from types import SimpleNamespace
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
 
 from panel.forms import DAYS
-from panel.services import hospital_service
+from panel.services import hospital_service, schedule_service
+from panel.services.circuit_breaker import CircuitOpen
+from panel.services.concurrency import ConcurrentUpdateError
+from panel.services.deadline import DeadlineExceeded
 
 
 class WorkingHoursBuilderTests(TestCase):
@@ -65,3 +70,168 @@ class WorkingHoursInitialTests(TestCase):
         self.assertIsNone(initial["tuesday_end"])
 
 
+
+
+def _build_query(result_rows):
+    """Creates a Supabase-style query mock that always returns result_rows."""
+    query = MagicMock()
+    for method in ("select", "eq", "is_", "update", "insert", "single", "limit"):
+        setattr(query, method, MagicMock(return_value=query))
+    query.execute.return_value = SimpleNamespace(data=result_rows)
+    return query
+
+
+class PartialHospitalUpdateTests(TestCase):
+    def setUp(self):
+        patcher = patch("panel.services.hospital_service.data_version")
+        self.data_version = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("panel.services.hospital_service.get_supabase_client")
+    def test_save_hospital_sends_only_dirty_columns(self, mock_get_client):
+        query = _build_query([{"id": "hospital-1", "updated_at": "2024-05-02T10:00:00+00:00"}])
+        mock_get_client.return_value = MagicMock(table=MagicMock(return_value=query))
+
+        hospital = hospital_service.TrackedHospital(
+            {"id": "hospital-1", "name": "Merkez", "gallery": ["a.jpg", "b.jpg"]}
+        )
+        gallery = hospital["gallery"]
+        gallery.pop(0)
+        hospital["gallery"] = gallery
+
+        hospital_service.save_hospital(hospital)
+
+        payload = query.update.call_args.args[0]
+        self.assertEqual(set(payload), {"gallery", "updated_at"})
+        self.assertEqual(payload["gallery"], ["b.jpg"])
+        query.select.assert_called_once_with("id, updated_at")
+        self.data_version.bump.assert_called_once_with("hospital-1", "hospitals")
+        self.assertEqual(hospital.dirty_fields, set())
+        self.assertEqual(hospital["updatedAt"], "2024-05-02T10:00:00+00:00")
+
+    @patch("panel.services.hospital_service.get_supabase_client")
+    def test_save_hospital_skips_request_when_nothing_changed(self, mock_get_client):
+        hospital_service.save_hospital(hospital_service.TrackedHospital({"id": "hospital-1"}))
+
+        mock_get_client.assert_not_called()
+
+    def test_in_place_edits_mark_fields_dirty(self):
+        hospital = hospital_service.TrackedHospital(
+            {"id": "hospital-1", "phone": "555", "workingHours": {"monday": {"start": "09:00"}}}
+        )
+        hospital["workingHours"]["monday"]["start"] = "10:00"
+        hospital.pop("phone")
+
+        self.assertEqual(hospital.dirty_fields, {"workingHours", "phone"})
+        hospital.mark_clean()
+        self.assertEqual(hospital.dirty_fields, set())
+
+    @patch("panel.services.hospital_service.get_supabase_client")
+    def test_update_hospital_fields_applies_updated_at_precondition(self, mock_get_client):
+        query = _build_query([])
+        mock_get_client.return_value = MagicMock(table=MagicMock(return_value=query))
+
+        with self.assertRaises(ValueError):
+            hospital_service.update_hospital_fields(
+                "hospital-1",
+                {"is_open_24_hours": True},
+                expected_updated_at="2024-05-01T09:00:00+00:00",
+            )
+
+        query.eq.assert_any_call("id", "hospital-1")
+        query.eq.assert_any_call("updated_at", "2024-05-01T09:00:00+00:00")
+
+
+class OptimisticConcurrencyTests(TestCase):
+    @patch("panel.services.hospital_service.get_supabase_client")
+    def test_save_hospital_raises_conflict_when_version_changed(self, mock_get_client):
+        query = _build_query([])
+        mock_get_client.return_value = MagicMock(table=MagicMock(return_value=query))
+        hospital = hospital_service.TrackedHospital(
+            {"id": "hospital-1", "updatedAt": "2024-05-01T09:00:00+00:00"}
+        )
+        hospital["name"] = "Yeni Ad"
+
+        with self.assertRaises(ConcurrentUpdateError):
+            hospital_service.save_hospital(hospital)
+
+        query.eq.assert_any_call("updated_at", "2024-05-01T09:00:00+00:00")
+
+    @patch("panel.services.hospital_service.delete_file_if_exists")
+    @patch("panel.services.hospital_service.save_hospital")
+    @patch("panel.services.hospital_service.get_hospital")
+    def test_remove_gallery_image_reapplies_removal_on_fresh_copy(self, mock_get_hospital, mock_save, mock_delete):
+        stale = hospital_service.TrackedHospital({"id": "hospital-1", "gallery": ["a.jpg", "b.jpg"]})
+        fresh = hospital_service.TrackedHospital({"id": "hospital-1", "gallery": ["new.jpg", "a.jpg", "b.jpg"]})
+        mock_get_hospital.return_value = fresh
+        mock_save.side_effect = [ConcurrentUpdateError(), None]
+
+        result = hospital_service.remove_gallery_image(stale, 0)
+
+        self.assertIs(result, fresh)
+        self.assertEqual(fresh["gallery"], ["new.jpg", "b.jpg"])
+        mock_delete.assert_called_once_with("a.jpg")
+
+    @patch("panel.services.hospital_service.save_gallery_image", return_value="https://cdn/c.jpg")
+    @patch("panel.services.hospital_service.save_hospital")
+    def test_add_gallery_image_does_not_mutate_shared_rows(self, mock_save, _):
+        row = {"id": "hospital-1", "gallery": ["a.jpg"], "working_hours": {"monday": {"open": "09:00"}}}
+        hospital = hospital_service.TrackedHospital(hospital_service._format_hospital_from_db(row))
+
+        hospital_service.add_gallery_image(hospital, object())
+
+        self.assertEqual(hospital["gallery"], ["a.jpg", "https://cdn/c.jpg"])
+        self.assertEqual(row["gallery"], ["a.jpg"])
+        self.assertIsNot(hospital["workingHours"], row["working_hours"])
+        self.assertEqual(mock_save.call_count, 1)
+
+
+class AddHolidayTests(TestCase):
+    @patch("panel.services.hospital_service._get_active_hospital_id", return_value="hospital-1")
+    @patch("panel.services.hospital_service.get_supabase_client")
+    def test_add_holiday_uses_single_rpc_call(self, mock_get_client, _):
+        rpc_call = MagicMock()
+        rpc_call.execute.return_value = SimpleNamespace(data=[{"id": "holiday-1"}])
+        mock_supabase = MagicMock()
+        mock_supabase.rpc.return_value = rpc_call
+        mock_get_client.return_value = mock_supabase
+
+        hospital_service.add_holiday(
+            "2024-06-03", "Bakım", is_full_day=False, start_time="13:00", end_time="17:00"
+        )
+
+        mock_supabase.rpc.assert_called_once_with(
+            "add_hospital_holiday",
+            {
+                "p_hospital_id": "hospital-1",
+                "p_date": "2024-06-03",
+                "p_reason": "Bakım",
+                "p_is_full_day": False,
+                "p_start_time": "13:00",
+                "p_end_time": "17:00",
+            },
+        )
+        mock_supabase.table.assert_not_called()
+
+
+class BackendUnavailableTests(TestCase):
+    """Deadline ve devre hataları "hastane bulunamadı"ya çevrilmez."""
+
+    @patch("panel.services.hospital_service.get_supabase_client")
+    def test_backend_errors_propagate_from_hospital_lookups(self, mock_get_client):
+        request = SimpleNamespace(session={"hospital_id": "hospital-1"})
+        for error in (CircuitOpen("hospitals"), DeadlineExceeded("süre doldu")):
+            mock_get_client.return_value.table.side_effect = error
+            with self.assertRaises(type(error)):
+                hospital_service.get_hospital_by_id("hospital-1")
+            with self.assertRaises(type(error)):
+                hospital_service.get_hospital(request)
+            with self.assertRaises(type(error)):
+                schedule_service.get_hospital_info(request)
+
+    @patch("panel.services.hospital_service.get_supabase_client")
+    def test_missing_hospital_is_still_a_value_error(self, mock_get_client):
+        mock_get_client.return_value = MagicMock(table=MagicMock(return_value=_build_query([])))
+
+        with self.assertRaises(ValueError):
+            hospital_service.get_hospital_by_id("hospital-404")
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+from django.conf import settings
+
+from panel import views
+from panel.benchmarks import LAZY_MODULES
+
+# Açılış süresi `panel_benchmark imports` ile ölçülür; burada yalnızca ağır
+# bağımlılıkların yüklenmediği doğrulanır (süre makineye göre değişir)
+_PROBE = (
+    "import json, sys, django; django.setup(); import dent_admin_panel.urls, panel.views; "
+    "print(json.dumps(sorted(name for name in %r if name in sys.modules)))" % (LAZY_MODULES,)
+)
+
+
+class StartupImportTests(TestCase):
+    def test_heavy_dependencies_are_not_loaded_at_startup(self):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE="dent_admin_panel.settings", PANEL_WARMUP_ON_READY="False")
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+
+        self.assertEqual(json.loads(output.splitlines()[-1]), [])
+
+
+class LazyViewsTests(TestCase):
+    def test_views_resolve_on_first_access(self):
+        from panel.views.location_views import location_provinces
+
+        self.assertIs(views.location_provinces, location_provinces)
+
+    def test_unknown_view_raises_attribute_error(self):
+        with self.assertRaises(AttributeError):
+            views.missing_view
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import pickle
+from unittest import TestCase
+from unittest.mock import patch
+
+from panel.services.records import AppointmentRecord, DoctorRecord, ReviewRecord
+
+ROW = {
+    "id": 7,
+    "user_id": 3,
+    "hospital_id": "hospital-42",
+    "doctor_id": 11,
+    "service_id": 5,
+    "date": "2024-06-03",
+    "time": "09:30",
+    "status": None,
+    "notes": "",
+    "created_at": "2024-01-01T10:00:00Z",
+}
+
+
+class RecordTests(TestCase):
+    def test_fields_are_converted_like_the_old_dict_format(self):
+        record = AppointmentRecord(ROW)
+
+        self.assertEqual(
+            record,
+            {
+                "id": "7",
+                "userId": "3",
+                "hospitalId": "hospital-42",
+                "doctorId": "11",
+                "date": "2024-06-03",
+                "time": "09:30",
+                "status": "completed",
+                "service": "5",
+                "notes": "",
+                "createdAt": "2024-01-01T10:00:00Z",
+            },
+        )
+        self.assertIsNone(ReviewRecord({"id": 1})["doctorId"])
+        self.assertEqual(record.get("missing", "-"), "-")
+
+    def test_written_fields_override_row_without_touching_it(self):
+        record = ReviewRecord({"id": 1, "comment": "İyi"})
+
+        record.update({"comment": "Çok iyi", "has_reply": False})
+        del record["reply"]
+
+        self.assertEqual(record["comment"], "Çok iyi")
+        self.assertIs(record["has_reply"], False)
+        self.assertNotIn("reply", record)
+        self.assertEqual(list(record)[-1], "has_reply")
+        self.assertEqual(pickle.loads(pickle.dumps(record)), record)
+
+    def test_missing_mutable_defaults_are_not_shared(self):
+        first = DoctorRecord({"id": 1})["workingHours"]
+        first["monday"] = {}
+
+        self.assertEqual(DoctorRecord({"id": 2})["workingHours"], {})
+
+    def test_in_place_edits_to_missing_defaults_are_kept(self):
+        row = {"id": 1}
+        record = DoctorRecord(row)
+
+        record["services"].append("5")
+
+        self.assertEqual(record["services"], ["5"])
+        self.assertEqual(row, {"id": 1})
+
+    def test_records_cross_json_and_mapping_boundaries(self):
+        from panel.services import data_version
+        from panel.views.dashboard_views import _WidgetJSONEncoder
+
+        record = ReviewRecord({"id": 1, "hospital_id": "hospital-42"})
+        self.assertEqual(json.loads(json.dumps({"reviews": [record]}, cls=_WidgetJSONEncoder))["reviews"][0]["id"], "1")
+        with patch.object(data_version, "bump") as bump:
+            data_version.bump_rows([record], "reviews")
+        bump.assert_called_once_with("hospital-42", "reviews")
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.test import override_settings
+
+from panel.services import data_version, location_service, shared_cache
+from panel.services.shared_cache import SharedCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class SharedCacheTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "cache.sqlite3"
+        self.clock = FakeClock()
+
+    def test_values_are_visible_to_other_instances_on_the_same_file(self):
+        writer = SharedCache(self.path, clock=self.clock)
+        reader = SharedCache(self.path, clock=self.clock)
+
+        writer.set_many({"locations:a": [1, 2], "services:all": [{"id": 1}]})
+        reader.delete_prefix("locations:")
+
+        self.assertIsNone(writer.get("locations:a"))
+        self.assertEqual(writer.get("services:all"), [{"id": 1}])
+
+    def test_expired_entries_are_not_returned(self):
+        cache = SharedCache(self.path, clock=self.clock)
+        cache.set("k", "v", ttl=10)
+
+        self.clock.now += 11
+        self.assertEqual(cache.get("k", "yok"), "yok")
+        self.assertEqual(cache.get_or_set("k", lambda: "yeni", ttl=10), "yeni")
+
+    def test_least_recently_accessed_entries_are_evicted_over_size_limit(self):
+        cache = SharedCache(self.path, max_bytes=2500, clock=self.clock)
+        for index in range(3):
+            self.clock.now += 100
+            cache.set(f"k{index}", "x" * 700)
+        self.clock.now += 100
+        cache.get("k0")  # k0 yeniden kullanıldı, k1 en eski erişim
+
+        cache.set("k3", "x" * 700)
+
+        self.assertIsNone(cache.get("k1"))
+        self.assertEqual([cache.get(key) is not None for key in ("k0", "k2", "k3")], [True, True, True])
+        self.assertLessEqual(cache.stats()["bytes"], 2500)
+
+    def test_running_total_follows_replacements_deletes_and_expiry(self):
+        cache = SharedCache(self.path, clock=self.clock)
+        other = SharedCache(self.path, clock=self.clock)
+        cache.set("a", "x" * 500)
+        cache.set("a", "x" * 100)
+        other.set_many({"b": "x" * 300, "c": "x" * 200}, ttl=10)
+        other.delete("b")
+        self.clock.now += 11
+        cache.add("d", "x" * 50)
+
+        connection = cache._connection()
+        actual = connection.execute("select coalesce(sum(size), 0) from entries").fetchone()[0]
+        self.assertEqual(cache.stats()["bytes"], actual)
+        self.assertEqual(other.stats()["entries"], 2)
+
+    def test_size_eviction_can_be_disabled(self):
+        cache = SharedCache(self.path, max_bytes=None, clock=self.clock)
+        for index in range(5):
+            cache.set(f"session{index}", "x" * 1000)
+        self.clock.now += 100
+        cache.set("expiring", "x", ttl=1)
+        self.clock.now += 2
+        cache.set("session5", "x")
+
+        self.assertEqual(cache.stats()["entries"], 6)
+
+    def test_concurrent_version_creation_keeps_the_first_token(self):
+        cache = SharedCache(self.path, clock=self.clock)
+        other_worker = SharedCache(self.path, clock=self.clock)
+        real_get = cache.get
+        misses = iter([None])
+
+        def racing_get(key, default=None):
+            # İlk okumadan sonra başka bir worker belirteci yazar
+            value = next(misses, real_get(key, default))
+            if value is None:
+                other_worker.add(key, "ilk")
+            return value
+
+        with patch("panel.services.data_version.get_shared_cache", return_value=cache), \
+                patch.object(cache, "get", side_effect=racing_get):
+            token = data_version._token("version:v1:h1:doctors")
+
+        self.assertEqual(token, "ilk")
+        self.assertEqual(other_worker.get("version:v1:h1:doctors"), "ilk")
+
+
+class SharedLocationIndexTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        data_dir = Path(directory.name) / "data"
+        data_dir.mkdir()
+        files = {
+            "sehirler.json": [{"sehir_id": "1", "sehir_adi": "ADANA"}],
+            "ilceler.json": [
+                {"ilce_id": "10", "ilce_adi": "SEYHAN", "sehir_id": "1"},
+                {"ilce_id": "11", "ilce_adi": "ÇUKUROVA", "sehir_id": "1"},
+            ],
+            "mahalleler-1.json": [{"mahalle_id": "100", "mahalle_adi": "2000 EVLER", "ilce_id": "10"}],
+        }
+        for name, rows in files.items():
+            (data_dir / name).write_text(json.dumps(rows), encoding="utf-8")
+
+        for patcher in (
+            patch.object(location_service, "DATA_DIR", data_dir),
+            patch.object(location_service, "NEIGHBORHOOD_FILES", ["mahalleler-1.json"]),
+            patch.object(shared_cache, "_shared_cache", None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        settings_override = override_settings(PANEL_SHARED_CACHE_DIR=str(Path(directory.name) / "cache"))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_lookups_are_served_from_shared_index(self):
+        with patch.object(location_service, "_neighborhoods", side_effect=AssertionError("yerel veri yüklendi")):
+            self.assertEqual(location_service.get_neighborhoods("10"), [{"id": "100", "name": "2000 Evler"}])
+            self.assertEqual(location_service.get_neighborhoods("11"), [])
+            self.assertEqual(
+                location_service.get_neighborhood("100"),
+                {
+                    "id": "100",
+                    "name": "2000 Evler",
+                    "districtId": "10",
+                    "districtName": "Seyhan",
+                    "provinceId": "1",
+                    "provinceName": "Adana",
+                },
+            )
+        self.assertEqual(location_service.get_districts("1"), location_service._local_districts("1"))
+        self.assertEqual(location_service.get_province("1"), {"id": "1", "name": "Adana"})
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.test import RequestFactory
+
+from panel.services import dashboard_service, schedule_service
+from panel.services.swr_cache import StaleWhileRevalidateCache, panel_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class StaleWhileRevalidateCacheTests(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.pending = []
+        self.cache = StaleWhileRevalidateCache(soft_ttl=10, hard_ttl=60, clock=self.clock, spawn=self.pending.append)
+        self.calls = 0
+
+    def _loader(self):
+        self.calls += 1
+        return self.calls
+
+    def test_stale_value_is_served_while_single_refresh_runs_in_background(self):
+        self.assertEqual(self.cache.get("k", self._loader), 1)
+
+        self.clock.now = 15
+        self.assertEqual(self.cache.get("k", self._loader), 1)
+        self.assertEqual(self.cache.get("k", self._loader), 1)
+        self.assertEqual(len(self.pending), 1)
+
+        self.pending.pop()()
+        self.assertEqual(self.cache.get("k", self._loader), 2)
+
+    def test_hard_ttl_blocks_and_invalidate_forces_reload(self):
+        self.cache.get(("dashboard", "h1"), self._loader)
+        self.clock.now = 61
+        self.assertEqual(self.cache.get(("dashboard", "h1"), self._loader), 2)
+
+        self.cache.invalidate(lambda key: key[1] == "h1")
+        self.assertEqual(self.cache.get(("dashboard", "h1"), self._loader), 3)
+        self.assertEqual(self.pending, [])
+
+    def test_peek_returns_expired_value_without_loading(self):
+        self.assertIsNone(self.cache.peek("k"))
+        self.cache.get("k", self._loader)
+        self.clock.now = 120
+
+        self.assertEqual(self.cache.peek("k"), 1)
+        self.assertEqual((self.calls, self.pending), (1, []))
+
+    def test_failed_background_refresh_keeps_stale_value(self):
+        self.cache.get("k", self._loader)
+        self.clock.now = 15
+        self.cache.get("k", lambda: 1 / 0)
+
+        with self.assertLogs("panel.services.swr_cache", level="WARNING"):
+            self.pending.pop()()
+
+        self.assertEqual(self.cache.get("k", self._loader), 1)
+        self.assertEqual(len(self.pending), 1)
+
+    def test_concurrent_misses_share_one_load(self):
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow_loader():
+            started.set()
+            release.wait(5)
+            return self._loader()
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.get("k", slow_loader))) for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results, [1] * 5)
+        self.assertEqual(self.calls, 1)
+
+    def test_async_concurrent_misses_share_one_load(self):
+        async def slow_loader():
+            await asyncio.sleep(0.01)
+            return self._loader()
+
+        async def main():
+            return await asyncio.gather(*(self.cache.aget("k", slow_loader) for _ in range(5)))
+
+        self.assertEqual(asyncio.run(main()), [1] * 5)
+        self.assertEqual(self.calls, 1)
+
+    def test_async_stale_value_refreshes_in_background_task(self):
+        async def loader():
+            return self._loader()
+
+        async def main():
+            first = await self.cache.aget("k", loader)
+            self.clock.now = 15
+            stale = await self.cache.aget("k", loader)
+            await asyncio.gather(*self.cache._tasks)
+            return first, stale, await self.cache.aget("k", loader)
+
+        self.assertEqual(asyncio.run(main()), (1, 1, 2))
+        self.assertEqual(self.pending, [])
+
+
+class RefreshLoaderTests(TestCase):
+    """Arka planda çalışabilen yükleyiciler isteği değil, hastane id'sini alır."""
+
+    def setUp(self):
+        panel_cache.invalidate()
+        self.addCleanup(panel_cache.invalidate)
+        self.request = RequestFactory().get("/")
+        self.request.session = {"hospital_id": "h1"}
+
+    def test_dashboard_loader_receives_hospital_id(self):
+        with patch.object(dashboard_service, "load_dashboard_context", return_value={"kpi_cards": []}) as load:
+            dashboard_service.get_dashboard_context(self.request)
+
+        load.assert_called_once_with("h1")
+
+    def test_calendar_loader_receives_hospital_id(self):
+        with patch.object(schedule_service, "build_calendar_data", return_value={"weeks": []}) as build:
+            schedule_service.get_calendar_data(2024, 6, "d1", request=self.request)
+
+        build.assert_called_once_with(2024, 6, "d1", "h1")
+
+    def test_async_loaders_receive_hospital_id(self):
+        async def load(*args):
+            return {"weeks": []}
+
+        with patch.object(dashboard_service, "aload_dashboard_context", side_effect=load) as dashboard, \
+                patch.object(dashboard_service, "aload_widget", side_effect=load) as widget, \
+                patch.object(schedule_service, "abuild_calendar_data", side_effect=load) as calendar:
+            asyncio.run(dashboard_service.aget_dashboard_context(self.request))
+            asyncio.run(dashboard_service.aget_widget("kpis", self.request))
+            asyncio.run(schedule_service.aget_calendar_data(2024, 6, None, request=self.request))
+
+        dashboard.assert_called_once_with("h1")
+        widget.assert_called_once_with("kpis", "h1")
+        calendar.assert_called_once_with(2024, 6, None, "h1")
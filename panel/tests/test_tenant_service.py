@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from panel.services import data_version, tenant_service
+from panel.services.deadline import DeadlineExceeded
+
+ROW = {"id": "h1", "name": "Merkez", "image": None, "status": "approved", "is_open_24_hours": True, "updated_at": "t1"}
+
+
+class TenantSnapshotTests(TestCase):
+    def setUp(self):
+        patcher = patch("panel.services.data_version.get_shared_cache", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.dict(data_version._local_versions, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = MagicMock()
+        self.client.table.return_value.select.return_value.eq.return_value.limit.return_value.execute.return_value = (
+            SimpleNamespace(data=[dict(ROW, name="Yeni Ad")])
+        )
+        patcher = patch("panel.services.tenant_service.get_supabase_client", return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.request = SimpleNamespace(session={"hospital_id": "h1"})
+
+    def test_snapshot_stored_at_login_is_served_without_backend_calls(self):
+        tenant_service.store_snapshot(self.request, ROW)
+
+        for _ in range(3):
+            snapshot = tenant_service.get_snapshot(self.request)
+
+        self.assertEqual(snapshot["name"], "Merkez")
+        self.client.table.assert_not_called()
+
+    def test_snapshot_is_refreshed_after_a_hospital_write(self):
+        tenant_service.store_snapshot(self.request, ROW)
+
+        data_version.bump("h1", "hospitals")
+        snapshot = tenant_service.get_snapshot(self.request)
+
+        self.assertEqual(snapshot["name"], "Yeni Ad")
+        self.assertEqual(self.request.session[tenant_service.SESSION_KEY], snapshot)
+        self.client.table.assert_called_once_with("hospitals")
+
+    def test_other_tenants_and_scopes_do_not_refresh_the_snapshot(self):
+        tenant_service.store_snapshot(self.request, ROW)
+
+        data_version.bump("h2", "hospitals")
+        data_version.bump("h1", "appointments")
+        tenant_service.get_snapshot(self.request)
+
+        self.client.table.assert_not_called()
+
+    def test_process_local_versions_expire_the_snapshot(self):
+        snapshot = tenant_service.store_snapshot(self.request, ROW)
+        # Başka bir worker'daki yazma bu sürecin sürümünü değiştirmez
+        snapshot["storedAt"] -= 31
+
+        self.assertEqual(tenant_service.get_snapshot(self.request)["name"], "Yeni Ad")
+        self.client.table.assert_called_once_with("hospitals")
+
+    def test_shared_versions_keep_the_snapshot_until_bumped(self):
+        snapshot = tenant_service.store_snapshot(self.request, ROW)
+        snapshot["storedAt"] -= 3600
+
+        with patch("panel.services.data_version.is_shared", return_value=True):
+            self.assertEqual(tenant_service.get_snapshot(self.request)["name"], "Merkez")
+        self.client.table.assert_not_called()
+
+    def test_old_schema_is_rebuilt(self):
+        self.request.session[tenant_service.SESSION_KEY] = dict(
+            tenant_service.store_snapshot(self.request, ROW), schema=0
+        )
+
+        self.assertEqual(tenant_service.get_snapshot(self.request)["schema"], tenant_service.SNAPSHOT_SCHEMA)
+        self.client.table.assert_called_once_with("hospitals")
+
+    def test_anonymous_session_returns_none(self):
+        self.request.session = {}
+
+        self.assertIsNone(tenant_service.get_snapshot(self.request))
+        self.client.table.assert_not_called()
+
+    def test_stale_snapshot_is_served_when_backend_times_out(self):
+        tenant_service.store_snapshot(self.request, ROW)
+        data_version.bump("h1", "hospitals")
+        self.client.table.return_value.select.return_value.eq.return_value.limit.return_value.execute.side_effect = (
+            DeadlineExceeded()
+        )
+
+        self.assertEqual(tenant_service.get_snapshot(self.request)["name"], "Merkez")
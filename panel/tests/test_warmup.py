@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from django.apps import apps
+from django.test import override_settings
+
+from panel import warmup
+from panel.services import cache_invalidation
+
+
+class WarmUpTests(TestCase):
+    def test_failing_step_is_reported_and_others_still_run(self):
+        ok = MagicMock()
+        steps = {"ok": ok, "broken": MagicMock(side_effect=ValueError("yok"))}
+
+        with patch.dict(warmup.WARMUP_STEPS, steps, clear=True), self.assertLogs("panel.warmup", "WARNING"):
+            results = warmup.warm_up(("broken", "ok"))
+
+        ok.assert_called_once_with()
+        self.assertEqual(results["broken"], "atlandı: yok")
+        self.assertIsInstance(results["ok"], float)
+
+    def test_locations_are_loaded_in_process_when_shared_cache_is_disabled(self):
+        with patch("panel.services.location_service.warm_location_index", return_value=False), \
+                patch("panel.services.location_service._neighborhoods") as neighborhoods:
+            results = warmup.warm_up(("locations",))
+
+        neighborhoods.assert_called_once_with()
+        self.assertIsInstance(results["locations"], float)
+
+    @override_settings(SUPABASE_URL="")
+    def test_supabase_step_is_skipped_without_configuration(self):
+        with self.assertLogs("panel.warmup", "WARNING"):
+            results = warmup.warm_up(("supabase",))
+
+        self.assertTrue(results["supabase"].startswith("atlandı"))
+
+
+class ListenerAfterForkTests(TestCase):
+    def setUp(self):
+        for name in ("_listener", "_listener_pid"):
+            patcher = patch.object(cache_invalidation, name, None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @override_settings(PANEL_CACHE_INVALIDATION="local")
+    def test_listener_is_restarted_in_a_forked_worker(self):
+        with patch("panel.services.cache_invalidation.os.getpid", return_value=100):
+            master = cache_invalidation.start_from_settings()
+            self.assertIs(cache_invalidation.start_from_settings(), master)
+
+        with patch("panel.services.cache_invalidation.os.getpid", return_value=101):
+            worker = cache_invalidation.start_from_settings()
+
+        self.assertIsNot(worker, master)
+
+    @override_settings(PANEL_CACHE_INVALIDATION="local", PANEL_LISTENER_ON_READY=False)
+    def test_preloading_master_does_not_start_the_listener(self):
+        apps.get_app_config("panel").ready()
+
+        self.assertIsNone(cache_invalidation._listener)
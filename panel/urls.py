@@ -1,18 +1,33 @@
+from django.conf import settings
 from django.urls import path
 
 from . import views
 
+# ASGI altında okuma ağırlıklı sayfaların asenkron sürümleri kullanılır
+# (panel/views/async_views.py, PANEL_ASYNC_VIEWS)
+if settings.PANEL_ASYNC_VIEWS:
+    dashboard, dashboard_widget = views.adashboard, views.adashboard_widget
+    AppointmentView = views.AsyncAppointmentManagementView
+    ReviewView = views.AsyncReviewManagementView
+    ScheduleView = views.AsyncScheduleManagementView
+else:
+    dashboard, dashboard_widget = views.dashboard, views.dashboard_widget
+    AppointmentView = views.AppointmentManagementView
+    ReviewView = views.ReviewManagementView
+    ScheduleView = views.ScheduleManagementView
+
 urlpatterns = [
     path('login/', views.login_view, name='login'),
     path('register/', views.register_view, name='register'),
     path('logout/', views.logout_view, name='logout'),
-    path('', views.dashboard, name='dashboard'),
+    path('', dashboard, name='dashboard'),
+    path('dashboard/widgets/<str:name>/', dashboard_widget, name='dashboard_widget'),
     path('hospital/', views.HospitalSettingsView.as_view(), name='hospital_settings'),
     path('doctors/', views.DoctorManagementView.as_view(), name='doctor_management'),
-    path('appointments/', views.AppointmentManagementView.as_view(), name='appointment_management'),
-    path('schedule/', views.ScheduleManagementView.as_view(), name='schedule_management'),
+    path('appointments/', AppointmentView.as_view(), name='appointment_management'),
+    path('schedule/', ScheduleView.as_view(), name='schedule_management'),
     path('services/', views.ServiceManagementView.as_view(), name='service_management'),
-    path('reviews/', views.ReviewManagementView.as_view(), name='review_management'),
+    path('reviews/', ReviewView.as_view(), name='review_management'),
     path('settings/', views.SettingsView.as_view(), name='settings'),
     path('api/locations/provinces/', views.location_provinces, name='location_provinces'),
     path('api/locations/districts/<str:province_id>/', views.location_districts, name='location_districts'),
@@ -5,6 +5,7 @@ Ortak kullanılan helper fonksiyonları.
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
 
@@ -53,13 +54,12 @@ def format_date(date_str: str, format_str: str = "%d.%m.%Y") -> str:
     Returns:
         Formatlanmış tarih string'i
     """
-    from datetime import datetime
-    
-    try:
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
-        return date_obj.strftime(format_str)
-    except (ValueError, TypeError, AttributeError):
+    from .dateparse import parse_date
+
+    date_obj = parse_date(date_str)
+    if date_obj is None:
         return date_str  # Formatlanamazsa orijinal değeri döndür
+    return date_obj.strftime(format_str)
 
 
 def format_datetime(datetime_str: str, format_str: str = "%d.%m.%Y %H:%M") -> str:
@@ -98,7 +98,7 @@ def safe_get(data: dict, *keys, default: Any = None) -> Any:
     """
     result = data
     for key in keys:
-        if isinstance(result, dict):
+        if isinstance(result, Mapping):
             result = result.get(key)
             if result is None:
                 return default
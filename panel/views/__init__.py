@@ -1,11 +1,46 @@
-from .auth_views import login_view, register_view, logout_view, login_required
-from .dashboard_views import dashboard
-from .hospital_views import HospitalSettingsView
-from .doctor_views import DoctorManagementView
-from .appointment_views import AppointmentManagementView
-from .schedule_views import ScheduleManagementView
-from .service_views import ServiceManagementView
-from .review_views import ReviewManagementView
-from .settings_views import SettingsView
-from .location_views import location_provinces, location_districts, location_neighborhoods
+"""Panel view'ları.
 
+View modülleri ilk erişimde import edilir (PEP 562): `panel.views` paketini
+import etmek tüm servisleri ve formları yüklemez.
+"""
+
+from importlib import import_module
+
+_VIEW_MODULES = {
+    "login_view": "auth_views",
+    "register_view": "auth_views",
+    "logout_view": "auth_views",
+    "login_required": "auth_views",
+    "dashboard": "dashboard_views",
+    "dashboard_widget": "dashboard_views",
+    "HospitalSettingsView": "hospital_views",
+    "DoctorManagementView": "doctor_views",
+    "AppointmentManagementView": "appointment_views",
+    "ScheduleManagementView": "schedule_views",
+    "ServiceManagementView": "service_views",
+    "ReviewManagementView": "review_views",
+    "SettingsView": "settings_views",
+    "location_provinces": "location_views",
+    "location_districts": "location_views",
+    "location_neighborhoods": "location_views",
+    "adashboard": "async_views",
+    "adashboard_widget": "async_views",
+    "AsyncAppointmentManagementView": "async_views",
+    "AsyncReviewManagementView": "async_views",
+    "AsyncScheduleManagementView": "async_views",
+}
+
+__all__ = list(_VIEW_MODULES)
+
+
+def __getattr__(name):
+    module = _VIEW_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_VIEW_MODULES))
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import datetime
 from django.shortcuts import render, redirect
 from django.views import View
@@ -6,8 +7,23 @@ from django.contrib import messages
 from django.core.paginator import Paginator
 from .auth_views import login_required
 from ..forms import AppointmentFilterForm, AppointmentStatusForm
+from ..dateparse import parse_datetime
 from ..utils import build_doctor_choices, build_service_choices, format_date
-from ..services import appointment_service, doctor_service, hospital_service, user_service, event_service
+from ..services import appointment_service, doctor_service, hospital_service, user_service, event_service, swr_cache
+
+@dataclass(slots=True)
+class AppointmentRow:
+    """Randevu listesindeki tek satır; tarih/saat bir kez ayrıştırılır."""
+
+    data: dict
+    patient: str
+    doctor: str
+    service: str
+    status_label: str
+    status_class: str
+    formatted_date: str
+    scheduled_at: datetime | None
+
 
 class AppointmentManagementView(View):
     template_name = "panel/appointment_management.html"
@@ -35,6 +51,7 @@ class AppointmentManagementView(View):
                     form.cleaned_data["appointment_id"],
                     status=form.cleaned_data["status"],
                 )
+                swr_cache.invalidate_hospital(request.session.get("hospital_id"))
                 messages.success(request, "Randevu durumu güncellendi.")
                 event_service.log_event(
                     "appointment_status_updated",
@@ -49,6 +66,7 @@ class AppointmentManagementView(View):
 
         elif action == "delete_appointment":
             appointment_service.delete_appointment(request.POST.get("appointment_id"))
+            swr_cache.invalidate_hospital(request.session.get("hospital_id"))
             messages.success(request, "Randevu silindi.")
             event_service.log_event(
                 "appointment_deleted",
@@ -63,39 +81,53 @@ class AppointmentManagementView(View):
     def _build_context(self, request):
         doctors = doctor_service.get_doctors(request)
         services = hospital_service.get_services()
-        doctor_choices = build_doctor_choices(doctors)
-        service_choices = build_service_choices(services)
+        filter_form, filters = self._filter_form(request, doctors, services)
+        appointments = appointment_service.filter_appointments(
+            **self._appointment_filters(filters), request=request
+        )
+        return self._assemble_context(
+            request,
+            filter_form,
+            filters,
+            appointments,
+            doctors,
+            services,
+            user_service.get_user_map(),
+            appointment_service.get_summary(request=request),
+        )
 
+    def _filter_form(self, request, doctors, services):
         filter_form = AppointmentFilterForm(
             request.GET or None,
-            doctor_choices=doctor_choices,
-            service_choices=service_choices,
+            doctor_choices=build_doctor_choices(doctors),
+            service_choices=build_service_choices(services),
         )
-
         filters = filter_form.cleaned_data if filter_form.is_valid() else {}
-        start_date = filters.get("start_date")
-        end_date = filters.get("end_date")
-        per_page = filters.get("per_page") or request.GET.get("per_page", "10")
-        
-        appointments = appointment_service.filter_appointments(
-            status=filters.get("status") or None,
-            doctor_id=filters.get("doctor") or None,
-            service_id=filters.get("service") or None,
-            start_date=start_date,
-            end_date=end_date,
-            request=request,
-        )
+        return filter_form, filters
+
+    def _appointment_filters(self, filters):
+        return {
+            "status": filters.get("status") or None,
+            "doctor_id": filters.get("doctor") or None,
+            "service_id": filters.get("service") or None,
+            "start_date": filters.get("start_date"),
+            "end_date": filters.get("end_date"),
+        }
 
-        enriched = self._enrich_appointments(appointments, doctors, services)
-        enriched = self._sort_appointments(enriched)
+    def _assemble_context(self, request, filter_form, filters, appointments, doctors, services, user_map, summary):
+        per_page = filters.get("per_page") or request.GET.get("per_page", "10")
+        # Sıralama yalnızca durum ve tarihe bakar; isim eşleme ve tarih
+        # biçimlendirme sadece gösterilen sayfanın satırları için yapılır
+        ordered = self._sort_appointments(appointments)
 
         per_page = int(per_page or "10")
-        paginator = Paginator(enriched, per_page)
+        paginator = Paginator(ordered, per_page)
         page_number = request.GET.get("page", 1)
         try:
             page_obj = paginator.get_page(page_number)
         except:
             page_obj = paginator.get_page(1)
+        page_obj.object_list = self._enrich_appointments(page_obj.object_list, doctors, services, user_map)
 
         if filter_form.is_valid():
             filter_form.fields["per_page"].initial = str(per_page)
@@ -106,91 +138,70 @@ class AppointmentManagementView(View):
             "page_title": "Randevu Yönetimi",
             "filter_form": filter_form,
             "appointments": page_obj,
-            "summary": appointment_service.get_summary(request=request),
+            "summary": summary,
             "paginator": paginator,
+            # Durum seçici satır başına form yerine ortak şablon parçasıyla çizilir
+            "status_choices": AppointmentStatusForm.base_fields["status"].choices,
         }
         return context
-    
+
+    def _classify(self, apt, now):
+        """Randevunun durum sınıfı ve tarih/saati (ayrıştırılamazsa None)."""
+        apt_datetime = parse_datetime(apt.get("date"), apt.get("time", "00:00"))
+        if (apt["status"] or "completed") == "cancelled":
+            return "cancelled", apt_datetime
+        if apt_datetime and apt_datetime >= now:
+            return "planned", apt_datetime
+        return "completed", apt_datetime
+
     def _sort_appointments(self, appointments):
+        """Yaklaşan, iptal ve geçmiş sırasıyla (randevu, durum sınıfı, tarih) üçlüleri."""
         upcoming = []
         cancelled = []
         completed = []
 
-        def parse_datetime(apt):
-            try:
-                date_str = apt["data"].get("date", "")
-                time_str = apt["data"].get("time", "00:00")
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
-                time_obj = datetime.strptime(time_str, "%H:%M").time()
-                return datetime.combine(date_obj, time_obj)
-            except (ValueError, KeyError):
-                return datetime.now()
-
         now = datetime.now()
 
         for apt in appointments:
-            status = apt["data"].get("status", "completed")
-            apt_datetime = parse_datetime(apt)
-
-            if status == "cancelled":
-                cancelled.append((apt_datetime, apt))
+            status_class, scheduled_at = self._classify(apt, now)
+            # Tarihi ayrıştırılamayan randevular "şimdi" kabul edilir
+            apt_datetime = scheduled_at or now
+            item = (apt, status_class, scheduled_at)
+            if status_class == "cancelled":
+                cancelled.append((apt_datetime, item))
             elif apt_datetime >= now:
-                upcoming.append((apt_datetime, apt))
+                upcoming.append((apt_datetime, item))
             else:
-                completed.append((apt_datetime, apt))
+                completed.append((apt_datetime, item))
 
-        upcoming.sort(key=lambda item: item[0])
-        cancelled.sort(key=lambda item: item[0], reverse=True)
-        completed.sort(key=lambda item: item[0], reverse=True)
+        upcoming.sort(key=lambda entry: entry[0])
+        cancelled.sort(key=lambda entry: entry[0], reverse=True)
+        completed.sort(key=lambda entry: entry[0], reverse=True)
 
         ordered = upcoming + cancelled + completed
-        return [item[1] for item in ordered]
+        return [entry[1] for entry in ordered]
 
-    def _enrich_appointments(self, appointments, doctors, services):
+    def _enrich_appointments(self, items, doctors, services, user_map):
+        """Sıralanmış (randevu, durum sınıfı, tarih) üçlülerinden gösterilecek satırlar."""
         doctor_map = {doc["id"]: doc for doc in doctors}
         service_map = {svc["id"]: svc for svc in services}
-        user_map = user_service.get_user_map()
         enriched = []
-        for apt in appointments:
+        for apt, status_class, apt_datetime in items:
             doctor = doctor_map.get(apt["doctorId"])
             service = service_map.get(apt["service"])
             user = user_map.get(apt["userId"])
-            status = apt["status"] or "completed"
-            try:
-                date_str = apt.get("date", "")
-                time_str = apt.get("time", "00:00")
-                apt_datetime = datetime.strptime(
-                    f"{date_str} {time_str}", "%Y-%m-%d %H:%M"
-                )
-            except (ValueError, TypeError):
-                apt_datetime = None
+            status_label, status_class = self.STATUS_LABELS[status_class]
 
-            if status == "cancelled":
-                status_label, status_class = self.STATUS_LABELS["cancelled"]
-            else:
-                if apt_datetime and apt_datetime >= datetime.now():
-                    status_label, status_class = self.STATUS_LABELS["planned"]
-                else:
-                    status_label, status_class = self.STATUS_LABELS["completed"]
-            
-            formatted_date = format_date(apt.get("date", ""), "%d.%m.%Y")
-            
             enriched.append(
-                {
-                    "data": apt,
-                    "patient": f"{user['name']} {user['surname']}" if user else "Hasta",
-                    "doctor": f"{doctor['name']} {doctor['surname']}" if doctor else "Doktor",
-                    "service": service["name"] if service else "Hizmet",
-                    "status_label": status_label,
-                    "status_class": status_class,
-                    "formatted_date": formatted_date,
-                    "status_form": AppointmentStatusForm(
-                        initial={
-                            "appointment_id": apt["id"],
-                            "status": apt["status"],
-                        }
-                    ),
-                }
+                AppointmentRow(
+                    data=apt,
+                    patient=f"{user['name']} {user['surname']}" if user else "Hasta",
+                    doctor=f"{doctor['name']} {doctor['surname']}" if doctor else "Doktor",
+                    service=service["name"] if service else "Hizmet",
+                    status_label=status_label,
+                    status_class=status_class,
+                    formatted_date=format_date(apt.get("date", ""), "%d.%m.%Y"),
+                    scheduled_at=apt_datetime,
+                )
             )
         return enriched
-
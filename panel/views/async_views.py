@@ -0,0 +1,154 @@
+"""Okuma ağırlıklı sayfaların ASGI (asenkron) sürümleri.
+
+Senkron view'ların alt sınıflarıdır; filtre, zenginleştirme ve context kodu
+ortaktır. GET istekleri asenkron servisleri (`a` önekli) kullanır ve bir
+sayfadaki bağımsız sorgular `asyncio.gather` ile aynı anda çalışır. POST
+(yazma) istekleri senkron gövdeyi bir thread'de çalıştırır.
+
+`PANEL_ASYNC_VIEWS` açıkken `panel/urls.py` bu view'ları kullanır;
+`dent_admin_panel/asgi.py` ayarı varsayılan olarak açar.
+"""
+
+import asyncio
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
+from django.http import Http404, JsonResponse
+from django.shortcuts import render
+from django.utils.decorators import method_decorator
+from django.views import View
+
+from .appointment_views import AppointmentManagementView
+from .auth_views import login_required
+from .dashboard_views import (
+    WIDGET_DEADLINE,
+    _WidgetJSONEncoder,
+    _stale_dashboard_context,
+    _stale_widget_response,
+)
+from .review_views import ReviewManagementView
+from .schedule_views import ScheduleManagementView
+from ..services import (
+    appointment_service,
+    dashboard_service,
+    doctor_service,
+    review_service,
+    schedule_service,
+    service_service,
+    user_service,
+)
+from ..services.circuit_breaker import BACKEND_UNAVAILABLE
+from ..services.deadline import with_deadline
+
+# Şablon render'ı ve context processor'lar senkron kod çalıştırır
+arender = sync_to_async(render)
+
+
+class AsyncPanelView:
+    """Asenkron panel view'ları için ortak temel (senkron view'dan önce miras alınır)."""
+
+    @method_decorator(login_required)
+    async def dispatch(self, request, *args, **kwargs):
+        return await View.dispatch(self, request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        return await sync_to_async(super().post)(request, *args, **kwargs)
+
+
+class AsyncAppointmentManagementView(AsyncPanelView, AppointmentManagementView):
+    async def get(self, request):
+        doctors, services, user_map, summary = await asyncio.gather(
+            doctor_service.aget_doctors(request),
+            service_service.aget_services(),
+            user_service.aget_user_map(),
+            appointment_service.aget_summary(request=request),
+        )
+        # Filtre formu doktor ve hizmet seçenekleriyle doğrulanır; randevu sorgusu ondan sonra
+        filter_form, filters = self._filter_form(request, doctors, services)
+        appointments = await appointment_service.afilter_appointments(
+            **self._appointment_filters(filters), request=request
+        )
+        context = self._assemble_context(
+            request, filter_form, filters, appointments, doctors, services, user_map, summary
+        )
+        return await arender(request, self.template_name, context)
+
+
+class AsyncReviewManagementView(AsyncPanelView, ReviewManagementView):
+    async def get(self, request):
+        reviews, stats, doctors = await review_service.aget_review_page(
+            request=request, **self._review_filters(request)
+        )
+        context = self._assemble_context(request, doctors, reviews, stats)
+        return await arender(request, self.template_name, context)
+
+
+class AsyncScheduleManagementView(AsyncPanelView, ScheduleManagementView):
+    async def get(self, request):
+        year, month, selected_doctor_id = self._calendar_params(request)
+        doctors, calendar_data = await asyncio.gather(
+            doctor_service.aget_doctors(request),
+            schedule_service.aget_calendar_data(year, month, selected_doctor_id or None, request=request),
+        )
+        context = self._assemble_context(year, month, selected_doctor_id, doctors, calendar_data)
+        return await arender(request, self.template_name, context)
+
+
+async def _afragment_widget_context(request, names) -> dict:
+    """Parça önbelleğindeki widget'lar için anahtar context'i.
+
+    Güncel sürümün parçası önbellekte olmayan widget'ların verisi asenkron
+    yüklenir (SWR önbelleği atlanır); şablondaki `{% cache %}` anahtarı
+    (`dashboard.<ad>`) ile aynı anahtar kontrol edilir.
+    """
+    context = dashboard_service.get_fragment_context(request, names)
+    fragments = caches["fragments"]
+    missing = []
+    for name in names:
+        key = make_template_fragment_key(f"dashboard.{name}", [context["fragment_versions"][name]])
+        if await fragments.aget(key) is None:
+            missing.append(name)
+    hospital_id = request.session.get("hospital_id")
+    for part in await asyncio.gather(*(dashboard_service.aload_widget(name, hospital_id) for name in missing)):
+        context.update(part)
+    return context
+
+
+@login_required
+async def adashboard(request):
+    """`dashboard_views.dashboard`'ın asenkron sürümü."""
+    inline = request.GET.get("inline") == "1"
+    context = {"page_title": "Genel Bakış", "inline": inline}
+    if not inline:
+        return await arender(request, "panel/dashboard.html", context)
+    try:
+        widgets = await dashboard_service.aget_dashboard_context(request)
+        widgets.update(await _afragment_widget_context(request, tuple(dashboard_service.FRAGMENT_SCOPES)))
+    except BACKEND_UNAVAILABLE:
+        widgets = await sync_to_async(_stale_dashboard_context)(request)
+    return await arender(request, "panel/dashboard.html", {**widgets, **context})
+
+
+@with_deadline(WIDGET_DEADLINE)
+@login_required
+async def adashboard_widget(request, name: str):
+    """`dashboard_views.dashboard_widget`'ın asenkron sürümü."""
+    if name not in dashboard_service.WIDGETS:
+        raise Http404("Widget bulunamadı")
+
+    started = time.perf_counter()
+    template_name = f"panel/includes/dashboard/{name}.html"
+    try:
+        if request.GET.get("format") == "json":
+            response = JsonResponse(await dashboard_service.aget_widget(name, request), encoder=_WidgetJSONEncoder)
+        elif name in dashboard_service.FRAGMENT_SCOPES:
+            response = await arender(request, template_name, await _afragment_widget_context(request, (name,)))
+        else:
+            response = await arender(request, template_name, await dashboard_service.aget_widget(name, request))
+    except BACKEND_UNAVAILABLE:
+        response = await sync_to_async(_stale_widget_response)(request, name)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    response["Server-Timing"] = f'widget;desc="{name}";dur={elapsed_ms:.1f}'
+    return response
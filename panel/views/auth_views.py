@@ -1,13 +1,26 @@
 from functools import wraps
+from inspect import iscoroutinefunction
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from ..forms import LoginForm, HospitalRegistrationForm
-from ..services import auth_service, hospital_registration_service, location_service
-from ..services.supabase_client import get_supabase_client
+from ..services import auth_service, hospital_registration_service, location_service, tenant_service
 
 # Login required decorator
 def login_required(view_func):
-    """Kullanıcının giriş yapmış olmasını kontrol eder."""
+    """Kullanıcının giriş yapmış olmasını kontrol eder.
+
+    Asenkron view'larda session `aget` ile yüklenir; sonraki senkron
+    `request.session` erişimleri (servisler, context processor) veritabanına gitmez.
+    """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _async_wrapped_view(request, *args, **kwargs):
+            if not await request.session.aget('user_id') or not await request.session.aget('hospital_id'):
+                messages.warning(request, "Lütfen giriş yapın.")
+                return redirect('login')
+            return await view_func(request, *args, **kwargs)
+        return _async_wrapped_view
+
     @wraps(view_func)
     def _wrapped_view(request, *args, **kwargs):
         if not request.session.get('user_id') or not request.session.get('hospital_id'):
@@ -26,37 +39,17 @@ def login_view(request):
             password = form.cleaned_data['password']
             
             try:
-                # 1. Hospital code'dan hospital_id bul
-                supabase = get_supabase_client()
-                hospital_result = supabase.table("hospitals").select("id, status, name").eq("hospital_code", hospital_code).single().execute()
-                
-                if not hospital_result.data:
-                    messages.error(request, "Geçersiz hastane kodu.")
-                    return render(request, "panel/login.html", {"form": form})
-                
-                hospital = hospital_result.data
-                
-                # 2. Hastane onaylanmış mı kontrol et
-                if hospital.get("status") != "approved":
-                    messages.error(request, "Hastaneniz henüz onaylanmamış. Lütfen onay bekleyin.")
-                    return render(request, "panel/login.html", {"form": form})
-                
-                # 3. Supabase Auth ile giriş yap
-                auth_response = auth_service.sign_in(email, password)
+                # Hastane sorgusu ve Auth girişi paralel çalışır
+                hospital, auth_response = auth_service.login(hospital_code, email, password)
                 user_id = auth_response["user_id"]
                 
-                # 4. Kullanıcının bu hastaneye ait olduğunu kontrol et
-                hospital_check = supabase.table("hospitals").select("id").eq("id", hospital["id"]).eq("created_by_user_id", user_id).execute()
-                
-                if not hospital_check.data:
-                    messages.error(request, "Bu email adresi bu hastaneye ait değil.")
-                    return render(request, "panel/login.html", {"form": form})
-                
-                # 5. Session'a kaydet
+                # Session'a kaydet
                 request.session['user_id'] = user_id
                 request.session['hospital_id'] = str(hospital["id"])
                 request.session['hospital_name'] = hospital.get("name", "")
                 request.session['user_email'] = email
+                # Ana şablon sonraki sayfalarda backend'e gitmeden render edilir
+                tenant_service.store_snapshot(request, hospital)
                 
                 messages.success(request, f"Hoş geldiniz, {hospital.get('name', '')}!")
                 return redirect('dashboard')
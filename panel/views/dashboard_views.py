@@ -1,12 +1,141 @@
+import time
+from collections.abc import Mapping
+from dataclasses import asdict, is_dataclass
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import render
+from django.utils.functional import SimpleLazyObject
 from .auth_views import login_required
-from ..services.dashboard_service import load_dashboard_context
+from ..services.dashboard_service import (
+    FRAGMENT_SCOPES,
+    WIDGETS,
+    get_cached_dashboard_context,
+    get_cached_widget,
+    get_dashboard_context,
+    get_fragment_context,
+    get_widget,
+    load_widget,
+)
+from ..services.circuit_breaker import BACKEND_UNAVAILABLE
+from ..services.deadline import with_deadline
+
+# Widget endpoint'lerinin zaman bütçesi (saniye); aşılırsa önbellekteki veri gösterilir
+WIDGET_DEADLINE = 3
+
+
+class _WidgetJSONEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        if is_dataclass(o):
+            return asdict(o)
+        if isinstance(o, Mapping):
+            # Kayıt sınıfları (records.Record) dict alt sınıfı değildir
+            return dict(o)
+        return super().default(o)
+
+
+def _fragment_widget_context(request, names) -> dict:
+    """Parça önbelleğindeki widget'lar için anahtar ve tembel veri context'i.
+
+    Veri yalnızca parça önbellekte yoksa yüklenir ve SWR önbelleği atlanır:
+    yeni sürümün anahtarı altına eski veri yazılmaz.
+    """
+    context = get_fragment_context(request, names)
+    hospital_id = request.session.get("hospital_id")
+    for name in names:
+        context[name] = SimpleLazyObject(lambda name=name: load_widget(name, hospital_id)[name])
+    return context
+
+
+def _stale_dashboard_context(request) -> dict:
+    """Backend yanıt vermediğinde inline dashboard için önbellekteki son veriler.
+
+    Dashboard context'i önbellekte yoksa widget'lar, varsa yalnızca parça
+    widget'ları (context'te hesaplanmazlar) tek tek son değerleriyle
+    doldurulur; değeri olmayan widget'larda "Veri yüklenemedi" gösterilir.
+    Parça önbelleğine eski veri yazılmaz (`fragment_ttls` 0).
+    """
+    context = get_cached_dashboard_context(request)
+    names = WIDGETS if context is None else FRAGMENT_SCOPES
+    context, unavailable = context or {}, []
+    for name in names:
+        widget = get_cached_widget(name, request)
+        if widget is None:
+            unavailable.append(name)
+        else:
+            context.update(widget)
+    context["unavailable_widgets"] = unavailable
+    context.update(get_fragment_context(request, tuple(FRAGMENT_SCOPES)))
+    context["fragment_ttls"] = dict.fromkeys(FRAGMENT_SCOPES, 0)
+    return context
+
+
+def _stale_widget_response(request, name: str):
+    """Backend yanıt vermediğinde widget'ı önbellekteki son veriyle döndürür; veri yoksa 503."""
+    stale = get_cached_widget(name, request)
+    if stale is None:
+        response = HttpResponse(status=503)
+        response["Retry-After"] = "5"
+        return response
+    if request.GET.get("format") == "json":
+        response = JsonResponse(stale, encoder=_WidgetJSONEncoder)
+    else:
+        context = dict(stale)
+        if name in FRAGMENT_SCOPES:
+            context.update(get_fragment_context(request, (name,)))
+            context["fragment_ttls"] = {name: 0}
+        response = render(request, f"panel/includes/dashboard/{name}.html", context)
+    response["X-Panel-Stale"] = "1"
+    return response
+
 
 @login_required
 def dashboard(request):
-    """Panel ana sayfası: JSON verilerinden özet metrikleri oluşturur."""
-    context = load_dashboard_context(request)
-    context["page_title"] = "Genel Bakış"
+    """Panel ana sayfası.
+
+    Varsayılan olarak yalnızca sayfa iskeleti render edilir; widget'lar
+    tarayıcıdan `dashboard_widget` endpoint'leri üzerinden paralel yüklenir.
+    `?inline=1` ile (JavaScript kapalıyken) tüm widget'lar sunucuda render edilir;
+    isteğin süresi dolarsa önbellekteki son veriler gösterilir.
+    """
+    inline = request.GET.get("inline") == "1"
     # hospital context processor tarafından otomatik ekleniyor
-    return render(request, "panel/dashboard.html", context)
+    context = {"page_title": "Genel Bakış", "inline": inline}
+    if not inline:
+        return render(request, "panel/dashboard.html", context)
+    try:
+        widgets = get_dashboard_context(request)
+        widgets.update(_fragment_widget_context(request, tuple(FRAGMENT_SCOPES)))
+        return render(request, "panel/dashboard.html", {**widgets, **context})
+    except BACKEND_UNAVAILABLE:
+        return render(request, "panel/dashboard.html", {**_stale_dashboard_context(request), **context})
+
+
+@with_deadline(WIDGET_DEADLINE)
+@login_required
+def dashboard_widget(request, name: str):
+    """Tek bir dashboard widget'ını HTML parçası veya `?format=json` ile JSON döndürür.
+
+    Widget'ın hesaplanma süresi `Server-Timing` başlığında raporlanır.
+    Parça önbelleğindeki widget'larda (FRAGMENT_SCOPES) veri yalnızca güncel
+    sürümün HTML'i önbellekte yoksa hesaplanır. Backend `WIDGET_DEADLINE`
+    içinde yanıt vermezse (veya devresi açıksa) önbellekteki son veri
+    (`X-Panel-Stale`) veya 503 döner.
+    """
+    if name not in WIDGETS:
+        raise Http404("Widget bulunamadı")
 
+    started = time.perf_counter()
+    try:
+        if request.GET.get("format") == "json":
+            response = JsonResponse(get_widget(name, request), encoder=_WidgetJSONEncoder)
+        elif name in FRAGMENT_SCOPES:
+            context = _fragment_widget_context(request, (name,))
+            response = render(request, f"panel/includes/dashboard/{name}.html", context)
+        else:
+            response = render(request, f"panel/includes/dashboard/{name}.html", get_widget(name, request))
+    except BACKEND_UNAVAILABLE:
+        response = _stale_widget_response(request, name)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    response["Server-Timing"] = f'widget;desc="{name}";dur={elapsed_ms:.1f}'
+    return response
@@ -5,14 +5,19 @@ from django.contrib import messages
 from .auth_views import login_required
 from ..forms import DoctorForm, DoctorWorkingHoursForm, DoctorHolidayForm, DAYS
 from ..utils import build_service_choices, validate_working_hours_form
-from ..services import doctor_service, hospital_service, event_service
+from ..services import doctor_service, hospital_service, event_service, swr_cache
+from ..services.concurrency import ConcurrentUpdateError
 
 class DoctorManagementView(View):
     template_name = "panel/doctor_management.html"
     
     @method_decorator(login_required)
     def dispatch(self, request, *args, **kwargs):
-        return super().dispatch(request, *args, **kwargs)
+        response = super().dispatch(request, *args, **kwargs)
+        if request.method == "POST":
+            # Dashboard ve takvim önbelleği değişikliği hemen göstersin
+            swr_cache.invalidate_hospital(request.session.get("hospital_id"))
+        return response
 
     def get(self, request):
         return render(request, self.template_name, self._build_context(request))
@@ -38,7 +43,16 @@ class DoctorManagementView(View):
         elif action == "update_doctor":
             form = DoctorForm(request.POST, request.FILES, service_choices=service_choices)
             if form.is_valid():
-                doctor_service.update_doctor(form.cleaned_data["doctor_id"], form.cleaned_data, request.FILES.get("image"))
+                try:
+                    doctor_service.update_doctor(
+                        form.cleaned_data["doctor_id"],
+                        form.cleaned_data,
+                        request.FILES.get("image"),
+                        expected_updated_at=form.cleaned_data.get("version") or None,
+                    )
+                except ConcurrentUpdateError as exc:
+                    messages.error(request, str(exc))
+                    return redirect("doctor_management")
                 messages.success(request, "Doktor bilgileri güncellendi.")
                 event_service.log_event(
                     "doctor_updated",
@@ -131,6 +145,7 @@ class DoctorManagementView(View):
             general_form = DoctorForm(
                 initial={
                     "doctor_id": doctor["id"],
+                    "version": doctor.get("updatedAt", ""),
                     "name": doctor["name"],
                     "surname": doctor["surname"],
                     "bio": doctor.get("bio", ""),
@@ -13,14 +13,19 @@ from ..forms import (
     DAYS
 )
 from ..utils import build_service_choices
-from ..services import hospital_service, location_service, event_service
+from ..services import hospital_service, location_service, event_service, swr_cache
+from ..services.concurrency import ensure_version
 
 class HospitalSettingsView(View):
     template_name = "panel/hospital_settings.html"
     
     @method_decorator(login_required)
     def dispatch(self, request, *args, **kwargs):
-        return super().dispatch(request, *args, **kwargs)
+        response = super().dispatch(request, *args, **kwargs)
+        if request.method == "POST":
+            # Dashboard ve takvim önbelleği değişikliği hemen göstersin
+            swr_cache.invalidate_hospital(request.session.get("hospital_id"))
+        return response
 
     def get(self, request):
         context = self._build_context(request)
@@ -46,6 +51,7 @@ class HospitalSettingsView(View):
             )
             if form.is_valid():
                 try:
+                    ensure_version(hospital, request.POST.get("version"))
                     hospital_service.update_general_info(
                         hospital,
                         form.cleaned_data,
@@ -73,7 +79,14 @@ class HospitalSettingsView(View):
         elif action == "services":
             form = HospitalServicesForm(request.POST, service_choices=build_service_choices(services))
             if form.is_valid():
-                hospital_service.update_services(hospital, form.cleaned_data.get("services", []), request)
+                try:
+                    ensure_version(hospital, request.POST.get("version"))
+                    hospital_service.update_services(hospital, form.cleaned_data.get("services", []), request)
+                except ValueError as exc:
+                    messages.error(request, str(exc))
+                    context = self._build_context(request)
+                    context["active_tab"] = "services"
+                    return render(request, self.template_name, context)
                 messages.success(request, "Hizmet listesi güncellendi.")
                 event_service.log_event(
                     "hospital_services_updated",
@@ -100,8 +113,15 @@ class HospitalSettingsView(View):
                     return render(request, self.template_name, context)
                 
                 working_hours = hospital_service.build_working_hours_from_form(form.cleaned_data)
-                hospital_service.update_working_hours(hospital, working_hours, request)
-                hospital_service.update_is_open_24_hours(hospital, is_open_24_hours, request)
+                try:
+                    ensure_version(hospital, request.POST.get("version"))
+                    hospital_service.update_working_hours(hospital, working_hours, request)
+                    hospital_service.update_is_open_24_hours(hospital, is_open_24_hours, request)
+                except ValueError as exc:
+                    messages.error(request, str(exc))
+                    context = self._build_context(request)
+                    context["active_tab"] = "hours"
+                    return render(request, self.template_name, context)
                 messages.success(request, "Çalışma saatleri güncellendi.")
                 event_service.log_event(
                     "hospital_hours_updated",
@@ -134,7 +154,7 @@ class HospitalSettingsView(View):
                             added_count = 0
                             for file in files:
                                 try:
-                                    hospital_service.add_gallery_image(hospital, file, request)
+                                    hospital = hospital_service.add_gallery_image(hospital, file, request)
                                     added_count += 1
                                 except ValueError as exc:
                                     messages.error(request, f"Görsel eklenemedi: {str(exc)}")
@@ -319,6 +339,7 @@ class HospitalSettingsView(View):
             "days": DAYS,
             "working_hours_json": working_hours_json,
             "current_logo": current_logo,
+            "hospital_version": hospital.get("updatedAt", ""),
         }
         return context
 
@@ -67,13 +67,11 @@ class ReviewManagementView(View):
 
     def _build_context(self, request):
         doctors = doctor_service.get_doctors(request)
-        doctor_choices = build_doctor_choices(doctors)
-
-        filter_form = ReviewFilterForm(
-            request.GET,
-            doctor_choices=doctor_choices,
-        )
+        reviews = review_service.get_reviews_with_details(**self._review_filters(request), request=request)
+        stats = review_service.get_review_statistics(request=request)
+        return self._assemble_context(request, doctors, reviews, stats)
 
+    def _review_filters(self, request):
         doctor_id = request.GET.get("doctor") or None
         min_rating = int(request.GET.get("min_rating")) if request.GET.get("min_rating") else None
         max_rating = int(request.GET.get("max_rating")) if request.GET.get("max_rating") else None
@@ -85,19 +83,22 @@ class ReviewManagementView(View):
             has_reply = True
         elif has_reply_str == "false":
             has_reply = False
+        return {
+            "doctor_id": doctor_id,
+            "min_rating": min_rating,
+            "max_rating": max_rating,
+            "date_from": date_from,
+            "date_to": date_to,
+            "has_reply": has_reply,
+        }
 
-        reviews = review_service.get_reviews_with_details(
-            doctor_id=doctor_id,
-            min_rating=min_rating,
-            max_rating=max_rating,
-            date_from=date_from,
-            date_to=date_to,
-            has_reply=has_reply,
-            request=request,
+    def _assemble_context(self, request, doctors, reviews, stats):
+        doctor_choices = build_doctor_choices(doctors)
+        filter_form = ReviewFilterForm(
+            request.GET,
+            doctor_choices=doctor_choices,
         )
 
-        stats = review_service.get_review_statistics(request=request)
-
         review_cards = []
         for review in reviews:
             created_at = review.get("createdAt", "")
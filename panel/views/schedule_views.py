@@ -6,7 +6,7 @@ from django.contrib import messages
 from .auth_views import login_required
 from ..forms import ScheduleFilterForm, ScheduleHolidayForm
 from ..utils import build_doctor_choices
-from ..services import doctor_service, schedule_service, hospital_service
+from ..services import doctor_service, schedule_service, hospital_service, swr_cache
 
 class ScheduleManagementView(View):
     template_name = "panel/schedule_management.html"
@@ -16,13 +16,22 @@ class ScheduleManagementView(View):
         return super().dispatch(request, *args, **kwargs)
 
     def get(self, request):
+        year, month, selected_doctor_id = self._calendar_params(request)
+        doctors = doctor_service.get_doctors(request)
+        calendar_data = schedule_service.get_calendar_data(
+            year, month, selected_doctor_id if selected_doctor_id else None, request=request
+        )
+        context = self._assemble_context(year, month, selected_doctor_id, doctors, calendar_data)
+        return render(request, self.template_name, context)
+
+    def _calendar_params(self, request):
         today = date.today()
         year = int(request.GET.get("year", today.year))
         month_param = request.GET.get("month", str(today.month))
         month = int(month_param) if month_param else today.month
-        selected_doctor_id = request.GET.get("doctor", "")
+        return year, month, request.GET.get("doctor", "")
 
-        doctors = doctor_service.get_doctors(request)
+    def _assemble_context(self, year, month, selected_doctor_id, doctors, calendar_data):
         doctor_choices = build_doctor_choices(doctors)
 
         filter_form = ScheduleFilterForm(
@@ -30,10 +39,6 @@ class ScheduleManagementView(View):
             doctor_choices=doctor_choices,
         )
 
-        calendar_data = schedule_service.build_calendar_data(
-            year, month, selected_doctor_id if selected_doctor_id else None, request=request
-        )
-
         holiday_form = ScheduleHolidayForm(doctor_choices=doctor_choices)
 
         context = {
@@ -43,7 +48,7 @@ class ScheduleManagementView(View):
             "holiday_form": holiday_form,
             "doctors": doctors,
         }
-        return render(request, self.template_name, context)
+        return context
 
     def post(self, request):
         form_type = request.POST.get("form_type")
@@ -68,6 +73,9 @@ class ScheduleManagementView(View):
                 hospital_service.delete_holiday(holiday_id)
                 messages.success(request, "Tatil silindi.")
 
+        # Takvim ve dashboard önbelleği yeni tatili hemen göstersin
+        swr_cache.invalidate_hospital(request.session.get("hospital_id"))
+
         today = date.today()
         year = int(request.POST.get("year", request.GET.get("year", today.year)))
         month = int(request.POST.get("month", request.GET.get("month", today.month)))
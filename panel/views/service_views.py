@@ -45,7 +45,7 @@ class ServiceManagementView(View):
     def _build_context(self, request):
         all_services = service_service.get_services()
         doctors = doctor_service.get_doctors(request)
-        hospital = hospital_service.get_hospital(request)
+        hospital = hospital_service.get_request_hospital(request)
         
         selected_service_ids = set(hospital.get("services", []))
         services = [s for s in all_services if s["id"] in selected_service_ids]
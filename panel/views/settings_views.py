@@ -3,6 +3,7 @@ from django.http import HttpResponse
 from django.views import View
 from django.utils.decorators import method_decorator
 from django.contrib import messages
+from django.utils.functional import SimpleLazyObject
 from .auth_views import login_required
 from ..forms import (
     GeneralSettingsForm,
@@ -127,7 +128,8 @@ class SettingsView(View):
     def _build_context(self, request):
         settings_data = settings_service.get_settings()
         hospital_choices = settings_service.get_hospital_choices()
-        data_stats = settings_service.get_data_statistics()
+        # İstatistikler yalnızca önbellekte güncel parça yoksa hesaplanır
+        data_stats = SimpleLazyObject(settings_service.get_data_statistics)
 
         general_form = GeneralSettingsForm(
             initial=settings_data.get("general", {}),
@@ -154,6 +156,8 @@ class SettingsView(View):
             "security_form": security_form,
             "appearance_form": appearance_form,
             "data_statistics": data_stats,
+            "data_statistics_version": settings_service.get_data_statistics_version(),
+            "fragment_ttl": settings_service.get_data_statistics_ttl(),
         }
         return context
 
@@ -0,0 +1,86 @@
+"""Süreç başlangıcında önbellekleri ısıtma.
+
+Gunicorn `--preload` ile çalıştığında uygulama master süreçte bir kez
+yüklenir ve worker'lar fork ile oluşturulur. Burada yapılan işler (view
+modüllerinin import'u, şablon derlemesi, konum indeksi, Supabase client'ı)
+master'da bir kez yapılır; worker'lar bu belleği copy-on-write ile paylaşır
+ve ilk istek soğuk başlangıç maliyetini ödemez.
+
+Master'da ağ bağlantısı açılmaz: Supabase client'ı sadece oluşturulur, ilk
+HTTP çağrısı worker içinde yapılır. Thread'ler fork sonrası kopyalanmadığı
+için önbellek geçersiz kılma dinleyicisi worker'da yeniden başlatılmalıdır
+(bkz. `gunicorn.conf.py` içindeki `post_fork`).
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from pathlib import Path
+from typing import Callable
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+
+
+def _import_views() -> None:
+    # URLconf'u çözmek tüm view, form ve servis modüllerini import eder
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+
+
+def _compile_templates() -> None:
+    from django.template.loader import get_template
+
+    for path in sorted(TEMPLATE_DIR.rglob("*.html")):
+        get_template(path.relative_to(TEMPLATE_DIR).as_posix())
+
+
+def _load_locations() -> None:
+    from .services import location_service
+
+    if not location_service.warm_location_index():
+        # Paylaşılan önbellek kapalı: JSON verisi master belleğine yüklenir
+        location_service._provinces()
+        location_service._districts()
+        location_service._neighborhoods()
+
+
+def _create_supabase_client() -> None:
+    if not settings.SUPABASE_URL:
+        raise ValueError("SUPABASE_URL tanımlı değil")
+
+    from .services.supabase_client import SupabaseClient
+
+    SupabaseClient()
+
+
+WARMUP_STEPS: dict[str, Callable[[], None]] = {
+    "views": _import_views,
+    "templates": _compile_templates,
+    "locations": _load_locations,
+    "supabase": _create_supabase_client,
+}
+
+
+def warm_up(steps: tuple[str, ...] | None = None) -> dict[str, float | str]:
+    """Isıtma adımlarını çalıştırır ve adım -> süre (ms) döndürür.
+
+    Başarısız bir adım uygulamanın açılmasını engellemez; sonuçta hata
+    mesajıyla raporlanır ve ilgili iş ilk istekte yapılır.
+    """
+    results: dict[str, float | str] = {}
+    for name in steps or tuple(WARMUP_STEPS):
+        started = time.perf_counter()
+        try:
+            WARMUP_STEPS[name]()
+        except Exception as exc:
+            logger.warning("Isıtma adımı atlandı (%s): %s", name, exc)
+            results[name] = f"atlandı: {exc}"
+            continue
+        results[name] = round((time.perf_counter() - started) * 1000, 1)
+    return results
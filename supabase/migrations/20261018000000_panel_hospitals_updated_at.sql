@@ -0,0 +1,4 @@
+-- İyimser eşzamanlılık için hastane versiyon damgası.
+-- hospital_service.update_hospital_fields her güncellemede yazar ve
+-- kısmi güncellemelerin yanıtında (select id, updated_at) döndürür.
+alter table public.hospitals add column if not exists updated_at timestamptz not null default now();
@@ -0,0 +1,4 @@
+-- İyimser eşzamanlılık için doktor versiyon damgası.
+-- doctor_service.update_doctor her güncellemede yazar; expected_updated_at
+-- verildiğinde güncelleme bu kolon üzerinden koşullanır.
+alter table public.doctors add column if not exists updated_at timestamptz not null default now();
@@ -0,0 +1,67 @@
+-- Panel için atomik (tek transaction) mutasyon fonksiyonları.
+-- Python tarafında supabase.rpc(...) ile çağrılır:
+--   hospital_service.add_holiday  -> public.add_hospital_holiday
+--   doctor_service.delete_doctor  -> public.delete_doctor_cascade
+
+-- Hastane tatilini ekler; saatli tatilse o günün çalışma saatini tatil
+-- başlangıcına kadar kısaltır. İkisi aynı transaction içinde yapılır.
+create or replace function public.add_hospital_holiday(
+    p_hospital_id uuid,
+    p_date date,
+    p_reason text,
+    p_is_full_day boolean default true,
+    p_start_time text default null,
+    p_end_time text default null
+)
+returns setof public.holidays
+language plpgsql
+as $$
+declare
+    v_day text := (array['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'])
+        [extract(isodow from p_date)::int];
+    v_holiday public.holidays;
+begin
+    insert into public.holidays (hospital_id, doctor_id, date, reason, is_full_day, start_time, end_time)
+    values (
+        p_hospital_id,
+        null,
+        p_date,
+        p_reason,
+        p_is_full_day,
+        case when p_is_full_day then null else p_start_time end,
+        case when p_is_full_day then null else p_end_time end
+    )
+    returning * into v_holiday;
+
+    if not p_is_full_day and p_start_time is not null then
+        update public.hospitals
+           set working_hours = jsonb_set(working_hours, array[v_day, 'end'], to_jsonb(p_start_time)),
+               updated_at = now()
+         where id = p_hospital_id
+           and coalesce((working_hours -> v_day ->> 'isAvailable')::boolean, false)
+           and coalesce(working_hours -> v_day ->> 'start', '') <> '';
+    end if;
+
+    return next v_holiday;
+end;
+$$;
+
+
+-- Doktoru ve doktora ait tatilleri tek transaction içinde siler.
+-- Storage'daki görselin temizlenebilmesi için silinen doktorun görsel URL'sini döndürür.
+create or replace function public.delete_doctor_cascade(p_doctor_id uuid)
+returns table (doctor_id uuid, doctor_image text)
+language plpgsql
+as $$
+begin
+    delete from public.holidays h where h.doctor_id = p_doctor_id;
+
+    return query
+        with deleted as (
+            delete from public.doctors d
+             where d.id = p_doctor_id
+            returning d.id, d.image
+        )
+        select deleted.id, deleted.image from deleted;
+end;
+$$;
@@ -0,0 +1,48 @@
+-- Panel önbelleğini geçersiz kılmak için değişiklik takibi.
+-- panel/services/cache_invalidation.py:
+--   PANEL_CACHE_INVALIDATION=realtime -> supabase_realtime yayını
+--   PANEL_CACHE_INVALIDATION=polling  -> updated_at kolonları
+
+alter table public.services add column if not exists updated_at timestamptz not null default now();
+alter table public.holidays add column if not exists updated_at timestamptz not null default now();
+alter table public.appointments add column if not exists updated_at timestamptz not null default now();
+
+-- Uygulama updated_at göndermediyse (ör. randevu güncellemeleri) damgayı yenile;
+-- iyimser eşzamanlılık için uygulamanın gönderdiği değer korunur.
+create or replace function public.panel_touch_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    if new.updated_at is not distinct from old.updated_at then
+        new.updated_at := now();
+    end if;
+    return new;
+end;
+$$;
+
+do $$
+declare
+    v_table text;
+begin
+    foreach v_table in array array['hospitals', 'doctors', 'services', 'holidays', 'appointments'] loop
+        execute format('drop trigger if exists panel_touch_updated_at on public.%I', v_table);
+        execute format(
+            'create trigger panel_touch_updated_at before update on public.%I '
+            'for each row execute function public.panel_touch_updated_at()',
+            v_table
+        );
+        if not exists (
+            select 1 from pg_publication_tables
+            where pubname = 'supabase_realtime' and schemaname = 'public' and tablename = v_table
+        ) then
+            execute format('alter publication supabase_realtime add table public.%I', v_table);
+        end if;
+    end loop;
+end;
+$$;
+
+-- DELETE olaylarında hospital_id'nin de gelmesi için (aksi halde tüm önbellek silinir)
+alter table public.doctors replica identity full;
+alter table public.holidays replica identity full;
+alter table public.appointments replica identity full;
@@ -0,0 +1,21 @@
+-- delete_doctor_cascade silinen doktorun hastanesini de döndürür;
+-- doctor_service.delete_doctor yalnızca o hastanenin önbellek sürümlerini yeniler.
+-- Dönüş tipi değiştiği için fonksiyon yeniden oluşturulur.
+drop function if exists public.delete_doctor_cascade(uuid);
+
+create function public.delete_doctor_cascade(p_doctor_id uuid)
+returns table (doctor_id uuid, hospital_id uuid, doctor_image text)
+language plpgsql
+as $$
+begin
+    delete from public.holidays h where h.doctor_id = p_doctor_id;
+
+    return query
+        with deleted as (
+            delete from public.doctors d
+             where d.id = p_doctor_id
+            returning d.id, d.hospital_id, d.image
+        )
+        select deleted.id, deleted.hospital_id, deleted.image from deleted;
+end;
+$$;